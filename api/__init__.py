@@ -5,5 +5,6 @@ Responsável por fazer requisições HTTP e gerenciar autenticação
 
 from .api_client import APIClient
 from .auth_service import AuthService
+from .upload_queue import UploadQueue, StatusUploader
 
-__all__ = ['APIClient', 'AuthService']
+__all__ = ['APIClient', 'AuthService', 'UploadQueue', 'StatusUploader']
@@ -3,25 +3,24 @@ Cliente de API para comunicação com o servidor
 """
 
 import requests
-import json
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+import time
+import threading
+from typing import Dict, Any, List, Optional
 import logging
 
-logger = logging.getLogger(__name__)
-
+from .client_core import APIResponse, ClientCore, Flow, Request, Sleep
+from .connection_pool import create_pooled_adapter
 
-@dataclass
-class APIResponse:
-    """Classe para representar uma resposta da API"""
-    success: bool
-    data: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
-    status_code: int = 0
+logger = logging.getLogger(__name__)
 
 
 class APIClient:
-    """Cliente para comunicação com a API do servidor"""
+    """Cliente para comunicação com a API do servidor
+    
+    As regras (compressão, capacidades, novas tentativas e disjuntor) ficam
+    em ``self.core`` e são compartilhadas com o ``AsyncAPIClient``; aqui só
+    se executam as requisições com ``requests``.
+    """
     
     def __init__(
         self,
@@ -33,49 +32,104 @@ class APIClient:
             "Content-Type": "application/json",
             "User-Agent": "Rocks-Monitoramento-Desktop/1.0"
         })
+        # Pool explícito com keep-alive, descarte de ociosas e cache de DNS
+        self.adapter = create_pooled_adapter()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.core = ClientCore()
+        self._sleep = time.sleep
+        self._headers_lock = threading.Lock()
 
     def set_auth_token(self, token: Optional[str]):
-        """Atualiza o header Authorization padrão da sessão."""
-        if token:
-            self.session.headers["Authorization"] = f"Bearer {token}"
-        else:
-            self.session.headers.pop("Authorization", None)
+        """Atualiza o header Authorization padrão da sessão.
+        
+        Os headers são trocados por uma cópia em vez de alterados no lugar:
+        outras threads de envio podem estar lendo os atuais nesse momento.
+        """
+        authorization = f"Bearer {token}" if token else None
+        with self._headers_lock:
+            if self.session.headers.get("Authorization") == authorization:
+                return
+            headers = self.session.headers.copy()
+            if authorization:
+                headers["Authorization"] = authorization
+            else:
+                headers.pop("Authorization", None)
+            self.session.headers = headers
+    
+    def get_transfer_stats(self) -> Dict[str, Any]:
+        """Retorna bytes antes e depois da compressão nos envios de status"""
+        stats = self.core.transfer_stats()
+        stats["conexoes"] = self.adapter.get_stats()
+        return stats
+    
+    def _run(self, flow: Flow) -> Any:
+        """Executa um fluxo do ``ClientCore``: cada passo vira uma requisição ou espera"""
+        result = None
+        while True:
+            try:
+                step = flow.send(result)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, Sleep):
+                self._sleep(step.seconds)
+                result = None
+            elif step.retry is None:
+                result = self._send_request(step.method, step.endpoint, step.data, step.timeout, step.compress)
+            else:
+                result = self._make_request(step.method, step.endpoint, step.data, step.timeout,
+                                            step.compress, step.retry)
     
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
-                     timeout: int = 10) -> APIResponse:
-        """Faz uma requisição HTTP para a API"""
+                     timeout: int = 10, compress: bool = False, retry: str = "default") -> APIResponse:
+        """Faz uma requisição HTTP para a API, com novas tentativas
+        
+        Com ``compress=True`` o corpo é serializado aqui e pode ser comprimido
+        (ver ``UPLOAD_CONFIG["compression"]``). ``retry`` escolhe o perfil de
+        ``API_CONFIG["retry_policies"]``: falhas de rede, 429 e 5xx são
+        repetidas com backoff exponencial e jitter, respeitando Retry-After.
+        """
+        return self._run(self.core.with_retries(Request(method, endpoint, data, timeout, compress, retry)))
+    
+    def send_once(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                  timeout: int = 10, compress: bool = False) -> APIResponse:
+        """Faz uma única tentativa, sem novas tentativas nem disjuntor"""
+        return self._send_request(method, endpoint, data, timeout, compress)
+    
+    def _send_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                      timeout: int = 10, compress: bool = False) -> APIResponse:
+        """Faz uma única tentativa da requisição HTTP"""
         url = f"{self.base_url}{endpoint}"
         
+        body = None
+        headers = None
+        if compress and data is not None and method.upper() in ("POST", "PUT"):
+            body, headers = self.core.encode_body(data)
+        
         try:
             if method.upper() == "GET":
                 response = self.session.get(url, timeout=timeout)
             elif method.upper() == "POST":
-                response = self.session.post(url, json=data, timeout=timeout)
+                if body is not None:
+                    response = self.session.post(url, data=body, headers=headers, timeout=timeout)
+                else:
+                    response = self.session.post(url, json=data, timeout=timeout)
             elif method.upper() == "PUT":
-                response = self.session.put(url, json=data, timeout=timeout)
+                if body is not None:
+                    response = self.session.put(url, data=body, headers=headers, timeout=timeout)
+                else:
+                    response = self.session.put(url, json=data, timeout=timeout)
             elif method.upper() == "DELETE":
                 response = self.session.delete(url, timeout=timeout)
             else:
                 return APIResponse(False, error=f"Método HTTP não suportado: {method}")
             
-            # Processar resposta
-            if response.status_code == 200:
-                try:
-                    response_data = response.json()
-                    return APIResponse(True, data=response_data, status_code=response.status_code)
-                except json.JSONDecodeError:
-                    return APIResponse(False, error="Resposta inválida do servidor", 
-                                     status_code=response.status_code)
-            else:
-                error_msg = f"Erro HTTP {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if "message" in error_data:
-                        error_msg = error_data["message"]
-                except json.JSONDecodeError:
-                    pass
-                
-                return APIResponse(False, error=error_msg, status_code=response.status_code)
+            if response.status_code == 415 and headers and "Content-Encoding" in headers:
+                # Servidor não aceita o corpo comprimido: desliga e reenvia sem compressão
+                self.core.disable_compression(headers["Content-Encoding"])
+                return self._send_request(method, endpoint, data, timeout, compress)
+            
+            return self.core.parse_response(response)
                 
         except requests.exceptions.ConnectionError:
             return APIResponse(False, error="Erro de conexão. Verifique se o servidor está rodando.")
@@ -119,19 +173,52 @@ class APIClient:
             self.set_auth_token(auth_token)
 
         logger.info("Enviando configuração da máquina para a API")
-        return self._make_request("POST", "/api/update_confg_maquina", data=config_data)
+        return self._make_request("POST", "/api/update_confg_maquina", data=config_data, retry="config")
 
     def update_machine_status(self, status_data: dict, auth_token: Optional[str] = None) -> APIResponse:
         """Atualiza o status da máquina (dados de monitoramento)"""
         if auth_token is not None:
             self.set_auth_token(auth_token)
 
-        logger.info("Enviando dados de status da máquina para a API")
-        return self._make_request("PUT", "/api/maquina/status", data=status_data)
+        return self._run(self.core.update_machine_status(status_data))
+    
+    def supports_status_batch(self) -> bool:
+        """Verifica (uma vez) se o servidor anuncia o endpoint de status em lote"""
+        return self._run(self.core.discover_capabilities()) and bool(self.core.batch_supported)
+
+    def send_status_batch(self, snapshots: List[Dict[str, Any]], auth_token: Optional[str] = None) -> APIResponse:
+        """Envia vários snapshots de status em uma única requisição
+
+        Sem suporte do servidor, cai para um PUT por snapshot. Em caso de falha,
+        ``data["enviados"]`` indica quantos snapshots do início da lista foram
+        aceitos, para que só o restante seja guardado para reenvio.
+        """
+        if auth_token is not None:
+            self.set_auth_token(auth_token)
+
+        return self._run(self.core.send_status_batch(snapshots))
 
     def get_machine_config(self, mac_address: str, auth_token: Optional[str] = None) -> APIResponse:
         """Obtém configuração da máquina"""
         if auth_token is not None:
             self.set_auth_token(auth_token)
 
-        return self._make_request("GET", f"/api/machine/{mac_address}")
+        return self._make_request("GET", f"/api/machine/{mac_address}", retry="config")
+
+
+_shared_client: Optional[APIClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client() -> APIClient:
+    """Retorna o ``APIClient`` único do processo
+
+    Todos os serviços que não recebem um cliente explícito usam este, então
+    o processo mantém um só pool de conexões (e um só disjuntor) em vez de
+    um por instância de ``AuthService``.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = APIClient()
+        return _shared_client
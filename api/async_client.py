@@ -0,0 +1,166 @@
+"""
+Cliente de API assíncrono (asyncio) para o loop de monitoramento
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from config import UPLOAD_CONFIG
+from .api_client import APIClient, get_shared_client
+from .client_core import APIResponse, Flow, Request, Sleep
+
+try:
+    import httpx
+except ImportError:  # httpx é opcional; sem ele as requisições rodam em um pool de threads
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIClient:
+    """Versão asyncio do ``APIClient`` com limite de requisições simultâneas
+
+    As regras (token, compressão, capacidades do servidor, novas tentativas e
+    o disjuntor de status) são as do ``ClientCore`` do ``APIClient`` síncrono
+    recebido, de modo que as duas versões podem ser usadas lado a lado; aqui
+    só se executam os passos com ``await``. Com ``httpx`` instalado as
+    requisições são nativas do loop; sem ele, cada tentativa roda em um pool
+    de ``max_in_flight`` threads. Em ambos os casos no máximo
+    ``max_in_flight`` requisições ficam em andamento ao mesmo tempo.
+    """
+
+    def __init__(self, api_client: Optional[APIClient] = None, max_in_flight: Optional[int] = None):
+        self.sync = api_client or get_shared_client()
+        self.core = self.sync.core
+        self.max_in_flight = max_in_flight or UPLOAD_CONFIG.get("max_in_flight", 4)
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._http = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _limits(self) -> asyncio.Semaphore:
+        # Criado sob demanda para pertencer ao loop em execução
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def _run(self, flow: Flow) -> Any:
+        """Executa um fluxo do ``ClientCore``; a espera entre tentativas não bloqueia o loop"""
+        result = None
+        while True:
+            try:
+                step = flow.send(result)
+            except StopIteration as done:
+                return done.value
+            if isinstance(step, Sleep):
+                await asyncio.sleep(step.seconds)
+                result = None
+            elif step.retry is None:
+                result = await self._send_request(step.method, step.endpoint, step.data,
+                                                  step.timeout, step.compress)
+            else:
+                result = await self._run(self.core.with_retries(step))
+
+    async def _send_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                            timeout: int = 10, compress: bool = False) -> APIResponse:
+        """Faz uma única tentativa, respeitando o limite de requisições simultâneas"""
+        async with self._limits():
+            self.in_flight += 1
+            try:
+                if httpx is not None:
+                    return await self._send_httpx(method, endpoint, data, timeout, compress)
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix="AsyncAPIClient")
+                call = functools.partial(self.sync.send_once, method, endpoint, data, timeout, compress)
+                return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+            finally:
+                self.in_flight -= 1
+
+    async def _send_httpx(self, method: str, endpoint: str, data: Optional[Dict],
+                          timeout: int, compress: bool) -> APIResponse:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_in_flight),
+            )
+
+        method = method.upper()
+        headers = dict(self.sync.session.headers)
+        kwargs: Dict[str, Any] = {}
+        if method in ("POST", "PUT") and data is not None:
+            if compress:
+                body, extra = self.core.encode_body(data)
+                headers.update(extra)
+                kwargs["content"] = body
+            else:
+                kwargs["json"] = data
+        elif method not in ("GET", "DELETE"):
+            return APIResponse(False, error=f"Método HTTP não suportado: {method}")
+
+        try:
+            response = await self._http.request(
+                method, f"{self.sync.base_url}{endpoint}", headers=headers, timeout=timeout, **kwargs
+            )
+            if response.status_code == 415 and "Content-Encoding" in headers:
+                self.core.disable_compression(headers["Content-Encoding"])
+                return await self._send_httpx(method, endpoint, data, timeout, compress)
+            return self.core.parse_response(response)
+
+        except httpx.ConnectError:
+            return APIResponse(False, error="Erro de conexão. Verifique se o servidor está rodando.")
+        except httpx.TimeoutException:
+            return APIResponse(False, error="Timeout na conexão. Tente novamente.")
+        except httpx.HTTPError as e:
+            return APIResponse(False, error=f"Erro na requisição: {str(e)}")
+        except Exception as e:
+            logger.error(f"Erro inesperado na requisição: {e}")
+            return APIResponse(False, error=f"Erro inesperado: {str(e)}")
+
+    async def health_check(self) -> APIResponse:
+        """Verifica se a API está funcionando"""
+        return await self._run(self.core.with_retries(Request("GET", "/api/health")))
+
+    async def update_machine_status(self, status_data: dict, auth_token: Optional[str] = None) -> APIResponse:
+        """Atualiza o status da máquina (dados de monitoramento)"""
+        if auth_token is not None:
+            self.sync.set_auth_token(auth_token)
+
+        return await self._run(self.core.update_machine_status(status_data))
+
+    async def send_status_batch(self, snapshots: List[Dict[str, Any]],
+                                auth_token: Optional[str] = None) -> APIResponse:
+        """Envia vários snapshots de status (ver ``APIClient.send_status_batch``)"""
+        if auth_token is not None:
+            self.sync.set_auth_token(auth_token)
+
+        return await self._run(self.core.send_status_batch(snapshots))
+
+    async def update_machine_config(self, config_data: dict, auth_token: Optional[str] = None) -> APIResponse:
+        """Atualiza a configuração da máquina"""
+        if auth_token is not None:
+            self.sync.set_auth_token(auth_token)
+
+        logger.info("Enviando configuração da máquina para a API")
+        return await self._run(self.core.with_retries(
+            Request("POST", "/api/update_confg_maquina", data=config_data, retry="config")
+        ))
+
+    async def get_machine_config(self, mac_address: str, auth_token: Optional[str] = None) -> APIResponse:
+        """Obtém configuração da máquina"""
+        if auth_token is not None:
+            self.sync.set_auth_token(auth_token)
+
+        return await self._run(self.core.with_retries(
+            Request("GET", f"/api/machine/{mac_address}", retry="config")
+        ))
+
+    async def aclose(self):
+        """Fecha as conexões (httpx) ou o pool de threads"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -7,11 +7,11 @@ import os
 import socket
 import uuid
 import psutil
-import platform
 import threading
 from typing import Dict, Optional
-from .api_client import APIClient, APIResponse
+from .api_client import APIClient, APIResponse, get_shared_client
 from config import FILE_CONFIG
+from monitoramento.system_inventory import get_os_description
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,7 +25,7 @@ class AuthService:
         api_client: Optional[APIClient] = None,
         auth_state_file: Optional[str] = None,
     ):
-        self.api_client = api_client or APIClient()
+        self.api_client = api_client or get_shared_client()
         self._auth_token: Optional[str] = None
         self._machine_info: Optional[Dict[str, str]] = None
         self._machine_type: Optional[str] = None  # Novo campo para tipo de máquina
@@ -70,33 +70,9 @@ class AuthService:
             return "unknown"
     
     def get_operating_system(self) -> str:
-        """Obtém informações detalhadas do sistema operacional"""
+        """Obtém informações detalhadas do sistema operacional (cache por processo)"""
         try:
-            system = platform.system()
-            release = platform.release()
-            version = platform.version()
-            
-            # Formatar informações do SO
-            if system == "Windows":
-                # Para Windows, incluir versão mais detalhada
-                win_ver = platform.win32_ver()
-                return f"Windows {release} ({win_ver[0]})"
-            elif system == "Linux":
-                # Para Linux, incluir distribuição se disponível
-                try:
-                    distro = platform.linux_distribution()
-                    if distro[0]:
-                        return f"Linux {distro[0]} {distro[1]} ({release})"
-                    else:
-                        return f"Linux {release}"
-                except:
-                    return f"Linux {release}"
-            elif system == "Darwin":
-                # Para macOS
-                return f"macOS {release}"
-            else:
-                return f"{system} {release}"
-                
+            return get_os_description()
         except Exception as e:
             logger.error(f"Erro ao obter informações do SO: {e}")
             return "Unknown OS"
@@ -112,6 +88,13 @@ class AuthService:
                 "mac": mac_address,
             }
         return self._machine_info
+    
+    def refresh_machine_info(self) -> Dict[str, str]:
+        """Recalcula as informações da máquina (ex.: após troca de hostname)"""
+        self._machine_info = None
+        machine_info = self.get_machine_info()
+        self._persist_state()
+        return machine_info
     
     def authenticate(self, email: str, password: str) -> APIResponse:
         """Autentica o usuário na API"""
@@ -0,0 +1,145 @@
+"""
+Disjuntor (circuit breaker) para não insistir em um servidor fora do ar
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config import UPLOAD_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Estados do disjuntor
+CLOSED = "fechado"        # requisições normais
+OPEN = "aberto"           # nenhuma requisição até o próximo teste
+HALF_OPEN = "meio_aberto"  # um único teste decide se fecha ou reabre
+
+
+class CircuitBreaker:
+    """Abre após falhas consecutivas ou taxa de erro alta e testa antes de fechar
+
+    Fechado, conta o resultado das últimas ``window`` chamadas. Abre quando
+    há ``failure_threshold`` falhas seguidas ou quando, com pelo menos
+    ``min_calls`` chamadas na janela, a fração de falhas chega a
+    ``error_rate``. Aberto, recusa tudo por ``open_timeout`` segundos e então
+    passa a meio aberto: ``acquire`` entrega a um único chamador a vaga de
+    teste. Se o teste falhar, o disjuntor reabre com o dobro do tempo (até
+    ``max_open_timeout``). A janela de resultados recomeça a cada mudança de
+    estado.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_timeout: float = 30,
+        max_open_timeout: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.open_timeout = open_timeout
+        self.max_open_timeout = max_open_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._current_timeout = open_timeout
+        self._opened_at = 0.0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Estado atual (só leitura); aberto com a espera vencida aparece como meio aberto"""
+        with self._lock:
+            if self._state == OPEN and self._open_elapsed():
+                return HALF_OPEN
+            return self._state
+
+    def _open_elapsed(self) -> bool:
+        return self._clock() - self._opened_at >= self._current_timeout
+
+    def acquire(self) -> str:
+        """Decide se o chamador pode enviar
+
+        Retorna ``CLOSED`` (envio normal), ``OPEN`` (não enviar) ou
+        ``HALF_OPEN``: o chamador ficou com a única vaga de teste e deve
+        informar o resultado com ``record_success``/``record_failure``.
+        Enquanto o teste não termina, os demais recebem ``OPEN``.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return CLOSED
+            if self._state == OPEN and self._open_elapsed():
+                self._state = HALF_OPEN
+                logger.info("Disjuntor meio aberto: testando o servidor")
+                return HALF_OPEN
+            return OPEN
+
+    def _reset_window(self):
+        # A janela de resultados vale só para o estado atual
+        self._outcomes.clear()
+        self._consecutive_failures = 0
+
+    def _open(self, reason: str):
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._reset_window()
+        self.times_opened += 1
+        logger.warning(
+            f"Disjuntor aberto ({reason}); envios suspensos por {self._current_timeout:.0f}s"
+        )
+
+    def record_success(self):
+        with self._lock:
+            if self._state == OPEN:
+                # Resposta atrasada de um envio iniciado antes de abrir
+                return
+            if self._state == HALF_OPEN:
+                logger.info("Disjuntor fechado: servidor respondeu")
+                self._state = CLOSED
+                self._current_timeout = self.open_timeout
+                self._reset_window()
+                return
+            self._consecutive_failures = 0
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._current_timeout = min(self._current_timeout * 2, self.max_open_timeout)
+                self._open("teste falhou")
+                return
+            if self._state != CLOSED:
+                # Resposta atrasada de um envio iniciado antes de abrir
+                return
+
+            self._consecutive_failures += 1
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open(f"{self._consecutive_failures} falhas seguidas")
+            elif len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._open(f"{failures}/{len(self._outcomes)} falhas recentes")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "estado": self.state,
+            "falhas_consecutivas": self._consecutive_failures,
+            "aberturas": self.times_opened,
+        }
+
+
+def create_circuit_breaker(settings: Optional[Dict[str, Any]] = None) -> CircuitBreaker:
+    """Cria o disjuntor com ``UPLOAD_CONFIG["circuit_breaker"]``"""
+    if settings is None:
+        settings = UPLOAD_CONFIG.get("circuit_breaker", {})
+    return CircuitBreaker(**settings)
@@ -0,0 +1,310 @@
+"""
+Regras dos clientes de API sem E/S, compartilhadas pelas versões síncrona e asyncio
+"""
+
+import gzip
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+
+from config import UPLOAD_CONFIG
+from .retry_policy import RETRYABLE_STATUS, load_retry_policies, parse_retry_after
+from .circuit_breaker import HALF_OPEN, OPEN, create_circuit_breaker
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; sem ele usa-se gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Capacidade anunciada pelo servidor em /api/health para envio em lote
+STATUS_BATCH_CAPABILITY = "status_batch"
+
+
+@dataclass
+class APIResponse:
+    """Classe para representar uma resposta da API"""
+    success: bool
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    status_code: int = 0
+    # Segundos pedidos pelo servidor no header Retry-After (429/503)
+    retry_after: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Request:
+    """Passo de um fluxo: fazer uma requisição
+
+    ``retry`` é o perfil de novas tentativas; None faz uma única tentativa.
+    """
+    method: str
+    endpoint: str
+    data: Optional[Dict[str, Any]] = None
+    timeout: int = 10
+    compress: bool = False
+    retry: Optional[str] = "default"
+
+
+@dataclass(frozen=True)
+class Sleep:
+    """Passo de um fluxo: esperar antes da próxima tentativa"""
+    seconds: float
+
+
+# Fluxo: gera passos, recebe a APIResponse de cada Request e retorna o resultado
+Flow = Generator[Union[Request, Sleep], Optional[APIResponse], Any]
+
+CIRCUIT_OPEN_ERROR = "Disjuntor aberto: servidor indisponível"
+
+
+def send_failure_level(response: APIResponse, default: int = logging.ERROR) -> int:
+    """Nível de log para um envio de status que falhou
+
+    Com o disjuntor aberto nada foi enviado: a abertura já foi registrada uma
+    vez (WARNING) pelo ``CircuitBreaker``, então cada ciclo pulado vai em DEBUG.
+    """
+    return logging.DEBUG if response.error == CIRCUIT_OPEN_ERROR else default
+
+
+class ClientCore:
+    """Estado e decisões dos clientes de API, sem fazer E/S
+
+    Compressão, capacidades do servidor, novas tentativas e o disjuntor de
+    status ficam aqui. As operações são fluxos (geradores) que produzem
+    ``Request``/``Sleep`` e recebem as respostas; o ``APIClient`` executa os
+    passos com ``requests`` e o ``AsyncAPIClient`` com ``await``, então as
+    duas versões seguem exatamente as mesmas regras.
+
+    O mesmo núcleo é usado por várias threads de envio ao mesmo tempo
+    (pipeline, pool do ``AsyncAPIClient``): contadores e compressão ficam sob
+    ``_lock``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # None = ainda não verificado no servidor
+        self.batch_supported: Optional[bool] = None
+        self.server_encodings: Optional[List[str]] = None
+
+        # Compressão opcional do corpo (none, gzip, zstd ou auto)
+        self.compression = UPLOAD_CONFIG.get("compression", "none")
+        self.compression_min_bytes = UPLOAD_CONFIG.get("compression_min_bytes", 1024)
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+
+        # Novas tentativas por perfil de endpoint (default, status, config...)
+        self.retry_policies = load_retry_policies()
+
+        # Suspende os envios de status enquanto o servidor estiver fora do ar
+        self.status_breaker = create_circuit_breaker()
+
+    # Corpo e resposta
+
+    def choose_encoding(self) -> Optional[str]:
+        """Escolhe o Content-Encoding conforme configuração e o que o servidor aceita
+
+        zstd só é usado quando o servidor o anuncia em ``content_encodings`` no
+        /api/health; gzip é assumido se o servidor não anunciar nada.
+        """
+        if self.compression in (None, "none"):
+            return None
+
+        accepted = self.server_encodings
+        if self.compression in ("zstd", "auto") and zstandard is not None:
+            if accepted is not None and "zstd" in accepted:
+                return "zstd"
+        if accepted is None or "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def encode_body(self, data: Any) -> Tuple[bytes, Dict[str, str]]:
+        """Serializa o corpo e comprime quando ultrapassa o limite mínimo"""
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        raw_size = len(body)
+        headers: Dict[str, str] = {}
+
+        encoding = None
+        if raw_size >= self.compression_min_bytes:
+            with self._lock:
+                encoding = self.choose_encoding()
+        if encoding == "zstd":
+            body = zstandard.ZstdCompressor(level=3).compress(body)
+            headers["Content-Encoding"] = "zstd"
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        with self._lock:
+            self.bytes_raw += raw_size
+            self.bytes_sent += len(body)
+        logger.debug(f"Corpo da requisição: {raw_size} bytes -> {len(body)} bytes ({encoding or 'sem compressão'})")
+        return body, headers
+
+    def disable_compression(self, encoding: str):
+        """Servidor recusou o corpo comprimido (415): os próximos vão sem compressão"""
+        with self._lock:
+            if self.compression in (None, "none"):
+                return
+            self.compression = "none"
+        logger.warning(f"Servidor recusou Content-Encoding {encoding}, desativando compressão")
+
+    def transfer_stats(self) -> Dict[str, Any]:
+        """Bytes antes e depois da compressão nos envios de status e estado do disjuntor"""
+        with self._lock:
+            bytes_raw, bytes_sent = self.bytes_raw, self.bytes_sent
+        saved = 0.0
+        if bytes_raw:
+            saved = round((1 - bytes_sent / bytes_raw) * 100, 1)
+        return {
+            "bytes_json": bytes_raw,
+            "bytes_enviados": bytes_sent,
+            "economia_percentual": saved,
+            "circuito": self.status_breaker.get_stats(),
+        }
+
+    @staticmethod
+    def parse_response(response: Any) -> APIResponse:
+        """Converte a resposta HTTP (requests ou httpx) em ``APIResponse``"""
+        if response.status_code == 200:
+            try:
+                response_data = response.json()
+                return APIResponse(True, data=response_data, status_code=response.status_code)
+            except json.JSONDecodeError:
+                return APIResponse(False, error="Resposta inválida do servidor",
+                                   status_code=response.status_code)
+
+        error_msg = f"Erro HTTP {response.status_code}"
+        try:
+            error_data = response.json()
+            if "message" in error_data:
+                error_msg = error_data["message"]
+        except json.JSONDecodeError:
+            pass
+
+        return APIResponse(False, error=error_msg, status_code=response.status_code,
+                           retry_after=parse_retry_after(response.headers.get("Retry-After")))
+
+    # Fluxos
+
+    def with_retries(self, request: Request) -> Flow:
+        """Repete a tentativa única de ``request`` conforme o perfil ``request.retry``
+
+        Falhas de rede, 429 e 5xx são repetidas com backoff exponencial e
+        jitter, respeitando Retry-After.
+        """
+        policy = self.retry_policies.get(request.retry, self.retry_policies["default"])
+        attempt_request = Request(request.method, request.endpoint, request.data,
+                                  request.timeout, request.compress, retry=None)
+        attempt = 0
+        while True:
+            response = yield attempt_request
+            if response.success or response.status_code not in RETRYABLE_STATUS:
+                return response
+
+            delay = policy.delay(attempt, response.retry_after)
+            if delay is None:
+                return response
+
+            attempt += 1
+            logger.warning(
+                f"{request.method} {request.endpoint} falhou ({response.error}); "
+                f"tentativa {attempt + 1}/{policy.attempts} em {delay:.1f}s"
+            )
+            yield Sleep(delay)
+
+    def discover_capabilities(self) -> Flow:
+        """Consulta /api/health uma vez e guarda as capacidades anunciadas"""
+        if self.batch_supported is not None:
+            return True
+
+        response = yield Request("GET", "/api/health")
+        if not response.success:
+            # Sem resposta do servidor: tenta de novo na próxima chamada
+            return False
+
+        health = response.data or {}
+        self.batch_supported = STATUS_BATCH_CAPABILITY in health.get("capabilities", [])
+        if "content_encodings" in health:
+            self.server_encodings = list(health["content_encodings"])
+        logger.info(
+            f"Capacidades do servidor: lote={self.batch_supported}, "
+            f"encodings={self.server_encodings}"
+        )
+        return True
+
+    def status_allowed(self) -> Flow:
+        """Consulta o disjuntor de status; só quem recebe a vaga de teste chama /api/health"""
+        state = self.status_breaker.acquire()
+        if state == OPEN:
+            return False
+        if state == HALF_OPEN:
+            probe = APIResponse(False, error="Teste do disjuntor não concluído")
+            try:
+                probe = yield Request("GET", "/api/health", timeout=5, retry=None)
+            finally:
+                if probe.success:
+                    self.status_breaker.record_success()
+                else:
+                    self.status_breaker.record_failure()
+            return probe.success
+        return True
+
+    def record_status_result(self, response: APIResponse):
+        """Alimenta o disjuntor: só falhas do servidor/rede contam (4xx não)"""
+        if response.success:
+            self.status_breaker.record_success()
+        elif response.status_code == 0 or response.status_code >= 500:
+            self.status_breaker.record_failure()
+
+    def update_machine_status(self, status_data: Dict[str, Any]) -> Flow:
+        """Fluxo do PUT de status, passando pelo disjuntor"""
+        if not (yield from self.status_allowed()):
+            # Sem tentativa de rede: status 0 faz o chamador guardar no spool
+            return APIResponse(False, error=CIRCUIT_OPEN_ERROR)
+
+        logger.info("Enviando dados de status da máquina para a API")
+        if self.compression not in (None, "none"):
+            yield from self.discover_capabilities()
+        response = yield Request("PUT", "/api/maquina/status", data=status_data, compress=True,
+                                 retry="status")
+        self.record_status_result(response)
+        return response
+
+    def send_status_batch(self, snapshots: List[Dict[str, Any]]) -> Flow:
+        """Fluxo do envio em lote, com queda para um PUT por snapshot
+
+        Em caso de falha, ``data["enviados"]`` indica quantos snapshots do
+        início da lista foram aceitos, para que só o restante seja guardado
+        para reenvio.
+        """
+        if not snapshots:
+            return APIResponse(True, data={"enviados": 0}, status_code=200)
+
+        if not (yield from self.status_allowed()):
+            return APIResponse(False, data={"enviados": 0}, error=CIRCUIT_OPEN_ERROR)
+
+        if (yield from self.discover_capabilities()) and self.batch_supported:
+            logger.info(f"Enviando lote de {len(snapshots)} snapshots de status para a API")
+            response = yield Request("PUT", "/api/maquina/status/batch", data={"data": snapshots},
+                                     compress=True, retry="status")
+            if response.status_code not in (404, 405, 501):
+                self.record_status_result(response)
+                if response.success:
+                    response.data = dict(response.data or {}, enviados=len(snapshots))
+                else:
+                    response.data = {"enviados": 0}
+                return response
+            logger.warning("Servidor não aceitou o endpoint de lote, usando envios individuais")
+            self.batch_supported = False
+
+        for index, snapshot in enumerate(snapshots):
+            response = yield from self.update_machine_status({"data": snapshot})
+            if not response.success:
+                return APIResponse(False, data={"enviados": index}, error=response.error,
+                                   status_code=response.status_code)
+        return APIResponse(True, data={"enviados": len(snapshots)}, status_code=200)
@@ -0,0 +1,247 @@
+"""
+Pool de conexões HTTP para agentes de longa duração
+"""
+
+import time
+import socket
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from config import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class DNSCache:
+    """Resolve nomes com validade de ``ttl`` segundos
+
+    Evita uma consulta DNS a cada conexão nova. Guarda todos os endereços
+    devolvidos (IPv6 e IPv4, vários registros A), na ordem do resolvedor,
+    para que a conexão possa tentar o próximo quando um falhar. Se a
+    consulta falhar depois de vencida a validade, os últimos endereços
+    conhecidos continuam em uso.
+    """
+
+    def __init__(self, ttl: float = 300, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Endereços IP de ``host`` (só o próprio ``host`` se já for um IP)"""
+        key = (host, port)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            if entry is None:
+                raise
+            logger.warning(f"Falha ao resolver {host}; usando endereços em cache {entry[1]}")
+            return entry[1]
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        """Descarta os endereços de ``host`` (nenhum deles aceitou conexão)"""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"acertos": self.hits, "consultas": self.misses}
+
+
+def keepalive_socket_options(idle: int, interval: int, count: int) -> List[Tuple[int, int, int]]:
+    """Opções de socket com TCP keep-alive, nas constantes que a plataforma tiver
+
+    No Windows só ``SO_KEEPALIVE`` é aplicado (os tempos são do sistema).
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):  # macOS
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+
+def _pool_classes(adapter: "PooledAdapter") -> Dict[str, type]:
+    """Pools do urllib3 cujas conexões usam o cache de DNS e contam handshakes e reusos"""
+
+    def connection_class(base: type) -> type:
+        class CountingConnection(base):
+            def _new_conn(self):
+                if adapter.dns_cache is None:
+                    sock = super()._new_conn()
+                    adapter._count("new_connections")
+                    return sock
+
+                host = self._dns_host
+                addresses = adapter.dns_cache.resolve(host, self.port)
+                error = None
+                try:
+                    # Mesmo fallback do urllib3: tenta cada endereço em ordem
+                    for address in addresses:
+                        self._dns_host = address
+                        try:
+                            sock = super()._new_conn()
+                        except (NewConnectionError, ConnectTimeoutError) as e:
+                            error = e
+                            continue
+                        adapter._count("new_connections")
+                        return sock
+                finally:
+                    # TLS (SNI e verificação do certificado) continua usando o nome
+                    self._dns_host = host
+                adapter.dns_cache.invalidate(host, self.port)
+                raise error
+
+        return CountingConnection
+
+    def pool_class(base: type, connection_base: type) -> type:
+        class CountingPool(base):
+            ConnectionCls = connection_class(connection_base)
+
+            def _make_request(self, conn, *args, **kwargs):
+                # Socket já aberto ao sair do pool = conexão reaproveitada; só
+                # conta quando a resposta chega
+                reused = conn.sock is not None
+                response = super()._make_request(conn, *args, **kwargs)
+                if reused:
+                    adapter._count("reused_connections")
+                return response
+
+        return CountingPool
+
+    return {
+        "http": pool_class(HTTPConnectionPool, HTTPConnection),
+        "https": pool_class(HTTPSConnectionPool, HTTPSConnection),
+    }
+
+
+class PooledAdapter(HTTPAdapter):
+    """``HTTPAdapter`` com pool explícito, TCP keep-alive e cache de DNS
+
+    O keep-alive mantém as conexões (e a sessão TLS) vivas entre os envios
+    periódicos, inclusive através de NATs e firewalls que descartam fluxos
+    parados, então uma conexão só é refeita quando falha: um erro de conexão
+    esvazia o pool e a próxima tentativa abre uma conexão nova. Com
+    ``idle_timeout``, conexões paradas há mais tempo que isso também são
+    descartadas antes do próximo envio; se usado, deve ficar acima da janela
+    de sondagem do keep-alive (``idle + interval * count``).
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        keepalive_idle: int = 60,
+        keepalive_interval: int = 15,
+        keepalive_count: int = 4,
+        idle_timeout: Optional[float] = None,
+        dns_ttl: Optional[float] = 300,
+        clock=time.monotonic,
+    ):
+        self.idle_timeout = idle_timeout
+        self.dns_cache = DNSCache(dns_ttl, clock) if dns_ttl else None
+        self.socket_options = keepalive_socket_options(keepalive_idle, keepalive_interval, keepalive_count)
+        self._clock = clock
+        self._stats_lock = threading.Lock()
+        self._last_used: Optional[float] = None
+
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.idle_evictions = 0
+        self.failure_evictions = 0
+
+        keepalive_window = keepalive_idle + keepalive_interval * keepalive_count
+        if idle_timeout and idle_timeout <= keepalive_window:
+            logger.warning(
+                f"idle_timeout ({idle_timeout}s) não passa da janela do keep-alive "
+                f"({keepalive_window}s): conexões saudáveis serão refeitas"
+            )
+
+        super().__init__(pool_connections=1, pool_maxsize=pool_size)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pool_classes(self)
+
+    def ensure_pool_size(self, size: int):
+        """Aumenta o pool para ``size`` conexões simultâneas (ex.: janela do pipeline)"""
+        if size > self._pool_maxsize:
+            self.poolmanager.clear()
+            self.init_poolmanager(self._pool_connections, size, self._pool_block)
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def send(self, request, **kwargs):
+        now = self._clock()
+        with self._stats_lock:
+            idle = None if self._last_used is None else now - self._last_used
+            self._last_used = now
+            self.requests += 1
+            evict = bool(self.idle_timeout and idle is not None and idle > self.idle_timeout)
+            if evict:
+                self.idle_evictions += 1
+        if evict:
+            logger.debug(f"Conexões ociosas há {idle:.0f}s descartadas")
+            self.poolmanager.clear()
+        try:
+            return super().send(request, **kwargs)
+        except RequestsConnectionError:
+            # Conexão caiu (servidor, NAT ou rede): não reaproveitar as outras do pool
+            self._count("failure_evictions")
+            self.poolmanager.clear()
+            raise
+        finally:
+            with self._stats_lock:
+                self._last_used = self._clock()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Requisições, conexões novas (handshakes) e requisições servidas por conexões reaproveitadas"""
+        with self._stats_lock:
+            stats = {
+                "requisicoes": self.requests,
+                "conexoes_novas": self.new_connections,
+                "conexoes_reaproveitadas": self.reused_connections,
+                "descartes_ociosas": self.idle_evictions,
+                "descartes_falha": self.failure_evictions,
+            }
+        if self.dns_cache is not None:
+            stats["dns"] = self.dns_cache.get_stats()
+        return stats
+
+
+def create_pooled_adapter(settings: Optional[Dict[str, Any]] = None) -> PooledAdapter:
+    """Cria o adapter com ``API_CONFIG["connection_pool"]``"""
+    if settings is None:
+        settings = API_CONFIG.get("connection_pool", {})
+    return PooledAdapter(**settings)
@@ -0,0 +1,90 @@
+"""
+Identidade da máquina enviada nos payloads de status
+"""
+
+import time
+import socket
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+from config import MONITORING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class MachineIdentity:
+    """Controla quando o bloco ``machine_info`` acompanha o payload de status
+
+    A identidade (hostname, MAC, SO, tipo) é calculada uma vez pelo
+    ``AuthService`` e enviada no início da sessão, quando muda ou a cada
+    ``identity_resend_interval`` segundos. Ela só conta como entregue quando
+    o servidor confirma um payload que a levava (``confirm_delivery``): se o
+    snapshot for descartado pela fila ou for para o spool, os próximos
+    continuam levando o bloco. Fora isso o payload leva apenas ``machine_id``
+    (o MAC, mesma chave usada na configuração). A detecção de mudança compara
+    só o hostname, que é barato de obter, e roda no máximo a cada
+    ``identity_check_interval`` segundos.
+    """
+
+    def __init__(self, auth_service, clock: Callable[[], float] = time.monotonic):
+        self.auth_service = auth_service
+        self.check_interval = MONITORING_CONFIG.get("identity_check_interval", 300)
+        self.resend_interval = MONITORING_CONFIG.get("identity_resend_interval", 3600)
+        self._clock = clock
+        self._last_check = clock()
+        # Última entrega confirmada pelo servidor (None = enviar no próximo payload)
+        self._last_sent = None
+        self._lock = threading.Lock()
+
+        # Estado persistido pode ser de uma execução anterior
+        self._check_hostname()
+
+    def _check_hostname(self) -> bool:
+        """Recalcula a identidade se o hostname mudou; retorna True se mudou"""
+        try:
+            hostname = socket.gethostname()
+        except Exception:
+            return False
+
+        if hostname == self.auth_service.get_machine_info().get("hostname"):
+            return False
+
+        logger.info(f"Hostname alterado para {hostname}, atualizando identidade da máquina")
+        self.auth_service.refresh_machine_info()
+        return True
+
+    def get_machine_info(self) -> Dict[str, Any]:
+        """Identidade completa da máquina, incluindo o tipo"""
+        machine_info = dict(self.auth_service.get_machine_info())
+        machine_info["type"] = self.auth_service.get_machine_type()
+        return machine_info
+
+    def payload_fields(self) -> Dict[str, Any]:
+        """Campos de identidade a incluir no payload deste ciclo"""
+        now = self._clock()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self._check_hostname():
+                with self._lock:
+                    self._last_sent = None
+
+        fields: Dict[str, Any] = {
+            "machine_id": self.auth_service.get_machine_info()["mac_address"],
+        }
+        with self._lock:
+            due = self._last_sent is None or now - self._last_sent >= self.resend_interval
+        if due:
+            fields["machine_info"] = self.get_machine_info()
+        return fields
+
+    def confirm_delivery(self, payload: Dict[str, Any]):
+        """O servidor aceitou ``payload``: a identidade que ele levava foi entregue
+
+        Uma identidade anterior a uma mudança de hostname não conta.
+        """
+        machine_info = payload.get("machine_info")
+        if machine_info is None or machine_info != self.get_machine_info():
+            return
+        with self._lock:
+            self._last_sent = self._clock()
@@ -0,0 +1,306 @@
+"""
+Spool local em disco para envios de status que falharam
+"""
+
+import os
+import json
+import asyncio
+import functools
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import FILE_CONFIG, UPLOAD_CONFIG
+from .api_client import APIResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _payload_timestamp(system_data: Dict[str, Any]) -> float:
+    """Obtém o instante de coleta do snapshot (epoch) para ordenar o replay"""
+    try:
+        return datetime.fromisoformat(system_data["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+
+
+def is_retryable(response: APIResponse) -> bool:
+    """Indica se a falha é transitória (rede, 429 ou 5xx) e vale guardar no spool
+
+    Erros 4xx de validação nunca passariam no reenvio e travariam o spool.
+    """
+    return response.status_code == 0 or response.status_code == 429 or response.status_code >= 500
+
+
+async def _in_thread(executor: Optional[Executor], func: Callable[..., Any], *args: Any) -> Any:
+    """Roda uma operação bloqueante (SQLite) fora do loop asyncio"""
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args))
+
+
+class OfflineSpool:
+    """Armazena snapshots não enviados em SQLite (modo WAL) sob ``data/``
+
+    Os snapshots sobrevivem a reinícios do ``scripts/background_monitor.py`` e
+    são reenviados em ordem de coleta quando a API volta. O tamanho total e a
+    idade dos itens são limitados; ao estourar, os mais antigos saem primeiro.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.path = path or FILE_CONFIG["spool_file"]
+        self.max_bytes = max_bytes if max_bytes is not None else UPLOAD_CONFIG.get("spool_max_bytes", 50 * 1024**2)
+        self.max_age = max_age if max_age is not None else UPLOAD_CONFIG.get("spool_max_age", 7 * 24 * 3600)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS spool ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " collected_at REAL NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " payload TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS spool_order ON spool (collected_at, id)"
+            )
+            # Total em bytes mantido em memória: prune não soma a tabela a cada append
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM spool").fetchone()[0]
+
+    def append(self, system_data: Dict[str, Any]) -> bool:
+        """Guarda um snapshot para reenvio posterior"""
+        try:
+            payload = json.dumps(system_data, ensure_ascii=False, separators=(",", ":"))
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO spool (collected_at, size, payload) VALUES (?, ?, ?)",
+                    (_payload_timestamp(system_data), len(payload), payload),
+                )
+                self._bytes += len(payload)
+            self.prune()
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao gravar snapshot no spool: {e}")
+            return False
+
+    def peek(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Retorna até ``limit`` snapshots mais antigos (id, dados) sem removê-los"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload FROM spool ORDER BY collected_at, id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def remove(self, ids: List[int]):
+        """Remove snapshots já confirmados pelo servidor"""
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._delete(ids)
+
+    def _delete(self, ids: List[int]):
+        """Apaga ``ids`` e desconta o tamanho deles do total (com ``_lock`` e transação abertos)"""
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            self._bytes -= self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM spool WHERE id IN ({marks})", chunk
+            ).fetchone()[0]
+            self._conn.execute(f"DELETE FROM spool WHERE id IN ({marks})", chunk)
+
+    def prune(self):
+        """Aplica os limites de idade e tamanho, descartando os mais antigos"""
+        with self._lock, self._conn:
+            # Só os expirados são lidos (faixa inicial do índice spool_order)
+            cutoff = time.time() - self.max_age
+            expired, expired_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM spool WHERE collected_at < ?",
+                (cutoff,),
+            ).fetchone()
+            if expired:
+                self._conn.execute("DELETE FROM spool WHERE collected_at < ?", (cutoff,))
+                self._bytes -= expired_bytes
+
+            evicted = 0
+            if self._bytes > self.max_bytes:
+                # Percorre do mais antigo ao mais novo até liberar o excesso
+                excess = self._bytes - self.max_bytes
+                ids = []
+                for row_id, size in self._conn.execute(
+                    "SELECT id, size FROM spool ORDER BY collected_at, id"
+                ):
+                    ids.append(row_id)
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._delete(ids)
+                evicted = len(ids)
+
+        if expired or evicted:
+            logger.warning(
+                f"Spool: {expired} snapshot(s) expirado(s) e {evicted} descartado(s) por tamanho"
+            )
+
+    def replay(self, send: Callable[[Dict[str, Any]], APIResponse], limit: Optional[int] = None) -> int:
+        """Reenvia snapshots em ordem de coleta, parando na primeira falha
+
+        Retorna quantos snapshots foram confirmados e removidos do spool.
+        """
+        if limit is None:
+            limit = UPLOAD_CONFIG.get("spool_replay_batch", 50)
+
+        sent = 0
+        for row_id, system_data in self.peek(limit):
+            outcome = self._settle(row_id, send(system_data))
+            if outcome is None:
+                break
+            sent += outcome
+
+        self._log_replay(sent)
+        return sent
+
+    async def replay_async(self, send: Callable[[Dict[str, Any]], Awaitable[APIResponse]],
+                           limit: Optional[int] = None, executor: Optional[Executor] = None) -> int:
+        """Igual a ``replay``, aguardando cada envio (mantém a ordem de coleta)
+
+        As operações no SQLite rodam em ``executor`` (o padrão do loop se
+        None), para não bloquear o loop.
+        """
+        if limit is None:
+            limit = UPLOAD_CONFIG.get("spool_replay_batch", 50)
+
+        sent = 0
+        for row_id, system_data in await _in_thread(executor, self.peek, limit):
+            outcome = await _in_thread(executor, self._settle, row_id, await send(system_data))
+            if outcome is None:
+                break
+            sent += outcome
+
+        await _in_thread(executor, self._log_replay, sent)
+        return sent
+
+    def _settle(self, row_id: int, response: APIResponse) -> Optional[int]:
+        """Remove o snapshot confirmado ou rejeitado; None para interromper o replay"""
+        if not response.success:
+            if is_retryable(response):
+                logger.warning(f"Replay do spool interrompido: {response.error}")
+                return None
+            # Rejeitado pelo servidor: reenviar de novo não adianta
+            logger.error(f"Snapshot do spool rejeitado e descartado: {response.error}")
+            self.remove([row_id])
+            return 0
+        self.remove([row_id])
+        return 1
+
+    def _log_replay(self, sent: int):
+        if sent:
+            logger.info(f"Spool: {sent} snapshot(s) reenviado(s), {len(self)} pendente(s)")
+
+    def replay_batch(self, send_batch: Callable[[List[Dict[str, Any]]], APIResponse],
+                     limit: Optional[int] = None) -> int:
+        """Reenvia os snapshots mais antigos em um único lote
+
+        Usa ``data["enviados"]`` da resposta para remover exatamente os
+        snapshots aceitos. Se o servidor rejeitar o lote (4xx), o primeiro
+        snapshot não aceito é descartado para não travar o spool.
+        """
+        if limit is None:
+            limit = UPLOAD_CONFIG.get("spool_replay_batch", 50)
+
+        entries = self.peek(limit)
+        if not entries:
+            return 0
+
+        sent = self._settle_batch(entries, send_batch([system_data for _, system_data in entries]))
+        self._log_replay(sent)
+        return sent
+
+    def replay_pipelined(self, pipeline, send_batch: Callable[[List[Dict[str, Any]]], APIResponse],
+                         limit: Optional[int] = None) -> int:
+        """Reenvia até ``pipeline.window`` lotes simultâneos de ``limit`` snapshots
+
+        Cada lote é confirmado pela própria resposta: só os snapshots que ela
+        aceitou (``data["enviados"]``) saem do spool, então a falha de um lote
+        não desfaz nem repete os outros.
+        """
+        if limit is None:
+            limit = UPLOAD_CONFIG.get("spool_replay_batch", 50)
+
+        entries = self.peek(limit * pipeline.window)
+        chunks = [entries[start:start + limit] for start in range(0, len(entries), limit)]
+        futures = [
+            (chunk, pipeline.submit(send_batch, [system_data for _, system_data in chunk]))
+            for chunk in chunks
+        ]
+
+        sent = 0
+        for chunk, future in futures:
+            try:
+                response = future.result()
+            except Exception as e:
+                response = APIResponse(False, error=f"Erro no envio do lote: {e}")
+            sent += self._settle_batch(chunk, response)
+
+        self._log_replay(sent)
+        return sent
+
+    async def replay_batch_async(self, send_batch: Callable[[List[Dict[str, Any]]], Awaitable[APIResponse]],
+                                 limit: Optional[int] = None, executor: Optional[Executor] = None) -> int:
+        """Igual a ``replay_batch``, aguardando o envio do lote (SQLite em ``executor``)"""
+        if limit is None:
+            limit = UPLOAD_CONFIG.get("spool_replay_batch", 50)
+
+        entries = await _in_thread(executor, self.peek, limit)
+        if not entries:
+            return 0
+
+        response = await send_batch([system_data for _, system_data in entries])
+        sent = await _in_thread(executor, self._settle_batch, entries, response)
+        await _in_thread(executor, self._log_replay, sent)
+        return sent
+
+    def _settle_batch(self, entries: List[Tuple[int, Dict[str, Any]]], response: APIResponse) -> int:
+        """Remove do spool os snapshots aceitos pelo lote (e o rejeitado, em 4xx)"""
+        ids = [row_id for row_id, _ in entries]
+        if response.success:
+            sent = len(ids)
+        else:
+            sent = (response.data or {}).get("enviados", 0)
+
+        if response.success or is_retryable(response):
+            self.remove(ids[:sent])
+            if not response.success:
+                logger.warning(f"Replay do spool interrompido: {response.error}")
+        else:
+            logger.error(f"Snapshot do spool rejeitado e descartado: {response.error}")
+            self.remove(ids[:sent + 1])
+        return sent
+
+    @property
+    def total_bytes(self) -> int:
+        """Tamanho somado dos snapshots guardados (o que ``max_bytes`` limita)"""
+        with self._lock:
+            return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
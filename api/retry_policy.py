@@ -0,0 +1,77 @@
+"""
+Política de novas tentativas com backoff exponencial e jitter
+"""
+
+import random
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from config import API_CONFIG, AUTH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Respostas transitórias que valem nova tentativa (0 = erro de rede/timeout)
+RETRYABLE_STATUS = {0, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Converte o header ``Retry-After`` (segundos ou data HTTP) em segundos"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Quantas tentativas fazer e quanto esperar entre elas
+
+    A espera é "full jitter": um valor aleatório entre 0 e
+    ``min(max_delay, base_delay * 2**tentativa)``, para que agentes que
+    falharam juntos não voltem todos no mesmo instante. Um ``Retry-After``
+    do servidor vira o piso da espera; se passar de ``max_delay``, a
+    requisição desiste em vez de segurar o chamador.
+    """
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Espera antes da tentativa ``attempt + 1``; None quando não vale tentar de novo"""
+        if attempt + 1 >= self.attempts:
+            return None
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def load_retry_policies() -> Dict[str, RetryPolicy]:
+    """Políticas por perfil de endpoint a partir de ``API_CONFIG["retry_policies"]``
+
+    O perfil ``default`` herda ``retry_attempts``/``retry_delay`` de
+    ``API_CONFIG`` (sobrescrito em produção) ou, na falta, de ``AUTH_CONFIG``.
+    """
+    default: Dict[str, Any] = {
+        "attempts": API_CONFIG.get("retry_attempts", AUTH_CONFIG.get("retry_attempts", 3)),
+        "base_delay": API_CONFIG.get("retry_delay", AUTH_CONFIG.get("retry_delay", 1.0)),
+    }
+    profiles = API_CONFIG.get("retry_policies", {})
+    policies = {"default": RetryPolicy(**{**default, **profiles.get("default", {})})}
+    for name, settings in profiles.items():
+        if name != "default":
+            policies[name] = RetryPolicy(**{**default, **settings})
+    return policies
@@ -0,0 +1,97 @@
+"""
+Envios em pipeline: até N requisições de status em andamento ao mesmo tempo
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Set
+
+from config import UPLOAD_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class UploadPipeline:
+    """Janela limitada de envios simultâneos sobre as conexões da sessão
+
+    Em enlaces de alta latência (satélite, VPN) um envio por vez limita a
+    vazão a uma requisição por RTT. Aqui até ``window`` envios ficam em
+    andamento; ``submit`` bloqueia quando a janela está cheia, o que propaga
+    a contrapressão para a fila de envio. Cada envio trata a própria
+    resposta (spool do que não foi confirmado), então a ordem de chegada ao
+    servidor pode variar; os snapshots levam o próprio timestamp.
+    """
+
+    def __init__(self, window: int = 4):
+        self.window = max(1, window)
+        self._executor = ThreadPoolExecutor(self.window, thread_name_prefix="UploadPipeline")
+        self._slots = threading.BoundedSemaphore(self.window)
+        self._lock = threading.Lock()
+        self._pending: Set[Future] = set()
+
+        self.submitted = 0
+        self.max_in_flight = 0
+
+    def submit(self, send: Callable[..., Any], *args: Any) -> Future:
+        """Agenda ``send(*args)``; aguarda uma vaga se houver ``window`` envios em andamento"""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(send, *args)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+            self.submitted += 1
+            self.max_in_flight = max(self.max_in_flight, len(self._pending))
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+        if future.exception() is not None:
+            logger.error(f"Erro em envio do pipeline: {future.exception()}")
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def close(self, timeout: Optional[float] = None):
+        """Aguarda até ``timeout`` os envios em andamento e encerra as threads"""
+        with self._lock:
+            pending = set(self._pending)
+        if pending:
+            _, not_done = wait(pending, timeout)
+            if not_done:
+                logger.warning(f"Pipeline encerrado com {len(not_done)} envio(s) em andamento")
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna tamanho da janela e ocupação"""
+        return {
+            "janela": self.window,
+            "em_andamento": self.in_flight,
+            "max_em_andamento": self.max_in_flight,
+            "agendados": self.submitted,
+        }
+
+
+def create_upload_pipeline(api_client, window: Optional[int] = None) -> Optional[UploadPipeline]:
+    """Cria o pipeline com ``UPLOAD_CONFIG["pipeline_window"]``; None se a janela for 1
+
+    O pool de conexões do ``api_client`` é ampliado para a janela, para que
+    os envios simultâneos reaproveitem conexões em vez de abrir e descartar
+    conexões extras a cada envio.
+    """
+    if window is None:
+        window = UPLOAD_CONFIG.get("pipeline_window", 1)
+    if window <= 1:
+        return None
+
+    api_client.adapter.ensure_pool_size(window)
+    logger.info(f"Pipeline de envio com janela de {window} requisições")
+    return UploadPipeline(window)
@@ -0,0 +1,206 @@
+"""
+Fila limitada entre a coleta e o envio de dados de monitoramento
+"""
+
+import json
+import time
+import threading
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from config import UPLOAD_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Políticas quando a fila está cheia
+DROP_OLDEST = "drop_oldest"      # descarta o item mais antigo da fila
+DROP_NEWEST = "drop_newest"      # descarta o item que está chegando
+COALESCE = "coalesce"            # mescla o item novo no último enfileirado
+
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+
+class UploadQueue:
+    """Fila limitada e thread-safe de snapshots aguardando envio
+
+    Itens prioritários (ex.: alertas) ficam em uma fila à parte, sempre
+    entregue antes da fila normal e sem limite: alertas só surgem nas
+    transições das regras e nunca são descartados.
+    """
+
+    def __init__(self, maxsize: int = 60, overflow_policy: str = DROP_OLDEST):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de overflow inválida: {overflow_policy}")
+
+        self.maxsize = max(1, maxsize)
+        self.overflow_policy = overflow_policy
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._priority: Deque[Dict[str, Any]] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, item: Dict[str, Any], priority: bool = False) -> bool:
+        """Enfileira sem bloquear; retorna False se o item foi descartado"""
+        with self._condition:
+            if self._closed:
+                return False
+
+            if priority:
+                self._priority.append(item)
+                self._condition.notify()
+                return True
+
+            if len(self._items) >= self.maxsize:
+                if self.overflow_policy == DROP_NEWEST:
+                    self.dropped += 1
+                    logger.warning("Fila de envio cheia: snapshot novo descartado")
+                    return False
+                if self.overflow_policy == COALESCE:
+                    # Snapshot mais recente prevalece sobre os campos do anterior;
+                    # um dict novo, pois o enfileirado pode já estar com o chamador
+                    self._items[-1] = {**self._items[-1], **item}
+                    self.coalesced += 1
+                    self._condition.notify()
+                    return True
+                self._items.popleft()
+                self.dropped += 1
+                logger.warning("Fila de envio cheia: snapshot mais antigo descartado")
+
+            self._items.append(item)
+            self._condition.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Retira o próximo item, aguardando até ``timeout`` (None se fechada/vazia)"""
+        with self._condition:
+            if not self._priority and not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if self._priority:
+                return self._priority.popleft()
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        """Fecha a fila e acorda o consumidor (itens restantes ainda podem ser lidos)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._priority) + len(self._items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna ocupação e descartes da fila"""
+        return {
+            "pendentes": len(self),
+            "descartados": self.dropped,
+            "mesclados": self.coalesced,
+        }
+
+
+class StatusUploader(threading.Thread):
+    """Thread consumidora que envia os snapshots da fila
+
+    Isola a latência da API do loop de coleta: um servidor lento atrasa só
+    esta thread, enquanto a coleta continua na cadência configurada e a fila
+    aplica a política de overflow.
+    """
+
+    def __init__(
+        self,
+        queue: UploadQueue,
+        send: Callable[[Dict[str, Any]], Any],
+        send_batch: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    ):
+        super().__init__(name="StatusUploader", daemon=True)
+        self.queue = queue
+        self._send = send
+        # Com send_batch, os snapshots são agrupados antes do envio
+        self._send_batch = send_batch
+        self.batch_size = UPLOAD_CONFIG.get("batch_size", 20)
+        self.batch_max_bytes = UPLOAD_CONFIG.get("batch_max_bytes", 256 * 1024)
+        self.batch_max_latency = UPLOAD_CONFIG.get("batch_max_latency", 30)
+
+    def run(self):
+        logger.info("Thread de envio iniciada")
+        if self._send_batch is not None:
+            self._run_batched()
+        else:
+            self._run_single()
+        logger.info("Thread de envio finalizada")
+
+    def _run_single(self):
+        while True:
+            item = self.queue.get(timeout=1.0)
+            if item is None:
+                if self.queue.closed:
+                    break
+                continue
+            try:
+                self._send(item)
+            except Exception as e:
+                logger.error(f"Erro na thread de envio: {e}")
+
+    def _run_batched(self):
+        """Agrupa snapshots e envia ao atingir quantidade, bytes ou latência máxima"""
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+        started = 0.0
+
+        while True:
+            if batch:
+                timeout = max(0.0, started + self.batch_max_latency - time.monotonic())
+            else:
+                timeout = 1.0
+
+            item = self.queue.get(timeout=timeout)
+            if item is not None:
+                if not batch:
+                    started = time.monotonic()
+                batch.append(item)
+                batch_bytes += len(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+
+            closing = item is None and self.queue.closed
+            # Alertas não esperam o lote encher
+            urgent = item is not None and "alertas" in item
+            if batch and (
+                closing
+                or urgent
+                or len(batch) >= self.batch_size
+                or batch_bytes >= self.batch_max_bytes
+                or time.monotonic() - started >= self.batch_max_latency
+            ):
+                try:
+                    self._send_batch(batch)
+                except Exception as e:
+                    logger.error(f"Erro na thread de envio: {e}")
+                batch, batch_bytes = [], 0
+
+            if closing:
+                break
+
+    def stop(self, timeout: Optional[float] = None):
+        """Fecha a fila e aguarda o envio dos itens pendentes"""
+        self.queue.close()
+        if self.is_alive():
+            self.join(timeout)
+
+
+def create_upload_queue() -> UploadQueue:
+    """Cria a fila de envio com os parâmetros de ``UPLOAD_CONFIG``"""
+    policy = UPLOAD_CONFIG.get("overflow_policy", DROP_OLDEST)
+    if policy not in OVERFLOW_POLICIES:
+        logger.warning(f"Política de overflow inválida '{policy}', usando {DROP_OLDEST}")
+        policy = DROP_OLDEST
+
+    return UploadQueue(maxsize=UPLOAD_CONFIG.get("queue_size", 60), overflow_policy=policy)
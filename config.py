@@ -12,7 +12,26 @@ API_CONFIG = {
         "https://wretched-casket-7vrr9w7rv5q5fxjp5-8000.app.github.dev",
     ),
     "timeout": 10,
-    "user_agent": "Rocks-Monitoramento-Desktop/1.0"
+    "user_agent": "Rocks-Monitoramento-Desktop/1.0",
+    # Novas tentativas por perfil de endpoint (backoff exponencial com jitter).
+    # O perfil default herda retry_attempts/retry_delay; status desiste rápido
+    # porque o spool offline guarda o que falhar
+    "retry_policies": {
+        "default": {"max_delay": 10},
+        "status": {"attempts": 2, "base_delay": 0.5, "max_delay": 2},
+        "config": {"attempts": 5, "base_delay": 1, "max_delay": 30},
+    },
+    # Pool de conexões compartilhado pelo processo (ver api/connection_pool.py)
+    "connection_pool": {
+        "pool_size": 10,  # conexões mantidas por host
+        "keepalive_idle": 60,  # segundos sem tráfego até a primeira sonda TCP
+        "keepalive_interval": 15,
+        "keepalive_count": 4,
+        # Descartar conexões paradas há mais que isso (None = só quando falham;
+        # se usado, deve passar de keepalive_idle + interval * count = 120s)
+        "idle_timeout": None,
+        "dns_ttl": 300,  # validade do cache de DNS (0 desativa)
+    },
 }
 
 # Configurações de logging
@@ -49,7 +68,150 @@ MONITORING_CONFIG = {
     "default_interval": 5,  # segundos
     "min_interval": 1,
     "max_interval": 10,
-    "top_processes_limit": 5
+    "top_processes_limit": 5,
+    # Rankings de processos calculados na mesma varredura
+    # (cpu, memoria, io, threads, fds)
+    "top_processes_rankings": ["cpu", "memoria"],
+    # Período de cada coletor em segundos (None = frequência de envio)
+    "collector_intervals": {
+        "cpu": None,
+        "ram": None,
+        "disco": 30,
+        "rede": None,
+        "temperatura": None,
+        "processos": 15,
+    },
+    # Amostras recentes mantidas em memória (buffer circular por coletor)
+    "ring_buffer": {
+        "seconds": 300,
+        "fields": {
+            "cpu": ["percentual_total"],
+            "ram": ["percentual", "usado_gb"],
+            "disco": ["percentual"],
+            "rede": ["bytes_enviados_s", "bytes_recebidos_s"],
+            "temperatura": ["cpu"],
+        },
+    },
+    # Amostragem rápida agregada no envio (min/max/média/p95/último); os
+    # coletores listados rodam a cada ``interval`` segundos (None desativa)
+    "window_sampling": {
+        "interval": 0.25,
+        "collectors": ["cpu", "ram"],
+    },
+    # Detecção de anomalias no agente (EWMA/z-score), enviada em "anomalias"
+    "anomaly_detection": {
+        "enabled": os.getenv("ROCKS_ANOMALY_DETECTION", "1") == "1",
+        "alpha": 0.05,  # peso da amostra nova na média/variância móveis
+        "sigma": 3.0,
+        "sigma_by_machine_type": {"server": 4.0},
+        "warmup": 20,  # amostras antes de começar a sinalizar
+        # Piso do desvio padrão no z-score, para um degrau mínimo após um
+        # trecho estável não virar anomalia: o maior entre o absoluto (por
+        # métrica ou min_std) e min_relative_std vezes a média
+        "min_std": 0.5,
+        "min_relative_std": 0.02,
+        "min_std_by_metric": {
+            "temperatura.cpu": 2.0,  # °C
+            "disco.percentual": 1.0,  # lido do cache a cada 30s, muda em degraus
+            "rede.bytes_enviados_s": 1024.0,
+            "rede.bytes_recebidos_s": 1024.0,
+        },
+        "metrics": [
+            "cpu.percentual_total",
+            "ram.percentual",
+            "disco.percentual",
+            "rede.bytes_enviados_s",
+            "rede.bytes_recebidos_s",
+            "temperatura.cpu",
+        ],
+    },
+    # Regras de alerta locais: "<métrica> <op> <limite> [for <duração>s|m|h]";
+    # histerese é a margem que o valor precisa recuar para o alerta resolver
+    "alert_rules": [
+        {"regra": "cpu.percentual_total > 95 for 30s", "histerese": 10},
+        {"regra": "ram.percentual > 90 for 60s", "histerese": 5},
+        {"regra": "disco.percentual > 90", "histerese": 2},
+        {"regra": "temperatura.cpu > 85 for 30s", "histerese": 5},
+    ],
+    # Interfaces fora das taxas de rede (loopback e virtuais)
+    "network_exclude_loopback": True,
+    "network_exclude_prefixes": ["docker", "veth", "br-", "virbr", "vnet"],
+    # Sistemas de arquivos ignorados pelo coletor de discos (pseudo/virtuais)
+    "disk_exclude_fstypes": [
+        "tmpfs", "devtmpfs", "overlay", "squashfs", "proc", "sysfs", "cgroup",
+        "cgroup2", "devpts", "mqueue", "debugfs", "tracefs", "securityfs",
+        "pstore", "bpf", "autofs", "configfs", "fusectl", "hugetlbfs",
+        "binfmt_misc", "nsfs", "ramfs", "rpc_pipefs", "efivarfs",
+    ],
+    # Compartilhamentos de rede (nfs, cifs, sshfs...) ficam de fora por padrão:
+    # ler o uso deles pode travar a coleta se o servidor de arquivos cair
+    "disk_include_network": False,
+    # Fora do Linux (sem aviso de mudança de montagens) a lista é refeita neste período
+    "disk_mount_refresh_interval": 60,  # segundos
+    # Backend de coleta: auto (/proc no Linux, psutil nos demais), procfs ou psutil
+    "collector_backend": os.getenv("ROCKS_COLLECTOR_BACKEND", "auto"),
+    # Identidade da máquina: verificação barata de mudança (hostname) e
+    # reenvio completo periódico do bloco machine_info
+    "identity_check_interval": 300,  # segundos
+    "identity_resend_interval": 3600,  # segundos
+}
+
+# Configurações de envio dos dados de monitoramento
+UPLOAD_CONFIG = {
+    "queue_size": 60,  # snapshots aguardando envio
+    # Política quando a fila enche: drop_oldest, drop_newest ou coalesce
+    "overflow_policy": os.getenv("ROCKS_UPLOAD_OVERFLOW", "drop_oldest"),
+    # Spool offline para envios que falharam
+    "spool_max_bytes": 50 * 1024 * 1024,
+    "spool_max_age": 7 * 24 * 3600,  # segundos
+    "spool_replay_batch": 50,  # snapshots reenviados por envio bem-sucedido
+    # Envio em lote (PUT /api/maquina/status/batch); cai para envios
+    # individuais se o servidor não anunciar suporte
+    "batch_enabled": os.getenv("ROCKS_UPLOAD_BATCH", "0") == "1",
+    "batch_size": 20,  # snapshots por lote
+    "batch_max_bytes": 256 * 1024,
+    "batch_max_latency": 30,  # segundos até um lote incompleto ser enviado
+    # Compressão do corpo dos envios de status: none, gzip, zstd ou auto
+    # (zstd requer o pacote zstandard e o anúncio do servidor em /api/health)
+    "compression": os.getenv("ROCKS_UPLOAD_COMPRESSION", "none"),
+    "compression_min_bytes": 1024,  # corpos menores vão sem compressão
+    # Disjuntor dos envios de status: aberto, os snapshots vão direto ao spool
+    "circuit_breaker": {
+        "failure_threshold": 5,  # falhas seguidas para abrir
+        "error_rate": 0.5,  # ou fração de falhas nas últimas `window` chamadas
+        "window": 20,
+        "min_calls": 10,
+        "open_timeout": 30,  # segundos até testar o servidor (dobra a cada teste falho)
+        "max_open_timeout": 300,
+    },
+    # Envios simultâneos (pipeline) para enlaces de alta latência; 1 = um
+    # envio por vez, na ordem de coleta
+    "pipeline_window": int(os.getenv("ROCKS_UPLOAD_WINDOW", "1")),
+    # Loop asyncio (scripts/background_monitor.py --async): coleta, envio,
+    # replay do spool e verificação de saúde concorrentes em uma só thread
+    "async_loop": os.getenv("ROCKS_ASYNC_LOOP", "0") == "1",
+    "max_in_flight": 4,  # requisições simultâneas no cliente assíncrono
+    "health_check_interval": 60,  # segundos entre verificações de /api/health
+}
+
+# Histórico local de métricas (data/historico.db)
+HISTORY_CONFIG = {
+    "enabled": os.getenv("ROCKS_HISTORY", "1") == "1",
+    # Caminhos no payload gravados a cada envio
+    "metrics": [
+        "cpu.percentual_total",
+        "ram.percentual",
+        "disco.percentual",
+        "rede.bytes_enviados_s",
+        "rede.bytes_recebidos_s",
+        "temperatura.cpu",
+    ],
+    # Retenção por resolução, em segundos
+    "retention": {
+        "raw": 24 * 3600,
+        "1m": 7 * 24 * 3600,
+        "1h": 180 * 24 * 3600,
+    },
 }
 
 # Configurações de autenticação
@@ -66,6 +228,8 @@ FILE_CONFIG = {
     "machine_config_file": os.path.join("data", "configuracao_maquina.json"),
     "background_monitor_script": os.path.join("scripts", "background_monitor.py"),
     "auth_state_file": os.path.join("data", "auth_state.json"),
+    "spool_file": os.path.join("data", "spool_status.db"),
+    "history_file": os.path.join("data", "historico.db"),
 }
 
 def get_config() -> Dict[str, Any]:
@@ -75,6 +239,8 @@ def get_config() -> Dict[str, Any]:
         "logging": LOGGING_CONFIG,
         "ui": UI_CONFIG,
         "monitoring": MONITORING_CONFIG,
+        "upload": UPLOAD_CONFIG,
+        "history": HISTORY_CONFIG,
         "auth": AUTH_CONFIG,
         "files": FILE_CONFIG
     }
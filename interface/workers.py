@@ -7,6 +7,8 @@ from typing import Dict, Any
 from datetime import datetime
 from PySide6.QtCore import QThread, Signal
 from api.auth_service import AuthService
+from api.client_core import send_failure_level
+from api.upload_queue import StatusUploader, create_upload_queue
 
 logger = logging.getLogger(__name__)
 
@@ -63,9 +65,23 @@ class SystemMonitoringWorker(QThread):
         from .utils import get_auth_service
         self.auth_service = get_auth_service()
         
+        from api.machine_identity import MachineIdentity
+        self.machine_identity = MachineIdentity(self.auth_service)
+        
         # Importar o monitor do sistema
         from monitoramento.system_monitor import SystemMonitor
+        from monitoramento.scheduler import DeadlineTicker, create_scheduler
+        from monitoramento.history_store import create_history_store
         self.system_monitor = SystemMonitor()
+        self.scheduler = create_scheduler(self.system_monitor, config)
+        self.ticker = DeadlineTicker(self.scheduler.tick_interval)
+        
+        # Histórico local para diagnóstico sem o servidor
+        self.history = create_history_store()
+        
+        # Coleta e envio em threads separadas, ligadas por uma fila limitada
+        self.upload_queue = None
+        self.uploader = None
         
     def run(self):
         """Executa o monitoramento contínuo em thread separada"""
@@ -74,64 +90,58 @@ class SystemMonitoringWorker(QThread):
         
         logger.info(f"Iniciando monitoramento contínuo - Frequência: {self.frequency}s")
         
+        self.upload_queue = create_upload_queue()
+        self.uploader = StatusUploader(self.upload_queue, self.send_system_data)
+        self.uploader.start()
+        
         try:
             while self.is_running:
-                # Aguardar o tempo definido na frequência
-                self.msleep(self.frequency * 1000)  # Converter para milissegundos
+                # Aguardar o próximo prazo do ciclo base (cadência fixa, sem deriva)
+                ticks = self.ticker.wait(lambda seconds: self.msleep(int(seconds * 1000)))
                 
                 if not self.is_running:
                     break
                 
-                # Coletar dados do sistema baseado nos status monitorados
+                # Executar os coletores vencidos; só envia quando o envio vence
+                if not self.scheduler.run_pending(ticks):
+                    continue
+                
                 system_data = self.collect_system_data()
+                if self.history:
+                    self.history.record(system_data)
                 
-                # Enviar dados para a API
-                self.send_system_data(system_data)
+                # Enfileirar para a thread de envio (não bloqueia a coleta)
+                self.upload_queue.put(system_data)
                 
         except Exception as e:
             logger.error(f"Erro no monitoramento contínuo: {e}")
             self.monitoring_error.emit(f"Erro no monitoramento: {str(e)}")
         finally:
             self.is_running = False
+            self.uploader.stop(timeout=self.frequency)
+            if self.history:
+                self.history.close()
+            self.system_monitor.close()
             self.monitoring_stopped.emit()
             logger.info("Monitoramento contínuo finalizado")
     
+    def get_recent_buffers(self):
+        """Amostras recentes de cada coletor em memória (gráficos e alertas locais)"""
+        return self.scheduler.buffers
+    
     def stop_monitoring(self):
         """Para o monitoramento contínuo"""
         self.is_running = False
         logger.info("Solicitação para parar monitoramento")
     
     def collect_system_data(self) -> Dict[str, Any]:
-        """Coleta dados do sistema baseado nos status monitorados"""
+        """Monta o payload com o último valor de cada coletor monitorado"""
         try:
-            data = {}
-            
-            # CPU
-            if self.monitored_status.get("cpu", False):
-                data["cpu"] = self.system_monitor.get_cpu_info()
-            
-            # RAM
-            if self.monitored_status.get("ram", False):
-                data["ram"] = self.system_monitor.get_ram_info()
-            
-            # Disco
-            if self.monitored_status.get("disco", False):
-                data["disco"] = self.system_monitor.get_disk_info()
-            
-            # Rede
-            if self.monitored_status.get("rede", False):
-                data["rede"] = self.system_monitor.get_network_info()
-            
-            # Temperatura
-            if self.monitored_status.get("temperatura", False):
-                data["temperatura"] = {"cpu": self.system_monitor.get_cpu_temperature()}
-            
-            # Processos
-            if self.monitored_status.get("processos", False):
-                data["top_5_processos_cpu"] = self.system_monitor.get_top_processes()
+            data = self.scheduler.latest()
             
-            # Adicionar informações da máquina
-            data["machine_info"] = self.auth_service.get_machine_info()
+            # Identidade da máquina (completa só na primeira vez ou quando muda)
+            data.update(self.machine_identity.payload_fields())
+            data["estatisticas_agendamento"] = self.ticker.get_stats()
             data["timestamp"] = datetime.now().isoformat()
             
             logger.debug(f"Dados coletados: {len(data)} categorias")
@@ -160,7 +170,7 @@ class SystemMonitoringWorker(QThread):
                 logger.debug("Dados do sistema enviados com sucesso")
                 self.data_sent.emit()
             else:
-                logger.warning(f"Erro ao enviar dados: {response.error}")
+                logger.log(send_failure_level(response, logging.WARNING), f"Erro ao enviar dados: {response.error}")
                 
         except Exception as e:
             logger.error(f"Erro ao enviar dados do sistema: {e}")
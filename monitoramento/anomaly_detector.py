@@ -0,0 +1,129 @@
+"""
+Detecção de anomalias em fluxo (EWMA / z-score) sobre as métricas coletadas
+"""
+
+import math
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import MONITORING_CONFIG
+from .snapshot import get_metric
+
+logger = logging.getLogger(__name__)
+
+
+class EWMAStats:
+    """Média e variância móveis exponenciais de uma métrica (memória constante)"""
+
+    __slots__ = ("alpha", "mean", "variance", "count")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    def std(self, floor: float = 0.0) -> float:
+        """Desvio padrão móvel, nunca abaixo de ``floor``"""
+        return max(math.sqrt(self.variance), floor)
+
+    def score(self, value: float, floor: float = 0.0) -> Optional[float]:
+        """z-score de ``value`` em relação à linha de base atual (antes de atualizá-la)
+
+        None quando a linha de base é degenerada (desvio zero e sem piso).
+        """
+        std = self.std(floor)
+        if std == 0.0:
+            return None
+        return (value - self.mean) / std
+
+    def update(self, value: float):
+        if self.count == 0:
+            self.mean = value
+        else:
+            deviation = value - self.mean
+            increment = self.alpha * deviation
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + deviation * increment)
+        self.count += 1
+
+
+class AnomalyDetector:
+    """Sinaliza amostras que se afastam mais de ``sigma`` desvios da linha de base
+
+    A linha de base é aprendida por máquina (EWMA), então um servidor com CPU
+    sempre alta e um PC ocioso têm cada um o seu "normal" sem limites fixos.
+    As primeiras ``warmup`` amostras de cada métrica só alimentam a linha de
+    base. Amostras anômalas também a atualizam, de modo que uma mudança
+    sustentada de patamar deixa de ser sinalizada com o tempo.
+
+    Depois de um trecho estável a variância móvel tende a zero e qualquer
+    degrau mínimo viraria um z enorme. Por isso o desvio usado no z tem um
+    piso: o maior entre ``min_std`` (ou o valor da métrica em
+    ``min_std_by_metric``) e ``min_relative_std`` vezes a média.
+    """
+
+    def __init__(
+        self,
+        metrics: Iterable[str],
+        alpha: float = 0.05,
+        sigma: float = 3.0,
+        warmup: int = 20,
+        min_std: float = 0.5,
+        min_relative_std: float = 0.02,
+        min_std_by_metric: Optional[Dict[str, float]] = None,
+    ):
+        self.metrics = list(metrics)
+        self.alpha = alpha
+        self.sigma = sigma
+        self.warmup = warmup
+        self.min_relative_std = min_relative_std
+        overrides = min_std_by_metric or {}
+        self._min_std = {metric: overrides.get(metric, min_std) for metric in self.metrics}
+        self._stats: Dict[str, EWMAStats] = {metric: EWMAStats(alpha) for metric in self.metrics}
+
+    def update(self, system_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Atualiza as linhas de base com o payload e retorna as métricas anômalas"""
+        anomalies = []
+        for metric, stats in self._stats.items():
+            value = get_metric(system_data, metric)
+            if value is None:
+                continue
+
+            if stats.count >= self.warmup:
+                floor = max(self._min_std[metric], self.min_relative_std * abs(stats.mean))
+                z = stats.score(value, floor)
+                if z is not None and abs(z) > self.sigma:
+                    anomalies.append({
+                        "metrica": metric,
+                        "valor": round(value, 2),
+                        "media": round(stats.mean, 2),
+                        "desvio": round(stats.std(floor), 2),
+                        "z": round(z, 2),
+                    })
+            stats.update(value)
+
+        if anomalies:
+            logger.info(f"Anomalias detectadas: {[a['metrica'] for a in anomalies]}")
+        return anomalies
+
+
+def create_anomaly_detector(machine_type: str = "pc") -> Optional[AnomalyDetector]:
+    """Cria o detector com ``MONITORING_CONFIG["anomaly_detection"]``; None se desativado
+
+    ``sigma_by_machine_type`` permite um limiar diferente para servidores e PCs.
+    """
+    settings = MONITORING_CONFIG.get("anomaly_detection", {})
+    if not settings.get("enabled", False):
+        return None
+
+    sigma = settings.get("sigma_by_machine_type", {}).get(machine_type, settings.get("sigma", 3.0))
+    return AnomalyDetector(
+        metrics=settings.get("metrics", []),
+        alpha=settings.get("alpha", 0.05),
+        sigma=sigma,
+        warmup=settings.get("warmup", 20),
+        min_std=settings.get("min_std", 0.5),
+        min_relative_std=settings.get("min_relative_std", 0.02),
+        min_std_by_metric=settings.get("min_std_by_metric"),
+    )
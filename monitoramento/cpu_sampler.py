@@ -0,0 +1,92 @@
+"""
+Amostrador de CPU baseado em deltas de cpu_times
+"""
+
+import time
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+def _busy_and_total(times) -> Tuple[float, float]:
+    """Retorna (tempo ocupado, tempo total) de um snapshot de cpu_times"""
+    total = sum(times)
+    # No Linux guest/guest_nice já estão contabilizados em user/nice
+    total -= getattr(times, "guest", 0.0)
+    total -= getattr(times, "guest_nice", 0.0)
+    busy = total - times.idle - getattr(times, "iowait", 0.0)
+    return busy, total
+
+
+def _percent(previous: Tuple[float, float], current: Tuple[float, float]) -> Optional[float]:
+    """Calcula o percentual de uso entre dois snapshots (None se não houve avanço)"""
+    total_delta = current[1] - previous[1]
+    if total_delta <= 0:
+        return None
+    percent = (current[0] - previous[0]) / total_delta * 100
+    return max(0.0, min(100.0, percent))
+
+
+class CPUSampler:
+    """Calcula o uso total e por núcleo com uma leitura não bloqueante por ciclo
+
+    Mantém o snapshot anterior de ``psutil.cpu_times(percpu=True)`` e deriva os
+    percentuais da diferença entre leituras consecutivas. Na primeira leitura
+    não há referência, então é feita uma espera curta (aquecimento) para que
+    os primeiros valores não saiam zerados.
+
+    ``read`` permite trocar a fonte dos tempos por núcleo (ex.: backend /proc);
+    deve retornar uma lista de (tempo ocupado, tempo total).
+    """
+
+    def __init__(self, warmup_interval: float = 0.25,
+                 read: Optional[Callable[[], List[Tuple[float, float]]]] = None):
+        self.warmup_interval = warmup_interval
+        if read is not None:
+            self._read = read
+        self._last_snapshot: Optional[List[Tuple[float, float]]] = None
+        self._last_total = 0.0
+        self._last_per_core: List[float] = []
+
+    def _read(self) -> List[Tuple[float, float]]:
+        return [_busy_and_total(times) for times in psutil.cpu_times(percpu=True)]
+
+    def reset(self):
+        """Descarta o snapshot anterior (o próximo ciclo fará aquecimento)"""
+        self._last_snapshot = None
+
+    def sample(self) -> Tuple[float, List[float]]:
+        """Retorna (percentual total, percentuais por núcleo) desde a última leitura"""
+        current = self._read()
+
+        if self._last_snapshot is None or len(self._last_snapshot) != len(current):
+            # Aquecimento: sem referência anterior o delta seria zero
+            self._last_snapshot = current
+            time.sleep(self.warmup_interval)
+            current = self._read()
+
+        previous = self._last_snapshot
+
+        total = _percent(
+            tuple(map(sum, zip(*previous))),
+            tuple(map(sum, zip(*current))),
+        )
+        if total is None:
+            # Leituras muito próximas: mantém a referência para acumular o delta
+            return self._last_total, list(self._last_per_core)
+
+        per_core = []
+        for index, (before, after) in enumerate(zip(previous, current)):
+            percent = _percent(before, after)
+            if percent is None:
+                # Núcleo sem avanço de contadores: reaproveita o último valor
+                percent = self._last_per_core[index] if index < len(self._last_per_core) else 0.0
+            per_core.append(percent)
+
+        self._last_snapshot = current
+        self._last_total = total
+        self._last_per_core = per_core
+        return total, per_core
@@ -0,0 +1,77 @@
+"""
+Notificações de desktop sem depender da interface gráfica
+"""
+
+import os
+import sys
+import shutil
+import logging
+import subprocess
+
+try:
+    from plyer import notification as plyer_notification
+except ImportError:  # plyer é opcional; sem ele usa-se a ferramenta do sistema
+    plyer_notification = None
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "Rocks Monitoramento"
+
+# Toast do Windows 10/11 via PowerShell; título e mensagem chegam por variáveis
+# de ambiente para não precisar escapar nada. O AppUserModelID é o do próprio
+# PowerShell, que já está registrado (um ID desconhecido não exibe o toast).
+_WINDOWS_TOAST = (
+    "[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, "
+    "ContentType = WindowsRuntime] | Out-Null;"
+    "$xml = [Windows.UI.Notifications.ToastNotificationManager]::GetTemplateContent("
+    "[Windows.UI.Notifications.ToastTemplateType]::ToastText02);"
+    "$text = $xml.GetElementsByTagName('text');"
+    "$text.Item(0).AppendChild($xml.CreateTextNode($env:ROCKS_NOTIFY_TITLE)) | Out-Null;"
+    "$text.Item(1).AppendChild($xml.CreateTextNode($env:ROCKS_NOTIFY_MESSAGE)) | Out-Null;"
+    "[Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("
+    "'{1AC14E77-02E7-4E5D-B744-2EB1AE5198B7}\\WindowsPowerShell\\v1.0\\powershell.exe')"
+    ".Show([Windows.UI.Notifications.ToastNotification]::new($xml))"
+)
+
+# Avisa uma única vez quando não há como notificar
+_unavailable_warned = False
+
+
+def _command(title: str, message: str):
+    """Comando nativo de notificação do sistema, ou None se não houver"""
+    if sys.platform.startswith("linux") and shutil.which("notify-send"):
+        return ["notify-send", "--app-name", APP_NAME, title, message]
+    if sys.platform == "darwin":
+        escape = lambda text: text.replace("\\", "\\\\").replace('"', '\\"')
+        return ["osascript", "-e", f'display notification "{escape(message)}" with title "{escape(title)}"']
+    if sys.platform == "win32" and shutil.which("powershell"):
+        return ["powershell", "-NoProfile", "-NonInteractive", "-Command", _WINDOWS_TOAST]
+    return None
+
+
+def notify_desktop(title: str, message: str) -> bool:
+    """Mostra uma notificação sem bloquear o loop de coleta; retorna se foi possível"""
+    try:
+        if plyer_notification is not None:
+            plyer_notification.notify(title=title, message=message, app_name=APP_NAME)
+            return True
+
+        command = _command(title, message)
+        if command is None:
+            global _unavailable_warned
+            if not _unavailable_warned:
+                logger.warning("Notificações de desktop indisponíveis: instale o plyer")
+                _unavailable_warned = True
+            logger.debug(f"Notificação não exibida: {title} - {message}")
+            return False
+
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["env"] = dict(os.environ, ROCKS_NOTIFY_TITLE=title, ROCKS_NOTIFY_MESSAGE=message)
+            # Sem abrir uma janela de console a cada alerta
+            kwargs["creationflags"] = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+        return True
+    except Exception as e:
+        logger.warning(f"Não foi possível exibir notificação: {e}")
+        return False
@@ -0,0 +1,263 @@
+"""
+Coletor de discos: uso por ponto de montagem e IO por dispositivo
+"""
+
+import os
+import re
+import sys
+import time
+import select
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import psutil
+
+from .network_rates import counter_delta
+
+logger = logging.getLogger(__name__)
+
+_MOUNTS_FILE = "/proc/self/mounts"
+
+# Sistemas de arquivos de rede: statvfs pode travar se o servidor sumir
+NETWORK_FSTYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "ncpfs", "afs", "9p", "ceph",
+    "glusterfs", "lustre", "gfs2", "ocfs2", "davfs", "fuse.sshfs", "fuse.rclone",
+    "fuse.s3fs", "fuse.gcsfuse", "fuse.glusterfs", "fuse.cephfs", "webdav",
+})
+
+
+class _MountWatcher:
+    """Detecta mudanças na tabela de montagens
+
+    No Linux o kernel sinaliza ``POLLPRI`` em ``/proc/self/mounts`` quando algo
+    é montado ou desmontado, então a verificação é um ``poll`` sem leitura.
+    Nos demais sistemas a lista é refeita a cada ``refresh_interval`` segundos.
+    """
+
+    def __init__(self, refresh_interval: float, clock: Callable[[], float]):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._last_refresh = clock()
+        self._fd = None
+        self._poll = None
+        if hasattr(select, "poll") and os.path.exists(_MOUNTS_FILE):
+            try:
+                self._fd = os.open(_MOUNTS_FILE, os.O_RDONLY)
+                self._poll = select.poll()
+                self._poll.register(self._fd, select.POLLPRI | select.POLLERR)
+            except OSError:
+                self.close()
+
+    def changed(self) -> bool:
+        if self._poll is not None:
+            return bool(self._poll.poll(0))
+        now = self._clock()
+        if now - self._last_refresh >= self.refresh_interval:
+            self._last_refresh = now
+            return True
+        return False
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._poll = None
+
+
+def _windows_disk_number(mountpoint: str) -> Optional[int]:
+    """Disco físico do volume (IOCTL_VOLUME_GET_VOLUME_DISK_EXTENTS); None se não der"""
+    import ctypes
+    from ctypes import wintypes
+
+    class DiskExtent(ctypes.Structure):
+        _fields_ = [("DiskNumber", wintypes.DWORD),
+                    ("StartingOffset", ctypes.c_longlong),
+                    ("ExtentLength", ctypes.c_longlong)]
+
+    class VolumeDiskExtents(ctypes.Structure):
+        _fields_ = [("NumberOfDiskExtents", wintypes.DWORD), ("Extents", DiskExtent * 1)]
+
+    try:
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        # \\.\C: (sem a barra final) abre o volume, não a raiz do sistema de arquivos
+        # Acesso 0 basta para o IOCTL; 3 = FILE_SHARE_READ | FILE_SHARE_WRITE e OPEN_EXISTING
+        handle = kernel32.CreateFileW("\\\\.\\" + mountpoint.rstrip("\\"), 0, 3, None, 3, 0, None)
+        if handle is None or handle == wintypes.HANDLE(-1).value:
+            return None
+        try:
+            extents = VolumeDiskExtents()
+            returned = wintypes.DWORD()
+            if not kernel32.DeviceIoControl(wintypes.HANDLE(handle), 0x00560000, None, 0,
+                                            ctypes.byref(extents), ctypes.sizeof(extents),
+                                            ctypes.byref(returned), None):
+                # Volume em vários discos (ERROR_MORE_DATA) ou sem disco físico
+                return None
+            return extents.Extents[0].DiskNumber
+        finally:
+            kernel32.CloseHandle(wintypes.HANDLE(handle))
+    except (OSError, AttributeError):
+        return None
+
+
+def _device_name(device: str, mountpoint: str) -> str:
+    """Nome do dispositivo como aparece em ``disk_io_counters(perdisk=True)``
+
+    Linux: /dev/mapper/x -> dm-0. Windows: C:\\ -> PhysicalDriveN. macOS: o
+    volume /dev/disk3s1 -> disk3 (o disco inteiro, que o psutil lista).
+    """
+    if sys.platform == "win32":
+        number = _windows_disk_number(mountpoint)
+        return f"PhysicalDrive{number}" if number is not None else device
+    if sys.platform == "darwin":
+        match = re.match(r"(?:/dev/)?(disk\d+)", device)
+        return match.group(1) if match else device
+    if device.startswith("/dev/"):
+        return os.path.basename(os.path.realpath(device))
+    return device
+
+
+def is_network_mount(device: str, fstype: str) -> bool:
+    """Indica se a montagem vem da rede (pelo tipo ou por um dispositivo host:/x ou //host/x)"""
+    if fstype in NETWORK_FSTYPES:
+        return True
+    return device.startswith("//") or (":/" in device and not device.startswith("/"))
+
+
+def _usage(mountpoint: str) -> Dict[str, Any]:
+    """Uso de espaço e de inodes de um ponto de montagem"""
+    if hasattr(os, "statvfs"):
+        st = os.statvfs(mountpoint)
+        total = st.f_blocks * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        inodes_used = st.f_files - st.f_ffree
+        inodes_percent = round(inodes_used / st.f_files * 100, 1) if st.f_files else 0.0
+    else:
+        usage = psutil.disk_usage(mountpoint)
+        total, used, free = usage.total, usage.used, usage.free
+        inodes_percent = None
+
+    return {
+        "total_gb": round(total / (1024**3), 1),
+        "usado_gb": round(used / (1024**3), 1),
+        "livre_gb": round(free / (1024**3), 1),
+        "percentual": round(used / total * 100, 1) if total else 0.0,
+        "inodes_percentual": inodes_percent,
+    }
+
+
+def device_rates(previous, current, elapsed: float) -> Dict[str, Any]:
+    """Vazão, IOPS e latência média de um dispositivo entre duas leituras"""
+    reads = counter_delta(previous.read_count, current.read_count)
+    writes = counter_delta(previous.write_count, current.write_count)
+    busy_ms = (counter_delta(previous.read_time, current.read_time)
+               + counter_delta(previous.write_time, current.write_time))
+    operations = reads + writes
+
+    return {
+        "leitura_bytes_s": round(counter_delta(previous.read_bytes, current.read_bytes) / elapsed, 2),
+        "escrita_bytes_s": round(counter_delta(previous.write_bytes, current.write_bytes) / elapsed, 2),
+        "iops_leitura": round(reads / elapsed, 2),
+        "iops_escrita": round(writes / elapsed, 2),
+        "latencia_media_ms": round(busy_ms / operations, 2) if operations else 0.0,
+    }
+
+
+class DiskCollector:
+    """Uso de todos os sistemas de arquivos reais e IO dos seus dispositivos
+
+    A lista de montagens é descoberta uma vez e só refeita quando a tabela de
+    montagens muda. Sistemas de arquivos cujo tipo está em ``exclude_fstypes``
+    (tmpfs, overlay, squashfs...) ficam de fora, assim como os de rede (nfs,
+    cifs, sshfs...) a menos que ``include_network`` seja True: o ``statvfs``
+    de um compartilhamento cujo servidor caiu pode travar o ciclo de coleta.
+    Montagens repetidas do mesmo dispositivo (bind mounts) aparecem só uma vez. As taxas de IO vêm da
+    diferença entre leituras consecutivas de ``disk_io_counters(perdisk=True)``;
+    se nenhum disco corresponder às montagens (ex.: APFS sintetizado no
+    macOS), todos os discos do ``perdisk`` são reportados.
+    """
+
+    def __init__(
+        self,
+        exclude_fstypes: Iterable[str] = (),
+        include_network: bool = False,
+        refresh_interval: float = 60,
+        read_io: Optional[Callable[[], Dict[str, Any]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.exclude_fstypes = set(exclude_fstypes)
+        self.include_network = include_network
+        self._read_io = read_io or (lambda: psutil.disk_io_counters(perdisk=True) or {})
+        self._clock = clock
+        self._watcher = _MountWatcher(refresh_interval, clock)
+        self._mounts: Optional[List[Dict[str, str]]] = None
+        self._last_io = None
+        self._unmatched_logged = False
+
+    def _discover_mounts(self) -> List[Dict[str, str]]:
+        mounts = []
+        seen_devices = set()
+        for partition in psutil.disk_partitions(all=True):
+            if partition.fstype in self.exclude_fstypes or not partition.fstype:
+                continue
+            if not self.include_network and is_network_mount(partition.device, partition.fstype):
+                continue
+            if partition.device in seen_devices:
+                continue
+            seen_devices.add(partition.device)
+            mounts.append({
+                "ponto_montagem": partition.mountpoint,
+                "dispositivo": partition.device,
+                "tipo": partition.fstype,
+                "nome_io": _device_name(partition.device, partition.mountpoint),
+            })
+        logger.info(f"Montagens monitoradas: {[m['ponto_montagem'] for m in mounts]}")
+        return mounts
+
+    def get_mounts(self) -> List[Dict[str, str]]:
+        """Montagens monitoradas (cache até a tabela de montagens mudar)"""
+        if self._mounts is None or self._watcher.changed():
+            self._mounts = self._discover_mounts()
+        return self._mounts
+
+    def get_mount_usage(self) -> List[Dict[str, Any]]:
+        usage = []
+        for mount in self.get_mounts():
+            try:
+                entry = {key: mount[key] for key in ("ponto_montagem", "dispositivo", "tipo")}
+                entry.update(_usage(mount["ponto_montagem"]))
+                usage.append(entry)
+            except OSError as e:
+                # Montagem sumiu ou ficou inacessível entre a descoberta e a leitura
+                logger.warning(f"Não foi possível ler {mount['ponto_montagem']}: {e}")
+        return usage
+
+    def get_device_io(self) -> Dict[str, Dict[str, Any]]:
+        """Taxas de IO dos dispositivos que sustentam as montagens monitoradas"""
+        devices = {mount["nome_io"] for mount in self.get_mounts()}
+        all_counters = self._read_io()
+        counters = {name: io for name, io in all_counters.items() if name in devices}
+        if not counters and all_counters:
+            if not self._unmatched_logged:
+                logger.info(f"Discos {sorted(all_counters)} sem correspondência com as montagens; reportando todos")
+                self._unmatched_logged = True
+            counters = dict(all_counters)
+        now = self._clock()
+
+        rates = {}
+        if self._last_io is not None:
+            last_time, last_counters = self._last_io
+            elapsed = now - last_time
+            if elapsed > 0:
+                for name, io in counters.items():
+                    if name in last_counters:
+                        rates[name] = device_rates(last_counters[name], io, elapsed)
+        self._last_io = (now, counters)
+        return rates
+
+    def close(self):
+        self._watcher.close()
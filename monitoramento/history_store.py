@@ -0,0 +1,244 @@
+"""
+Histórico local de métricas em SQLite com retenção e agregação automática
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import FILE_CONFIG, HISTORY_CONFIG
+from .snapshot import get_metric
+
+logger = logging.getLogger(__name__)
+
+# Resoluções disponíveis -> (tabela, largura do bucket em segundos)
+RESOLUTIONS = {
+    "raw": ("amostras", None),
+    "1m": ("agregado_1m", 60),
+    "1h": ("agregado_1h", 3600),
+}
+
+
+def _timestamp(system_data: Dict[str, Any]) -> float:
+    try:
+        return datetime.fromisoformat(system_data["timestamp"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+
+
+class HistoryStore:
+    """Séries temporais locais sob ``data/`` para diagnóstico sem o servidor
+
+    Cada payload gera uma amostra bruta por métrica configurada. Ao virar o
+    minuto, as amostras brutas fechadas são agregadas (min/max/soma/contagem)
+    em buckets de 1 minuto, e estes em buckets de 1 hora ao virar a hora.
+    Cada nível tem a sua retenção; consultas escolhem o nível mais fino que
+    ainda cobre o início do intervalo pedido.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        metrics: Optional[Iterable[str]] = None,
+        retention: Optional[Dict[str, float]] = None,
+        clock=time.time,
+    ):
+        self.path = path or FILE_CONFIG["history_file"]
+        self.metrics = list(metrics if metrics is not None else HISTORY_CONFIG.get("metrics", []))
+        self.retention = dict(HISTORY_CONFIG.get("retention", {}))
+        self.retention.update(retention or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_minute = None
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS amostras ("
+                " metrica TEXT NOT NULL, ts REAL NOT NULL, valor REAL NOT NULL,"
+                " PRIMARY KEY (metrica, ts)) WITHOUT ROWID"
+            )
+            for table in ("agregado_1m", "agregado_1h"):
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    " metrica TEXT NOT NULL, ts INTEGER NOT NULL,"
+                    " minimo REAL NOT NULL, maximo REAL NOT NULL,"
+                    " soma REAL NOT NULL, contagem INTEGER NOT NULL,"
+                    " PRIMARY KEY (metrica, ts)) WITHOUT ROWID"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS marcas (nome TEXT PRIMARY KEY, ts REAL NOT NULL)"
+            )
+
+    def record(self, system_data: Dict[str, Any]) -> int:
+        """Grava as métricas configuradas de um payload; retorna quantas foram gravadas"""
+        ts = _timestamp(system_data)
+        rows = []
+        for metric in self.metrics:
+            value = get_metric(system_data, metric)
+            if value is not None:
+                rows.append((metric, ts, value))
+
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO amostras (metrica, ts, valor) VALUES (?, ?, ?)", rows
+                )
+            self.maintain()
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar histórico: {e}")
+            return 0
+        return len(rows)
+
+    def _watermark(self, name: str) -> float:
+        row = self._conn.execute("SELECT ts FROM marcas WHERE nome = ?", (name,)).fetchone()
+        return row[0] if row else 0.0
+
+    def _set_watermark(self, name: str, ts: float):
+        self._conn.execute("INSERT OR REPLACE INTO marcas (nome, ts) VALUES (?, ?)", (name, ts))
+
+    def maintain(self, force: bool = False):
+        """Agrega buckets fechados e aplica a retenção (só age ao virar o minuto)"""
+        now = self._clock()
+        minute_end = int(now // 60) * 60
+        if not force and minute_end == self._last_minute:
+            return
+        self._last_minute = minute_end
+        hour_end = int(now // 3600) * 3600
+
+        with self._lock, self._conn:
+            start = self._watermark("agregado_1m")
+            if minute_end > start:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO agregado_1m"
+                    " SELECT metrica, CAST(ts / 60 AS INTEGER) * 60,"
+                    " MIN(valor), MAX(valor), SUM(valor), COUNT(*)"
+                    " FROM amostras WHERE ts >= ? AND ts < ? GROUP BY 1, 2",
+                    (start, minute_end),
+                )
+                self._set_watermark("agregado_1m", minute_end)
+
+            start = self._watermark("agregado_1h")
+            if hour_end > start:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO agregado_1h"
+                    " SELECT metrica, (ts / 3600) * 3600,"
+                    " MIN(minimo), MAX(maximo), SUM(soma), SUM(contagem)"
+                    " FROM agregado_1m WHERE ts >= ? AND ts < ? GROUP BY 1, 2",
+                    (start, hour_end),
+                )
+                self._set_watermark("agregado_1h", hour_end)
+
+            for resolution, (table, _) in RESOLUTIONS.items():
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE ts < ?",
+                    (now - self.retention[resolution],),
+                )
+
+    def _pick_resolution(self, start: float) -> str:
+        now = self._clock()
+        for resolution in ("raw", "1m"):
+            if start >= now - self.retention[resolution]:
+                return resolution
+        return "1h"
+
+    def query(
+        self,
+        metric: str,
+        start: float,
+        end: Optional[float] = None,
+        resolution: str = "auto",
+    ) -> List[Dict[str, Any]]:
+        """Pontos de ``metric`` entre ``start`` e ``end`` (epoch), em ordem de tempo
+
+        ``resolution`` aceita ``raw``, ``1m``, ``1h`` ou ``auto``. Cada ponto
+        traz timestamp (início do bucket), min, max, média e quantidade de amostras.
+        """
+        if end is None:
+            end = self._clock()
+        if resolution == "auto":
+            resolution = self._pick_resolution(start)
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Resolução inválida: {resolution}")
+
+        table, _ = RESOLUTIONS[resolution]
+        with self._lock:
+            if resolution == "raw":
+                rows = self._conn.execute(
+                    "SELECT ts, valor, valor, valor, 1 FROM amostras"
+                    " WHERE metrica = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                    (metric, start, end),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT ts, minimo, maximo, soma / contagem, contagem FROM {table}"
+                    " WHERE metrica = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                    (metric, start, end),
+                ).fetchall()
+
+        return [
+            {"timestamp": ts, "min": minimum, "max": maximum, "media": mean, "amostras": count}
+            for ts, minimum, maximum, mean, count in rows
+        ]
+
+    def list_metrics(self) -> List[str]:
+        """Métricas com algum dado gravado"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT metrica FROM amostras"
+                " UNION SELECT DISTINCT metrica FROM agregado_1h ORDER BY 1"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_stats(self) -> Dict[str, Tuple[int, Optional[float]]]:
+        """Quantidade de linhas e timestamp mais antigo por resolução"""
+        stats = {}
+        with self._lock:
+            for resolution, (table, _) in RESOLUTIONS.items():
+                stats[resolution] = self._conn.execute(
+                    f"SELECT COUNT(*), MIN(ts) FROM {table}"
+                ).fetchone()
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_history_store() -> Optional[HistoryStore]:
+    """Abre o histórico configurado; None se desativado ou indisponível"""
+    if not HISTORY_CONFIG.get("enabled", True):
+        return None
+    try:
+        return HistoryStore()
+    except Exception as e:
+        logger.error(f"Histórico local indisponível: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Consulta o histórico local de métricas")
+    parser.add_argument("metrica", nargs="?", help="ex.: cpu.percentual_total (omita para listar)")
+    parser.add_argument("--horas", type=float, default=1, help="janela a partir de agora")
+    parser.add_argument("--resolucao", default="auto", choices=["auto", *RESOLUTIONS])
+    args = parser.parse_args()
+
+    store = HistoryStore()
+    if args.metrica is None:
+        print("\n".join(store.list_metrics()))
+    else:
+        points = store.query(args.metrica, time.time() - args.horas * 3600, resolution=args.resolucao)
+        print(json.dumps(points, indent=2, ensure_ascii=False))
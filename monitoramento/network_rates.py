@@ -0,0 +1,61 @@
+"""
+Taxas de tráfego de rede por interface a partir de contadores cumulativos
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+def counter_delta(previous: int, current: int) -> int:
+    """Diferença entre leituras de um contador cumulativo
+
+    Qualquer queda é tratada como reinício (interface recriada, VPN/tun
+    reconectada): o valor atual é o delta. O estouro de contadores de 32 bits
+    é compensado antes, na leitura: pelo ``ProcfsBackend`` (ver
+    ``is_counter_wrap``) ou pelo psutil (``nowrap=True``); adivinhar uma volta
+    aqui transformaria um reinício em um pico falso de tráfego.
+    """
+    if current >= previous:
+        return current - previous
+    return current
+
+
+def is_interface_excluded(name: str, exclude_loopback: bool, exclude_prefixes: Iterable[str]) -> bool:
+    """Indica se a interface deve ficar fora das taxas (loopback ou virtual)"""
+    if exclude_loopback and (name == "lo" or name.lower().startswith("loopback")):
+        return True
+    return any(name.startswith(prefix) for prefix in exclude_prefixes)
+
+
+def interface_rates(previous, current, elapsed: float) -> Dict[str, Any]:
+    """Taxas (por segundo) e deltas de erros/descartes entre dois snapshots de uma interface"""
+    def rate(field: str) -> float:
+        return round(counter_delta(getattr(previous, field), getattr(current, field)) / elapsed, 2)
+
+    return {
+        "bytes_enviados_s": rate("bytes_sent"),
+        "bytes_recebidos_s": rate("bytes_recv"),
+        "pacotes_enviados_s": rate("packets_sent"),
+        "pacotes_recebidos_s": rate("packets_recv"),
+        "erros_entrada": counter_delta(previous.errin, current.errin),
+        "erros_saida": counter_delta(previous.errout, current.errout),
+        "descartes_entrada": counter_delta(previous.dropin, current.dropin),
+        "descartes_saida": counter_delta(previous.dropout, current.dropout),
+    }
+
+
+def compute_rates(
+    previous: Optional[Dict[str, Any]],
+    current: Dict[str, Any],
+    elapsed: float,
+    exclude_loopback: bool = True,
+    exclude_prefixes: Iterable[str] = (),
+) -> Dict[str, Dict[str, Any]]:
+    """Taxas de todas as interfaces presentes nos dois snapshots (``pernic=True``)"""
+    if not previous or elapsed <= 0:
+        return {}
+
+    rates = {}
+    for name, counters in current.items():
+        if name not in previous or is_interface_excluded(name, exclude_loopback, exclude_prefixes):
+            continue
+        rates[name] = interface_rates(previous[name], counters, elapsed)
+    return rates
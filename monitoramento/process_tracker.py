@@ -0,0 +1,171 @@
+"""
+Rastreador persistente da tabela de processos
+"""
+
+import time
+import heapq
+import logging
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Chaves de ranking suportadas -> campo da amostra usado na ordenação
+RANKING_KEYS = {
+    "cpu": "cpu_percent",
+    "memoria": "rss",
+    "io": "io_bytes_s",
+    "threads": "num_threads",
+    "fds": "num_fds",
+}
+
+# Campos que exigem leituras extras por processo (só coletados se pedidos)
+_OPTIONAL_FIELDS = {"io", "threads", "fds"}
+
+
+def select_top(samples: Iterable[Dict[str, Any]], limit: int, key: str = "cpu") -> List[Dict[str, Any]]:
+    """Seleciona os ``limit`` maiores por ``key`` com um heap limitado
+
+    Usa ``heapq.nlargest`` (O(n log limit)), sem ordenar o conjunto inteiro.
+    Amostras com valor zero ou sem o campo são ignoradas.
+    """
+    field = RANKING_KEYS[key]
+    candidates = (sample for sample in samples if sample.get(field, 0) > 0)
+    return heapq.nlargest(limit, candidates, key=itemgetter(field))
+
+
+class ProcessTracker:
+    """Mantém objetos ``psutil.Process`` entre ciclos
+
+    O ``cpu_percent`` de um processo é calculado em relação à leitura anterior
+    do mesmo objeto, então recriar os objetos a cada ciclo (como faz
+    ``process_iter`` sem cache) sempre devolve 0. Aqui os objetos são
+    reaproveitados: PIDs novos são adicionados e PIDs encerrados removidos.
+    """
+
+    def __init__(self, warmup_interval: float = 0.25):
+        self.warmup_interval = warmup_interval
+        self._processes: Dict[int, psutil.Process] = {}
+        self._names: Dict[int, Optional[str]] = {}
+        self._denied: Set[int] = set()
+        # pid -> (bytes lidos + escritos, instante da leitura)
+        self._last_io: Dict[int, Tuple[int, float]] = {}
+        self._initialized = False
+
+        # Custo da última varredura
+        self.last_scan_time_ms = 0.0
+        self.last_process_count = 0
+
+    def _track(self, pid: int):
+        """Passa a acompanhar um PID, fazendo a primeira leitura de CPU"""
+        try:
+            proc = psutil.Process(pid)
+            self._names[pid] = proc.name()
+            proc.cpu_percent(None)
+            self._processes[pid] = proc
+        except psutil.AccessDenied:
+            self._denied.add(pid)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            pass
+
+    def _forget(self, pid: int):
+        self._processes.pop(pid, None)
+        self._names.pop(pid, None)
+        self._last_io.pop(pid, None)
+        self._denied.discard(pid)
+
+    def _read_optional(self, proc: psutil.Process, sample: Dict[str, Any],
+                       fields: Set[str], now: float):
+        """Lê os campos opcionais; falta de permissão em um campo não descarta o processo"""
+        if "threads" in fields:
+            try:
+                sample["num_threads"] = proc.num_threads()
+            except psutil.AccessDenied:
+                pass
+
+        if "fds" in fields:
+            try:
+                if hasattr(proc, "num_fds"):
+                    sample["num_fds"] = proc.num_fds()
+                else:
+                    sample["num_fds"] = proc.num_handles()
+            except psutil.AccessDenied:
+                pass
+
+        if "io" in fields:
+            try:
+                io = proc.io_counters()
+                total = io.read_bytes + io.write_bytes
+                previous = self._last_io.get(sample["pid"])
+                self._last_io[sample["pid"]] = (total, now)
+                if previous is not None and now > previous[1]:
+                    sample["io_bytes_s"] = max(0, total - previous[0]) / (now - previous[1])
+            except (psutil.AccessDenied, AttributeError):
+                pass
+
+    def refresh(self, fields: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Atualiza a tabela e retorna as amostras dos processos já conhecidos
+
+        ``fields`` indica as chaves opcionais (io, threads, fds) a coletar além
+        de CPU e memória, para que uma única varredura atenda todos os rankings.
+        """
+        fields = set(fields) & _OPTIONAL_FIELDS
+        if not self._initialized:
+            # Aquecimento: a primeira leitura de cada processo não tem delta
+            for pid in psutil.pids():
+                self._track(pid)
+            self._initialized = True
+            time.sleep(self.warmup_interval)
+
+        started = time.perf_counter()
+        now = time.monotonic()
+        current_pids = set(psutil.pids())
+
+        known_pids = self._processes.keys() | self._denied
+        for pid in known_pids - current_pids:
+            self._forget(pid)
+
+        samples = []
+        for pid in current_pids:
+            if pid in self._denied:
+                continue
+
+            proc = self._processes.get(pid)
+            if proc is None:
+                self._track(pid)
+                continue
+
+            try:
+                with proc.oneshot():
+                    sample = {
+                        "pid": pid,
+                        "nome": self._names.get(pid),
+                        "cpu_percent": proc.cpu_percent(None),
+                        "rss": proc.memory_info().rss,
+                    }
+                    if fields:
+                        self._read_optional(proc, sample, fields, now)
+            except psutil.NoSuchProcess:
+                self._forget(pid)
+                continue
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+            samples.append(sample)
+
+        self.last_scan_time_ms = (time.perf_counter() - started) * 1000
+        self.last_process_count = len(current_pids)
+        logger.debug(
+            f"Varredura de processos: {self.last_process_count} processos "
+            f"em {self.last_scan_time_ms:.1f} ms"
+        )
+        return samples
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna o custo da última varredura"""
+        return {
+            "total_processos": self.last_process_count,
+            "tempo_varredura_ms": round(self.last_scan_time_ms, 1),
+        }
@@ -0,0 +1,220 @@
+"""
+Backend de coleta rápido para Linux lendo diretamente o /proc
+"""
+
+import os
+import sys
+import logging
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Estruturas equivalentes às do psutil (mesmos nomes de campos usados no monitor)
+VirtualMemory = namedtuple("VirtualMemory", ["total", "available", "percent", "used", "free"])
+NetIO = namedtuple("NetIO", [
+    "bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+    "errin", "errout", "dropin", "dropout",
+])
+DiskIO = namedtuple("DiskIO", [
+    "read_count", "write_count", "read_bytes", "write_bytes", "read_time", "write_time",
+])
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free", "percent"])
+
+# Campos do /proc/meminfo usados no cálculo de memória
+_MEMINFO_KEYS = {"MemTotal", "MemFree", "MemAvailable", "Buffers", "Cached"}
+
+# /proc/diskstats sempre conta setores de 512 bytes
+_SECTOR_SIZE = 512
+
+# Kernels e drivers de 32 bits expõem contadores que voltam a zero em 2^32
+_WRAP = 2**32
+# Uma queda só é estouro se o delta implícito for plausível em um ciclo
+# (até 1/4 do intervalo); acima disso é reinício do contador
+_MAX_WRAP_DELTA = _WRAP // 4
+
+
+def is_counter_wrap(previous: int, current: int) -> bool:
+    """Indica se a queda de ``previous`` para ``current`` é um estouro de 32 bits"""
+    return current < previous < _WRAP and _WRAP - previous + current <= _MAX_WRAP_DELTA
+
+
+class _ProcFile:
+    """Arquivo do /proc mantido aberto e relido com pread em um buffer reutilizável"""
+
+    def __init__(self, path: str, size: int = 8192):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buffer = bytearray(size)
+
+    def read(self) -> str:
+        while True:
+            if hasattr(os, "preadv"):
+                length = os.preadv(self.fd, [self.buffer], 0)
+            else:
+                data = os.pread(self.fd, len(self.buffer), 0)
+                length = len(data)
+                self.buffer[:length] = data
+            if length < len(self.buffer):
+                return self.buffer[:length].decode("ascii", "replace")
+            # Conteúdo maior que o buffer: dobra e relê
+            self.buffer = bytearray(len(self.buffer) * 2)
+
+    def close(self):
+        if self.fd is None:
+            return
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+        # O número pode ser reaproveitado por outro open; nunca fechar duas vezes
+        self.fd = None
+
+
+class ProcfsBackend:
+    """Lê /proc/stat, /proc/meminfo, /proc/net/dev e /proc/diskstats sem psutil
+
+    Os descritores ficam abertos durante toda a vida do backend e cada leitura
+    é um único ``pread`` no offset 0, evitando open/close e a alocação de
+    objetos do psutil a cada ciclo. Os métodos devolvem as mesmas estruturas
+    (campos) que o psutil, então a formatação no ``SystemMonitor`` não muda.
+
+    Como o ``nowrap`` do psutil, os contadores de rede e disco são
+    compensados quando estouram 2^32 (``is_counter_wrap``): o valor devolvido
+    continua crescendo. Outras quedas (interface recriada) passam adiante e
+    são tratadas como reinício por ``counter_delta``.
+    """
+
+    def __init__(self):
+        self._stat = _ProcFile("/proc/stat")
+        self._meminfo = _ProcFile("/proc/meminfo")
+        self._net_dev = _ProcFile("/proc/net/dev")
+        self._diskstats = _ProcFile("/proc/diskstats", size=16384)
+        # (arquivo, nome, campo) -> (última leitura bruta, deslocamento acumulado)
+        self._wraps: Dict[Tuple[str, str, int], Tuple[int, int]] = {}
+
+    def close(self):
+        """Libera os descritores do /proc (pode ser chamado mais de uma vez)"""
+        for proc_file in (self._stat, self._meminfo, self._net_dev, self._diskstats):
+            proc_file.close()
+
+    def _nowrap(self, source: str, name: str, values: List[int]) -> List[int]:
+        """Soma 2^32 a cada estouro de um contador desde a primeira leitura"""
+        result = []
+        for index, value in enumerate(values):
+            key = (source, name, index)
+            last, offset = self._wraps.get(key, (value, 0))
+            if value < last:
+                # Estouro: continua a partir do total; reinício: deixa a queda aparecer
+                offset = offset + _WRAP if is_counter_wrap(last, value) else 0
+            self._wraps[key] = (value, offset)
+            result.append(value + offset)
+        return result
+
+    def cpu_times_percpu(self) -> List[Tuple[float, float]]:
+        """Retorna (tempo ocupado, tempo total) por núcleo, em ticks do kernel"""
+        cores = []
+        for line in self._stat.read().splitlines():
+            if not line.startswith("cpu"):
+                break
+            if line.startswith("cpu "):
+                continue
+            fields = [int(value) for value in line.split()[1:]]
+            # user nice system idle iowait irq softirq steal guest guest_nice
+            total = sum(fields[:8])
+            idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+            cores.append((float(total - idle), float(total)))
+        return cores
+
+    def virtual_memory(self) -> VirtualMemory:
+        """Memória no mesmo critério do ``psutil.virtual_memory`` no Linux"""
+        info = {}
+        for line in self._meminfo.read().splitlines():
+            key, _, rest = line.partition(":")
+            if key in _MEMINFO_KEYS:
+                info[key] = int(rest.split(None, 1)[0]) * 1024
+                if len(info) == len(_MEMINFO_KEYS):
+                    break
+
+        total = info["MemTotal"]
+        free = info["MemFree"]
+        # Kernels muito antigos não têm MemAvailable
+        available = info.get("MemAvailable", free + info.get("Buffers", 0) + info.get("Cached", 0))
+        used = total - available
+        percent = used / total * 100 if total else 0.0
+        return VirtualMemory(total, available, round(percent, 1), used, free)
+
+    def net_io_counters(self, pernic: bool = False):
+        """Contadores de rede; soma todas as interfaces se ``pernic`` for False"""
+        counters: Dict[str, NetIO] = {}
+        for line in self._net_dev.read().splitlines()[2:]:
+            name, _, data = line.partition(":")
+            name = name.strip()
+            fields = self._nowrap("net_dev", name, [int(value) for value in data.split()[:12]])
+            counters[name] = NetIO(
+                bytes_sent=fields[8],
+                bytes_recv=fields[0],
+                packets_sent=fields[9],
+                packets_recv=fields[1],
+                errin=fields[2],
+                errout=fields[10],
+                dropin=fields[3],
+                dropout=fields[11],
+            )
+        if pernic:
+            return counters
+        return NetIO(*[sum(values) for values in zip(*counters.values())]) if counters else NetIO(0, 0, 0, 0, 0, 0, 0, 0)
+
+    def disk_io_counters(self) -> Dict[str, DiskIO]:
+        """Contadores de IO por dispositivo de bloco"""
+        counters = {}
+        for line in self._diskstats.read().splitlines():
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            values = self._nowrap("diskstats", fields[2], [int(value) for value in fields[3:11]])
+            counters[fields[2]] = DiskIO(
+                read_count=values[0],
+                write_count=values[4],
+                read_bytes=values[2] * _SECTOR_SIZE,
+                write_bytes=values[6] * _SECTOR_SIZE,
+                read_time=values[3],
+                write_time=values[7],
+            )
+        return counters
+
+    @staticmethod
+    def disk_usage(path: str) -> DiskUsage:
+        """Uso do sistema de arquivos via statvfs (mesmo cálculo do psutil)"""
+        st = os.statvfs(path)
+        total = st.f_blocks * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        percent = used / (used + free) * 100 if used + free else 0.0
+        return DiskUsage(total, used, free, round(percent, 1))
+
+
+def create_backend(name: str = "auto") -> Optional[ProcfsBackend]:
+    """Cria o backend /proc quando disponível; None significa usar o psutil
+
+    ``name`` aceita ``auto`` (procfs no Linux, psutil nos demais), ``procfs``
+    ou ``psutil``.
+    """
+    if name == "psutil" or not sys.platform.startswith("linux"):
+        return None
+
+    backend = None
+    try:
+        backend = ProcfsBackend()
+        # Valida o formato dos arquivos antes de adotar o backend
+        backend.cpu_times_percpu()
+        backend.virtual_memory()
+        backend.net_io_counters()
+        backend.disk_io_counters()
+        logger.info("Usando backend de coleta /proc")
+        return backend
+    except Exception as e:
+        logger.warning(f"Backend /proc indisponível, usando psutil: {e}")
+        if backend is not None:
+            backend.close()
+        return None
@@ -0,0 +1,156 @@
+"""
+Buffer circular colunar com as amostras recentes de cada coletor
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele as colunas são array('d')
+    np = None
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Percentil com interpolação linear (mesmo critério padrão do NumPy)"""
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _as_float(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+class RingBuffer:
+    """Últimas ``capacity`` amostras de alguns campos, uma coluna por campo
+
+    Cada campo tem uma coluna pré-alocada (``numpy.ndarray`` quando o NumPy
+    está instalado, senão ``array('d')``) e há uma coluna de timestamps.
+    ``append`` escreve uma posição por coluna em O(1), sem alocar. As janelas
+    são devolvidas como fatias das próprias colunas (no máximo dois trechos,
+    por causa da volta do buffer), sem cópia; valem até a próxima escrita.
+    Há um único escritor (o loop de coleta); leitores devem copiar se
+    precisarem manter os dados.
+    """
+
+    def __init__(self, fields: Iterable[str], capacity: int):
+        self.fields = list(fields)
+        self.capacity = max(1, capacity)
+        self._next = 0
+        self._count = 0
+        self._timestamps = self._new_column()
+        self._columns = {field: self._new_column() for field in self.fields}
+
+    def _new_column(self):
+        if np is not None:
+            return np.full(self.capacity, np.nan)
+        return array("d", [math.nan]) * self.capacity
+
+    def append(self, timestamp: float, values: Any):
+        """Registra uma amostra (dict ou registro); campos ausentes ou não numéricos viram NaN"""
+        get = values.get if isinstance(values, dict) else (lambda name: getattr(values, name, None))
+        index = self._next
+        self._timestamps[index] = timestamp
+        for field, column in self._columns.items():
+            column[index] = _as_float(get(field))
+
+        self._next = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _count_since(self, seconds: float) -> int:
+        """Quantas amostras (das mais recentes) estão a até ``seconds`` da última"""
+        if not self._count:
+            return 0
+        cutoff = self._timestamps[(self._next - 1) % self.capacity] - seconds
+        if np is not None:
+            return int(np.count_nonzero(self._timestamps[:self._count] > cutoff))
+        count = 0
+        for segment in self._segments(self._count):
+            count += sum(1 for ts in segment if ts > cutoff)
+        return count
+
+    def _segments(self, count: int, column=None) -> List[Sequence[float]]:
+        """Fatias (sem cópia) das ``count`` amostras mais recentes, em ordem de tempo"""
+        column = self._timestamps if column is None else column
+        count = min(count, self._count)
+        if not count:
+            return []
+        view = column if np is not None else memoryview(column)
+        start = self._next - count
+        if start >= 0:
+            return [view[start:self._next]]
+        return [view[self.capacity + start:self.capacity], view[:self._next]]
+
+    def _resolve_count(self, seconds: Optional[float], count: Optional[int]) -> int:
+        if count is not None:
+            return min(count, self._count)
+        if seconds is not None:
+            return self._count_since(seconds)
+        return self._count
+
+    def window(self, field: str, seconds: Optional[float] = None,
+               count: Optional[int] = None) -> List[Sequence[float]]:
+        """Trechos da coluna ``field`` nos últimos ``seconds`` (ou ``count`` amostras)"""
+        return self._segments(self._resolve_count(seconds, count), self._columns[field])
+
+    def timestamps(self, seconds: Optional[float] = None,
+                   count: Optional[int] = None) -> List[Sequence[float]]:
+        """Trechos da coluna de timestamps, alinhados com ``window``"""
+        return self._segments(self._resolve_count(seconds, count))
+
+    def last(self, field: str) -> Optional[float]:
+        """Valor mais recente de ``field`` (None se vazio ou NaN)"""
+        if not self._count:
+            return None
+        value = float(self._columns[field][(self._next - 1) % self.capacity])
+        return None if math.isnan(value) else value
+
+    def stats(self, seconds: Optional[float] = None,
+              count: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """min/max/média/p95/último de cada campo na janela pedida"""
+        count = self._resolve_count(seconds, count)
+        if not count:
+            return {}
+
+        summary = {}
+        for field, column in self._columns.items():
+            segments = self._segments(count, column)
+            if np is not None:
+                values = np.concatenate(segments) if len(segments) > 1 else segments[0]
+                values = values[~np.isnan(values)]
+                if not values.size:
+                    continue
+                samples = int(values.size)
+                entry = {
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                    "media": float(values.mean()),
+                    "p95": float(np.percentile(values, 95)),
+                }
+            else:
+                values = sorted(v for segment in segments for v in segment if not math.isnan(v))
+                if not values:
+                    continue
+                samples = len(values)
+                entry = {
+                    "min": values[0],
+                    "max": values[-1],
+                    "media": sum(values) / len(values),
+                    "p95": _percentile(values, 95),
+                }
+
+            entry = {name: round(value, 2) for name, value in entry.items()}
+            last = self.last(field)
+            entry["ultimo"] = None if last is None else round(last, 2)
+            entry["amostras"] = samples
+            summary[field] = entry
+        return summary
@@ -0,0 +1,155 @@
+"""
+Motor de regras de limite avaliado localmente a cada ciclo de coleta
+"""
+
+import re
+import time
+import logging
+import operator
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from config import MONITORING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+# ex.: "ram.percentual > 90 for 60s"
+_RULE_PATTERN = re.compile(
+    r"^\s*(?P<metric>[\w.]+)\s*(?P<op>>=|<=|>|<)\s*(?P<threshold>-?\d+(?:\.\d+)?)"
+    r"(?:\s+for\s+(?P<duration>\d+(?:\.\d+)?)\s*(?P<unit>[smh])?)?\s*$"
+)
+
+
+def _compile_getter(metric: str) -> Callable[[Any], Optional[float]]:
+    """Leitor do caminho pontuado com as chaves já separadas (dicts ou registros)"""
+    keys = tuple(metric.split("."))
+
+    def get(data: Any) -> Optional[float]:
+        value = data
+        for key in keys:
+            if isinstance(value, dict):
+                value = value.get(key)
+            else:
+                value = getattr(value, key, None)
+            if value is None:
+                return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return value
+
+    return get
+
+
+def compile_rule(rule: Union[str, Dict[str, Any]]) -> Callable[[Any, float], Optional[Dict[str, Any]]]:
+    """Compila uma regra em uma função ``(dados, agora) -> evento ou None``
+
+    A regra pode ser o texto (``"cpu.percentual_total > 95 for 30s"``) ou um
+    dict com ``regra`` e opcionalmente ``histerese`` (margem para voltar ao
+    normal) e ``nome``. Toda a análise do texto acontece aqui, uma única vez;
+    o estado (pendente desde, ativo) fica no fechamento da função retornada.
+    Só transições geram eventos: ``disparado`` quando a condição se mantém
+    pela duração pedida e ``resolvido`` quando o valor volta além da histerese.
+    """
+    if isinstance(rule, str):
+        rule = {"regra": rule}
+
+    text = rule["regra"]
+    match = _RULE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Regra inválida: {text!r}")
+
+    metric = match["metric"]
+    op = match["op"]
+    threshold = float(match["threshold"])
+    duration = float(match["duration"] or 0) * _DURATION_UNITS[match["unit"] or "s"]
+    hysteresis = float(rule.get("histerese", 0))
+    name = rule.get("nome", text.strip())
+
+    get = _compile_getter(metric)
+    triggered = _OPERATORS[op]
+    if op in (">", ">="):
+        clear_below = threshold - hysteresis
+        cleared = lambda value: value < clear_below
+    else:
+        clear_above = threshold + hysteresis
+        cleared = lambda value: value > clear_above
+
+    pending_since: Optional[float] = None
+    active = False
+
+    def evaluate(data: Any, now: float) -> Optional[Dict[str, Any]]:
+        nonlocal pending_since, active
+        value = get(data)
+        if value is None:
+            return None
+
+        if active:
+            if not cleared(value):
+                return None
+            active = False
+            pending_since = None
+            state = "resolvido"
+        else:
+            if not triggered(value, threshold):
+                pending_since = None
+                return None
+            if pending_since is None:
+                pending_since = now
+            if now - pending_since < duration:
+                return None
+            active = True
+            state = "disparado"
+
+        return {
+            "regra": name,
+            "metrica": metric,
+            "valor": round(value, 2),
+            "limite": threshold,
+            "estado": state,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    return evaluate
+
+
+class RuleEngine:
+    """Avalia as regras compiladas contra cada amostra (custo O(regras) por ciclo)"""
+
+    def __init__(self, rules: Iterable[Union[str, Dict[str, Any]]],
+                 clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._rules = []
+        for rule in rules:
+            try:
+                self._rules.append(compile_rule(rule))
+            except (KeyError, ValueError) as e:
+                logger.error(f"Regra de alerta ignorada: {e}")
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def evaluate(self, data: Any) -> List[Dict[str, Any]]:
+        """Retorna os eventos (disparo/resolução) gerados por esta amostra"""
+        now = self._clock()
+        events = []
+        for rule in self._rules:
+            event = rule(data, now)
+            if event is not None:
+                events.append(event)
+        return events
+
+
+def create_rule_engine(config: Dict[str, Any]) -> Optional[RuleEngine]:
+    """Cria o motor com ``alert_rules`` da máquina ou de ``MONITORING_CONFIG``"""
+    rules = config.get("alert_rules") or MONITORING_CONFIG.get("alert_rules", [])
+    engine = RuleEngine(rules)
+    return engine if len(engine) else None
@@ -0,0 +1,261 @@
+"""
+Agendador de coletores com intervalos independentes por métrica
+"""
+
+import time
+import logging
+from functools import reduce
+from math import ceil, gcd
+from typing import Any, Callable, Dict, List, Optional
+
+from config import MONITORING_CONFIG
+from .ring_buffer import RingBuffer
+from .snapshot import to_wire
+
+logger = logging.getLogger(__name__)
+
+# Resolução mínima dos intervalos (ms), evita ciclos base muito curtos
+_RESOLUTION_MS = 50
+
+
+def _to_ms(seconds: float) -> int:
+    """Converte segundos para ms arredondando para a resolução do agendador"""
+    steps = max(1, round(seconds * 1000 / _RESOLUTION_MS))
+    return steps * _RESOLUTION_MS
+
+
+class CollectorScheduler:
+    """Executa cada coletor no seu próprio período, alinhado a um ciclo base
+
+    O ciclo base é o MDC de todos os períodos (coletores e envio), então
+    coletores que vencem no mesmo instante rodam na mesma passada do loop.
+    O último valor de cada coletor fica guardado e é reaproveitado em todo
+    envio, mesmo quando o coletor não rodou naquele ciclo.
+
+    Os campos numéricos registrados em ``fields`` vão para um ``RingBuffer``
+    por coletor com os últimos ``buffer_seconds`` segundos; é dele que saem
+    a janela agregada do envio (chave ``janela``) e as leituras locais
+    (interface, alertas).
+    """
+
+    def __init__(self, upload_interval: float, buffer_seconds: float = 300,
+                 clock: Callable[[], float] = time.time):
+        self._upload_ms = _to_ms(upload_interval)
+        self.buffer_seconds = buffer_seconds
+        self._clock = clock
+        self._collectors: Dict[str, Dict[str, Any]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._buffers: Dict[str, RingBuffer] = {}
+        # coletor -> amostras por período de envio (só os que enviam a janela)
+        self._summarized: Dict[str, int] = {}
+        self._tick_ms = self._upload_ms
+        self._tick_index = 0
+
+    def add(self, name: str, collect: Callable[[], Dict[str, Any]], interval: float,
+            fields: Optional[List[str]] = None, summarize: bool = False):
+        """Registra um coletor que retorna um fragmento do payload
+
+        Os ``fields`` de ``fragmento[name]`` são guardados no buffer do
+        coletor; com ``summarize`` o envio leva as estatísticas das amostras
+        do último período de envio.
+        """
+        interval_ms = _to_ms(interval)
+        self._collectors[name] = {"collect": collect, "interval_ms": interval_ms}
+        if fields:
+            per_upload = max(1, self._upload_ms // interval_ms)
+            capacity = max(per_upload, ceil(self.buffer_seconds * 1000 / interval_ms))
+            self._buffers[name] = RingBuffer(fields, capacity)
+            if summarize:
+                self._summarized[name] = per_upload
+        self._tick_ms = reduce(
+            gcd,
+            [c["interval_ms"] for c in self._collectors.values()],
+            self._upload_ms,
+        )
+
+    @property
+    def tick_interval(self) -> float:
+        """Período do ciclo base em segundos"""
+        return self._tick_ms / 1000
+
+    @property
+    def upload_interval(self) -> float:
+        """Período de envio em segundos"""
+        return self._upload_ms / 1000
+
+    @property
+    def buffers(self) -> Dict[str, RingBuffer]:
+        """Buffers de amostras recentes por coletor"""
+        return dict(self._buffers)
+
+    @property
+    def intervals(self) -> Dict[str, float]:
+        """Período efetivo de cada coletor em segundos"""
+        return {name: c["interval_ms"] / 1000 for name, c in self._collectors.items()}
+
+    def _is_due(self, interval_ms: int, ticks: int) -> bool:
+        """Verifica se o período vence em algum dos ``ticks`` ciclos a partir do atual"""
+        return any(
+            (index * self._tick_ms) % interval_ms == 0
+            for index in range(self._tick_index, self._tick_index + ticks)
+        )
+
+    def run_pending(self, ticks: int = 1) -> bool:
+        """Executa os coletores vencidos e avança ``ticks`` ciclos
+
+        ``ticks`` maior que 1 cobre ciclos perdidos: cada coletor que venceria
+        em qualquer um deles roda uma única vez agora. Retorna True quando o
+        envio também vence nesse intervalo.
+        """
+        for name, collector in self._collectors.items():
+            if not self._is_due(collector["interval_ms"], ticks):
+                continue
+            try:
+                self._latest[name] = collector["collect"]()
+                if name in self._buffers:
+                    self._buffers[name].append(self._clock(), self._latest[name].get(name, {}))
+            except Exception as e:
+                # Mantém o último valor válido do coletor
+                logger.error(f"Erro no coletor {name}: {e}")
+
+        upload_due = self._is_due(self._upload_ms, ticks)
+        self._tick_index += ticks
+        return upload_due
+
+    def latest_records(self) -> Dict[str, Any]:
+        """Último valor de cada coletor ainda como registro (sem serializar)"""
+        data: Dict[str, Any] = {}
+        for fragment in self._latest.values():
+            data.update(fragment)
+        return data
+
+    def latest(self) -> Dict[str, Any]:
+        """Retorna o último valor de todos os coletores mesclado em um payload
+
+        Os coletores guardam registros compactos; a serialização para o
+        formato do payload acontece só aqui, no momento do envio.
+        """
+        data: Dict[str, Any] = {}
+        for fragment in self._latest.values():
+            for key, value in fragment.items():
+                data[key] = to_wire(value)
+        for name, count in self._summarized.items():
+            if isinstance(data.get(name), dict) and len(self._buffers[name]):
+                data[name] = dict(data[name], janela=self._buffers[name].stats(count=count))
+        return data
+
+
+class DeadlineTicker:
+    """Marca ciclos em cadência fixa usando prazos em ``time.monotonic()``
+
+    Em vez de dormir um tempo fixo após a coleta e o envio (o que soma o
+    tempo de trabalho ao período e acumula deriva), cada ciclo tem um prazo
+    absoluto ``início + n * intervalo``. Se o loop atrasar mais de um
+    intervalo, os ciclos vencidos são pulados e contados, nunca enfileirados.
+    """
+
+    def __init__(self, interval: float, clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self._clock = clock
+        self._next_deadline: Optional[float] = None
+
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def wait(self, sleep: Callable[[float], Any] = time.sleep) -> int:
+        """Aguarda o próximo prazo e retorna quantos ciclos ele representa
+
+        O retorno é 1 no caso normal, ou 1 + ciclos perdidos sob sobrecarga.
+        ``sleep`` permite usar uma espera interrompível (ex.: ``Event.wait``).
+        """
+        remaining = self.time_until_next()
+        if remaining > 0:
+            sleep(remaining)
+        return self.advance()
+
+    def time_until_next(self) -> float:
+        """Segundos até o próximo prazo (0 se já venceu)
+
+        Junto com ``advance`` permite esperar o prazo fora daqui, por exemplo
+        com ``asyncio.wait_for`` em um loop asyncio.
+        """
+        now = self._clock()
+        if self._next_deadline is None:
+            self._next_deadline = now + self.interval
+        return max(0.0, self._next_deadline - now)
+
+    def advance(self) -> int:
+        """Fecha o ciclo cujo prazo venceu; retorna 1 + ciclos perdidos"""
+        now = self._clock()
+        lateness = max(0.0, now - self._next_deadline)
+        missed = int(lateness // self.interval)
+        if missed:
+            logger.warning(
+                f"Loop de monitoramento atrasado {lateness * 1000:.0f} ms: "
+                f"{missed} ciclo(s) pulado(s)"
+            )
+
+        # Próximo prazo sempre alinhado à grade original
+        self._next_deadline += (missed + 1) * self.interval
+        self.ticks += 1
+        self.missed_ticks += missed
+        self.last_lateness = lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        logger.debug(f"Ciclo {self.ticks}: atraso {self.last_lateness * 1000:.1f} ms")
+        return missed + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna atraso do último ciclo e ciclos pulados desde o início"""
+        return {
+            "atraso_ms": round(self.last_lateness * 1000, 1),
+            "atraso_maximo_ms": round(self.max_lateness * 1000, 1),
+            "ciclos_perdidos": self.missed_ticks,
+        }
+
+
+def create_scheduler(system_monitor, config: Dict[str, Any]) -> CollectorScheduler:
+    """Cria o agendador com os coletores habilitados em ``monitored_status``
+
+    Os períodos vêm de ``MONITORING_CONFIG["collector_intervals"]``, podendo ser
+    sobrescritos por ``collector_intervals`` na configuração da máquina. Coletor
+    sem período definido usa a frequência de envio (``update_frequency``).
+    Os campos guardados em memória vêm de ``ring_buffer["fields"]``; os
+    coletores de ``window_sampling["collectors"]`` rodam no período de
+    amostragem rápida e enviam a janela agregada.
+    """
+    frequency = config.get("update_frequency", 5)
+    monitored_status = config.get("monitored_status", {})
+
+    intervals = dict(MONITORING_CONFIG.get("collector_intervals", {}))
+    intervals.update(config.get("collector_intervals") or {})
+
+    ring_buffer = MONITORING_CONFIG.get("ring_buffer", {})
+    buffer_fields = ring_buffer.get("fields", {})
+
+    window_sampling = MONITORING_CONFIG.get("window_sampling", {})
+    sampling_interval = window_sampling.get("interval")
+    fast_collectors = window_sampling.get("collectors", []) if sampling_interval else []
+
+    scheduler = CollectorScheduler(
+        upload_interval=frequency,
+        buffer_seconds=ring_buffer.get("seconds", 300),
+    )
+    for name, collect in system_monitor.get_collectors().items():
+        if not monitored_status.get(name, False):
+            continue
+        fast = name in fast_collectors and name in buffer_fields
+        scheduler.add(
+            name,
+            collect,
+            sampling_interval if fast else intervals.get(name) or frequency,
+            fields=buffer_fields.get(name),
+            summarize=fast,
+        )
+
+    logger.info(
+        f"Agendador de coletores: ciclo base {scheduler.tick_interval}s, "
+        f"envio a cada {scheduler.upload_interval}s, períodos {scheduler.intervals}"
+    )
+    return scheduler
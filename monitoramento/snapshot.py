@@ -0,0 +1,173 @@
+"""
+Modelo compacto das amostras coletadas pelo SystemMonitor
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# slots=True só existe a partir do Python 3.10; antes disso os registros
+# ficam com __dict__ (mais memória, mesmo comportamento)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class CPUSample:
+    """Uso de CPU; percentuais por núcleo em ``array('f')`` (4 bytes por núcleo)"""
+    percentual_total: float = 0.0
+    percentual_por_nucleo: array = field(default_factory=lambda: array("f"))
+    nucleos_fisicos: int = 0
+    nucleos_logicos: int = 0
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "percentual_total": round(self.percentual_total, 1),
+            "percentual_por_nucleo": [round(percent, 1) for percent in self.percentual_por_nucleo],
+            "nucleos_fisicos": self.nucleos_fisicos,
+            "nucleos_logicos": self.nucleos_logicos
+        }
+
+
+@dataclass(**_SLOTS)
+class RAMSample:
+    total_gb: float = 0.0
+    disponivel_gb: float = 0.0
+    usado_gb: float = 0.0
+    percentual: float = 0.0
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "total_gb": round(self.total_gb, 1),
+            "disponivel_gb": round(self.disponivel_gb, 1),
+            "usado_gb": round(self.usado_gb, 1),
+            "percentual": round(self.percentual, 1)
+        }
+
+
+@dataclass(**_SLOTS)
+class DiskSample:
+    """Uso do caminho principal; montagens e dispositivos vêm do ``DiskCollector``"""
+    total_gb: float = 0.0
+    usado_gb: float = 0.0
+    livre_gb: float = 0.0
+    percentual: float = 0.0
+    montagens: List[Dict[str, Any]] = field(default_factory=list)
+    dispositivos: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "total_gb": round(self.total_gb, 1),
+            "usado_gb": round(self.usado_gb, 1),
+            "livre_gb": round(self.livre_gb, 1),
+            "percentual": round(self.percentual, 1),
+            "montagens": self.montagens,
+            "dispositivos": self.dispositivos
+        }
+
+
+@dataclass(**_SLOTS)
+class NetworkSample:
+    """Tráfego acumulado e taxas; ``interfaces`` vem de ``network_rates``"""
+    bytes_enviados_mb: float = 0.0
+    bytes_recebidos_mb: float = 0.0
+    bytes_enviados_s: float = 0.0
+    bytes_recebidos_s: float = 0.0
+    interfaces: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "bytes_enviados_mb": round(self.bytes_enviados_mb, 2),
+            "bytes_recebidos_mb": round(self.bytes_recebidos_mb, 2),
+            "bytes_enviados_s": round(self.bytes_enviados_s, 2),
+            "bytes_recebidos_s": round(self.bytes_recebidos_s, 2),
+            "interfaces": self.interfaces
+        }
+
+
+@dataclass(**_SLOTS)
+class TemperatureSample:
+    cpu: float = 0.0
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"cpu": round(self.cpu, 1)}
+
+
+@dataclass(**_SLOTS)
+class ProcessSample:
+    """Entrada de ranking; campos opcionais só saem no payload quando coletados"""
+    nome: str
+    cpu_percent: float
+    memoria_mb: float
+    io_kb_s: Optional[float] = None
+    threads: Optional[int] = None
+    fds: Optional[int] = None
+
+    def to_wire(self) -> Dict[str, Any]:
+        process = {
+            "nome": self.nome,
+            "cpu_percent": round(self.cpu_percent, 1),
+            "memoria_mb": round(self.memoria_mb, 1)
+        }
+        if self.io_kb_s is not None:
+            process["io_kb_s"] = round(self.io_kb_s, 1)
+        if self.threads is not None:
+            process["threads"] = self.threads
+        if self.fds is not None:
+            process["fds"] = self.fds
+        return process
+
+
+def get_metric(system_data: Dict[str, Any], path: str) -> Optional[float]:
+    """Lê um valor numérico do payload por caminho pontuado (ex.: ``cpu.percentual_total``)"""
+    value: Any = system_data
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def to_wire(value: Any) -> Any:
+    """Serializa um registro, uma sequência de registros ou devolve o valor como está"""
+    if hasattr(value, "to_wire"):
+        return value.to_wire()
+    if isinstance(value, (list, tuple)):
+        return [to_wire(item) for item in value]
+    return value
+
+
+@dataclass(**_SLOTS)
+class SystemSnapshot:
+    """Um ciclo completo de coleta
+
+    Os valores ficam brutos (sem ``round``) e tipados nos registros acima;
+    a árvore de dicts do payload só é montada em ``to_wire()``, no momento do
+    envio ou da persistência. Inventário de SO/hardware é estático e fica fora
+    do registro, sendo acrescentado por quem monta o payload.
+    """
+    timestamp: float
+    cpu: CPUSample
+    ram: RAMSample
+    disco: DiskSample
+    rede: NetworkSample
+    temperatura: TemperatureSample
+    processos: Dict[str, Tuple[ProcessSample, ...]] = field(default_factory=dict)
+    estatisticas_processos: Dict[str, Any] = field(default_factory=dict)
+
+    def to_wire(self) -> Dict[str, Any]:
+        data = {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "cpu": self.cpu.to_wire(),
+            "ram": self.ram.to_wire(),
+            "disco": self.disco.to_wire(),
+            "rede": self.rede.to_wire(),
+            "temperatura": self.temperatura.to_wire(),
+        }
+        for key, processes in self.processos.items():
+            data[key] = [process.to_wire() for process in processes]
+        data["estatisticas_processos"] = self.estatisticas_processos
+        return data
@@ -0,0 +1,158 @@
+"""
+Inventário estático do sistema (SO e hardware), calculado uma vez por processo
+"""
+
+import platform
+import logging
+from functools import lru_cache
+from typing import Any, Dict
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+OS_RELEASE_PATHS = ("/etc/os-release", "/usr/lib/os-release")
+
+
+def read_os_release() -> Dict[str, str]:
+    """Lê o arquivo os-release (substitui o removido ``platform.linux_distribution``)"""
+    for path in OS_RELEASE_PATHS:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                info = {}
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#") or "=" not in line:
+                        continue
+                    key, value = line.split("=", 1)
+                    info[key] = value.strip().strip('"').strip("'")
+                return info
+        except OSError:
+            continue
+    return {}
+
+
+def _read_cpu_model(system: str) -> str:
+    """Obtém o modelo do processador (no Linux ``platform.processor()`` costuma vir vazio)"""
+    if system == "Linux":
+        try:
+            with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("model name") or line.startswith("Hardware"):
+                        return line.split(":", 1)[1].strip()
+        except OSError:
+            pass
+    return platform.processor() or platform.machine()
+
+
+def _collect_os_info() -> Dict[str, Any]:
+    system = platform.system()
+    release = platform.release()
+    machine = platform.machine()
+
+    os_info = {
+        "sistema": system,
+        "versao": release,
+        "build": platform.version(),
+        "arquitetura": machine,
+        "processador": platform.processor(),
+        "descricao_completa": f"{system} {release} ({machine})"
+    }
+
+    # Informações específicas por sistema operacional
+    if system == "Windows":
+        try:
+            win_ver = platform.win32_ver()
+            os_info.update({
+                "edicao": win_ver[0],
+                "build_number": win_ver[1],
+                "service_pack": win_ver[2]
+            })
+        except Exception:
+            pass
+    elif system == "Linux":
+        os_release = read_os_release()
+        if os_release:
+            os_info.update({
+                "distribuicao": os_release.get("NAME", ""),
+                "versao_distribuicao": os_release.get("VERSION_ID", ""),
+                "codinome": os_release.get("VERSION_CODENAME", "")
+            })
+    elif system == "Darwin":
+        try:
+            mac_ver = platform.mac_ver()
+            os_info.update({
+                "versao_mac": mac_ver[0],
+                "build_mac": mac_ver[1]
+            })
+        except Exception:
+            pass
+
+    return os_info
+
+
+def _collect_hardware_info(system: str) -> Dict[str, Any]:
+    return {
+        "modelo_cpu": _read_cpu_model(system),
+        "nucleos_fisicos": psutil.cpu_count(logical=False),
+        "nucleos_logicos": psutil.cpu_count(logical=True),
+        "memoria_total_gb": round(psutil.virtual_memory().total / (1024**3), 1)
+    }
+
+
+@lru_cache(maxsize=None)
+def _get_inventory() -> Dict[str, Any]:
+    try:
+        os_info = _collect_os_info()
+    except Exception as e:
+        logger.error(f"Erro ao obter informações do SO: {e}")
+        os_info = {
+            "sistema": "Unknown",
+            "versao": "Unknown",
+            "build": "Unknown",
+            "arquitetura": "Unknown",
+            "processador": "Unknown",
+            "descricao_completa": "Unknown OS"
+        }
+
+    try:
+        hardware = _collect_hardware_info(os_info["sistema"])
+    except Exception as e:
+        logger.error(f"Erro ao obter informações de hardware: {e}")
+        hardware = {
+            "modelo_cpu": "Unknown",
+            "nucleos_fisicos": 0,
+            "nucleos_logicos": 0,
+            "memoria_total_gb": 0.0
+        }
+
+    return {"sistema_operacional": os_info, "hardware": hardware}
+
+
+def get_os_info() -> Dict[str, Any]:
+    """Informações do sistema operacional (cópia do cache do processo)"""
+    return dict(_get_inventory()["sistema_operacional"])
+
+
+def get_hardware_info() -> Dict[str, Any]:
+    """Modelo do CPU, núcleos e memória total (cópia do cache do processo)"""
+    return dict(_get_inventory()["hardware"])
+
+
+def get_os_description() -> str:
+    """Descrição curta do SO usada na identificação da máquina"""
+    os_info = _get_inventory()["sistema_operacional"]
+    system = os_info["sistema"]
+    release = os_info["versao"]
+
+    if system == "Windows":
+        return f"Windows {release} ({os_info.get('edicao', '')})"
+    if system == "Linux":
+        if os_info.get("distribuicao"):
+            return f"Linux {os_info['distribuicao']} {os_info.get('versao_distribuicao', '')} ({release})"
+        return f"Linux {release}"
+    if system == "Darwin":
+        return f"macOS {release}"
+    if system == "Unknown":
+        return "Unknown OS"
+    return f"{system} {release}"
@@ -4,11 +4,24 @@ Monitor de sistema para coleta de dados da máquina
 
 import psutil
 import json
-import platform
+from array import array
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import logging
 import os
+import time
+
+from config import MONITORING_CONFIG
+from .cpu_sampler import CPUSampler
+from .process_tracker import ProcessTracker, RANKING_KEYS, select_top
+from .system_inventory import get_hardware_info, get_os_info
+from .procfs_backend import create_backend
+from .network_rates import compute_rates
+from .disk_collector import DiskCollector
+from .snapshot import (
+    CPUSample, DiskSample, NetworkSample, ProcessSample, RAMSample,
+    SystemSnapshot, TemperatureSample, to_wire,
+)
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -19,160 +32,136 @@ class SystemMonitor:
     """Classe responsável por monitorar e coletar dados do sistema"""
     
     def __init__(self):
+        # (instante monotônico, contadores por interface) da leitura anterior
         self._last_network_counters = None
+        # Backend /proc no Linux (None = psutil)
+        self._backend = create_backend(MONITORING_CONFIG.get("collector_backend", "auto"))
+        # Mantém o snapshot de cpu_times entre ciclos (leitura não bloqueante)
+        self._cpu_sampler = CPUSampler(
+            read=self._backend.cpu_times_percpu if self._backend else None
+        )
+        # Montagens descobertas uma vez e contadores de IO entre ciclos
+        self._disk_collector = DiskCollector(
+            exclude_fstypes=MONITORING_CONFIG.get("disk_exclude_fstypes", ()),
+            include_network=MONITORING_CONFIG.get("disk_include_network", False),
+            refresh_interval=MONITORING_CONFIG.get("disk_mount_refresh_interval", 60),
+            read_io=self._backend.disk_io_counters if self._backend else None,
+        )
+        # Mantém os objetos Process entre ciclos para ter cpu_percent real
+        self._process_tracker = ProcessTracker()
+    
+    def close(self):
+        """Libera os descritores mantidos abertos entre ciclos (/proc e montagens)"""
+        if self._backend:
+            self._backend.close()
+        self._disk_collector.close()
     
     def get_operating_system_info(self) -> Dict[str, Any]:
-        """Obtém informações detalhadas do sistema operacional"""
+        """Obtém informações detalhadas do sistema operacional (cache por processo)"""
+        return get_os_info()
+    
+    def get_hardware_info(self) -> Dict[str, Any]:
+        """Obtém modelo do CPU, núcleos e memória total (cache por processo)"""
+        return get_hardware_info()
+    
+    def sample_cpu(self) -> CPUSample:
+        """Amostra de CPU como registro tipado (sem arredondamento)"""
         try:
-            system = platform.system()
-            release = platform.release()
-            version = platform.version()
-            machine = platform.machine()
-            processor = platform.processor()
+            cpu_percent, cpu_percent_per_core = self._cpu_sampler.sample()
+            hardware = get_hardware_info()
             
-            os_info = {
-                "sistema": system,
-                "versao": release,
-                "build": version,
-                "arquitetura": machine,
-                "processador": processor,
-                "descricao_completa": f"{system} {release} ({machine})"
-            }
-            
-            # Informações específicas por sistema operacional
-            if system == "Windows":
-                try:
-                    win_ver = platform.win32_ver()
-                    os_info.update({
-                        "edicao": win_ver[0],
-                        "build_number": win_ver[1],
-                        "service_pack": win_ver[2]
-                    })
-                except:
-                    pass
-            elif system == "Linux":
-                try:
-                    distro = platform.linux_distribution()
-                    os_info.update({
-                        "distribuicao": distro[0],
-                        "versao_distribuicao": distro[1],
-                        "codinome": distro[2]
-                    })
-                except:
-                    pass
-            elif system == "Darwin":
-                try:
-                    mac_ver = platform.mac_ver()
-                    os_info.update({
-                        "versao_mac": mac_ver[0],
-                        "build_mac": mac_ver[1]
-                    })
-                except:
-                    pass
-            
-            return os_info
+            return CPUSample(
+                percentual_total=cpu_percent,
+                percentual_por_nucleo=array("f", cpu_percent_per_core),
+                nucleos_fisicos=hardware["nucleos_fisicos"],
+                nucleos_logicos=hardware["nucleos_logicos"]
+            )
         except Exception as e:
-            logger.error(f"Erro ao obter informações do SO: {e}")
-            return {
-                "sistema": "Unknown",
-                "versao": "Unknown",
-                "build": "Unknown",
-                "arquitetura": "Unknown",
-                "processador": "Unknown",
-                "descricao_completa": "Unknown OS"
-            }
+            logger.error(f"Erro ao obter informações do CPU: {e}")
+            return CPUSample()
     
     def get_cpu_info(self) -> Dict[str, Any]:
         """Obtém informações detalhadas sobre o CPU"""
+        return self.sample_cpu().to_wire()
+    
+    def sample_ram(self) -> RAMSample:
+        """Amostra de memória RAM como registro tipado"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_percent_per_core = psutil.cpu_percent(interval=1, percpu=True)
-            cpu_count_physical = psutil.cpu_count(logical=False)
-            cpu_count_logical = psutil.cpu_count(logical=True)
+            memory = self._backend.virtual_memory() if self._backend else psutil.virtual_memory()
             
-            return {
-                "percentual_total": round(cpu_percent, 1),
-                "percentual_por_nucleo": [round(percent, 1) for percent in cpu_percent_per_core],
-                "nucleos_fisicos": cpu_count_physical,
-                "nucleos_logicos": cpu_count_logical
-            }
+            return RAMSample(
+                total_gb=memory.total / (1024**3),
+                disponivel_gb=memory.available / (1024**3),
+                usado_gb=memory.used / (1024**3),
+                percentual=memory.percent
+            )
         except Exception as e:
-            logger.error(f"Erro ao obter informações do CPU: {e}")
-            return {
-                "percentual_total": 0.0,
-                "percentual_por_nucleo": [],
-                "nucleos_fisicos": 0,
-                "nucleos_logicos": 0
-            }
+            logger.error(f"Erro ao obter informações da RAM: {e}")
+            return RAMSample()
     
     def get_ram_info(self) -> Dict[str, Any]:
         """Obtém informações sobre a memória RAM"""
-        try:
-            memory = psutil.virtual_memory()
-            
-            total_gb = round(memory.total / (1024**3), 1)
-            available_gb = round(memory.available / (1024**3), 1)
-            used_gb = round(memory.used / (1024**3), 1)
-            percent = round(memory.percent, 1)
-            
-            return {
-                "total_gb": total_gb,
-                "disponivel_gb": available_gb,
-                "usado_gb": used_gb,
-                "percentual": percent
-            }
-        except Exception as e:
-            logger.error(f"Erro ao obter informações da RAM: {e}")
-            return {
-                "total_gb": 0.0,
-                "disponivel_gb": 0.0,
-                "usado_gb": 0.0,
-                "percentual": 0.0
-            }
+        return self.sample_ram().to_wire()
     
-    def get_disk_info(self, path: str = '/') -> Dict[str, Any]:
-        """Obtém informações sobre o disco"""
+    def sample_disk(self, path: str = '/') -> DiskSample:
+        """Amostra de disco (``path``, montagens e IO por dispositivo) como registro tipado"""
         try:
-            disk = psutil.disk_usage(path)
-            
-            total_gb = round(disk.total / (1024**3), 1)
-            used_gb = round(disk.used / (1024**3), 1)
-            free_gb = round(disk.free / (1024**3), 1)
-            percent = round((disk.used / disk.total) * 100, 1)
+            disk = self._backend.disk_usage(path) if self._backend else psutil.disk_usage(path)
             
-            return {
-                "total_gb": total_gb,
-                "usado_gb": used_gb,
-                "livre_gb": free_gb,
-                "percentual": percent
-            }
+            return DiskSample(
+                total_gb=disk.total / (1024**3),
+                usado_gb=disk.used / (1024**3),
+                livre_gb=disk.free / (1024**3),
+                percentual=disk.used / disk.total * 100,
+                montagens=self._disk_collector.get_mount_usage(),
+                dispositivos=self._disk_collector.get_device_io()
+            )
         except Exception as e:
             logger.error(f"Erro ao obter informações do disco: {e}")
-            return {
-                "total_gb": 0.0,
-                "usado_gb": 0.0,
-                "livre_gb": 0.0,
-                "percentual": 0.0
-            }
+            return DiskSample()
     
-    def get_network_info(self) -> Dict[str, Any]:
-        """Obtém informações sobre o tráfego de rede"""
+    def get_disk_info(self, path: str = '/') -> Dict[str, Any]:
+        """Obtém o uso de ``path``, de cada montagem e o IO por dispositivo"""
+        return self.sample_disk(path).to_wire()
+    
+    def sample_network(self) -> NetworkSample:
+        """Amostra de rede (acumulado e taxas por interface) como registro tipado"""
         try:
-            network = psutil.net_io_counters()
-            
-            bytes_sent_mb = round(network.bytes_sent / (1024**2), 2)
-            bytes_recv_mb = round(network.bytes_recv / (1024**2), 2)
-            
-            return {
-                "bytes_enviados_mb": bytes_sent_mb,
-                "bytes_recebidos_mb": bytes_recv_mb
-            }
+            if self._backend:
+                counters = self._backend.net_io_counters(pernic=True)
+            else:
+                counters = psutil.net_io_counters(pernic=True)
+            now = time.monotonic()
+
+            bytes_sent = sum(nic.bytes_sent for nic in counters.values())
+            bytes_recv = sum(nic.bytes_recv for nic in counters.values())
+
+            interfaces = {}
+            if self._last_network_counters is not None:
+                last_time, last_counters = self._last_network_counters
+                interfaces = compute_rates(
+                    last_counters,
+                    counters,
+                    now - last_time,
+                    exclude_loopback=MONITORING_CONFIG.get("network_exclude_loopback", True),
+                    exclude_prefixes=MONITORING_CONFIG.get("network_exclude_prefixes", ()),
+                )
+            self._last_network_counters = (now, counters)
+
+            return NetworkSample(
+                bytes_enviados_mb=bytes_sent / (1024**2),
+                bytes_recebidos_mb=bytes_recv / (1024**2),
+                bytes_enviados_s=sum((nic["bytes_enviados_s"] for nic in interfaces.values()), 0.0),
+                bytes_recebidos_s=sum((nic["bytes_recebidos_s"] for nic in interfaces.values()), 0.0),
+                interfaces=interfaces
+            )
         except Exception as e:
             logger.error(f"Erro ao obter informações da rede: {e}")
-            return {
-                "bytes_enviados_mb": 0.0,
-                "bytes_recebidos_mb": 0.0
-            }
+            return NetworkSample()
+    
+    def get_network_info(self) -> Dict[str, Any]:
+        """Obtém o tráfego acumulado e as taxas por interface desde a última leitura"""
+        return self.sample_network().to_wire()
     
     def get_cpu_temperature(self) -> float:
         """Obtém a temperatura do CPU"""
@@ -188,46 +177,108 @@ class SystemMonitor:
         # Valor padrão se não conseguir obter a temperatura
         return 58.0
     
-    def get_top_processes(self, limit: int = 5) -> List[Dict[str, Any]]:
-        """Obtém os processos que mais consomem CPU"""
-        processes = []
+    def _format_process(self, sample: Dict[str, Any]) -> ProcessSample:
+        """Converte uma amostra do rastreador para o registro enviado à API"""
+        return ProcessSample(
+            nome=sample['nome'],
+            cpu_percent=sample['cpu_percent'],
+            memoria_mb=sample['rss'] / (1024**2),
+            io_kb_s=sample["io_bytes_s"] / 1024 if "io_bytes_s" in sample else None,
+            threads=sample.get("num_threads"),
+            fds=sample.get("num_fds")
+        )
+    
+    def sample_top_processes_by(self, keys: List[str], limit: Optional[int] = None) -> Dict[str, Tuple[ProcessSample, ...]]:
+        """Top N processos por chave de ranking como registros, com uma única varredura"""
+        if limit is None:
+            limit = MONITORING_CONFIG.get("top_processes_limit", 5)
         
+        keys = [key for key in keys if key in RANKING_KEYS]
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info']):
-                try:
-                    proc_info = proc.info
-                    if proc_info['cpu_percent'] > 0:
-                        processes.append({
-                            "nome": proc_info['name'],
-                            "cpu_percent": round(proc_info['cpu_percent'], 1),
-                            "memoria_mb": round(proc_info['memory_info'].rss / (1024**2), 1)
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            
-            # Ordena por uso de CPU e pega os top N
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
-            return processes[:limit]
+            samples = self._process_tracker.refresh(fields=keys)
+            return {
+                key: tuple(self._format_process(sample) for sample in select_top(samples, limit, key))
+                for key in keys
+            }
         except Exception as e:
             logger.error(f"Erro ao obter processos: {e}")
-            return []
+            return {key: () for key in keys}
+    
+    def get_top_processes_by(self, keys: List[str], limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Obtém os top N processos para cada chave de ranking com uma única varredura
+        
+        Chaves suportadas: cpu, memoria, io, threads, fds.
+        """
+        return {
+            key: to_wire(processes)
+            for key, processes in self.sample_top_processes_by(keys, limit).items()
+        }
+    
+    def get_top_processes(self, limit: Optional[int] = None, key: str = "cpu") -> List[Dict[str, Any]]:
+        """Obtém os processos que mais consomem o recurso indicado (CPU por padrão)"""
+        return self.get_top_processes_by([key], limit).get(key, [])
+    
+    def sample_process_rankings(self, limit: Optional[int] = None) -> Dict[str, Tuple[ProcessSample, ...]]:
+        """Rankings configurados como registros, já com as chaves do payload
+        
+        O ranking de CPU mantém a chave ``top_5_processos_cpu`` esperada pelo
+        servidor; os demais usam ``top_processos_<chave>``.
+        """
+        keys = MONITORING_CONFIG.get("top_processes_rankings", ["cpu"])
+        if "cpu" not in keys:
+            keys = ["cpu"] + list(keys)
+        
+        rankings = self.sample_top_processes_by(keys, limit)
+        payload = {"top_5_processos_cpu": rankings.pop("cpu", ())}
+        for key, processes in rankings.items():
+            payload[f"top_processos_{key}"] = processes
+        return payload
+    
+    def get_process_rankings(self, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Obtém os rankings configurados já com as chaves do payload"""
+        return {key: to_wire(processes) for key, processes in self.sample_process_rankings(limit).items()}
+    
+    def get_process_stats(self) -> Dict[str, Any]:
+        """Obtém o custo da última varredura de processos"""
+        return self._process_tracker.get_stats()
+    
+    def get_collectors(self) -> Dict[str, Callable[[], Dict[str, Any]]]:
+        """Retorna os coletores por métrica, cada um gerando um fragmento do payload
+        
+        Os nomes seguem as chaves de ``monitored_status`` da configuração. Os
+        fragmentos guardam registros tipados; ``snapshot.to_wire`` os serializa.
+        """
+        return {
+            "cpu": lambda: {"cpu": self.sample_cpu()},
+            "ram": lambda: {"ram": self.sample_ram()},
+            "disco": lambda: {"disco": self.sample_disk()},
+            "rede": lambda: {"rede": self.sample_network()},
+            "temperatura": lambda: {"temperatura": TemperatureSample(self.get_cpu_temperature())},
+            "processos": lambda: {
+                **self.sample_process_rankings(),
+                "estatisticas_processos": self.get_process_stats()
+            },
+        }
+    
+    def collect_snapshot(self) -> SystemSnapshot:
+        """Coleta todas as métricas em um registro compacto"""
+        return SystemSnapshot(
+            timestamp=time.time(),
+            cpu=self.sample_cpu(),
+            ram=self.sample_ram(),
+            disco=self.sample_disk(),
+            rede=self.sample_network(),
+            temperatura=TemperatureSample(self.get_cpu_temperature()),
+            processos=self.sample_process_rankings(),
+            estatisticas_processos=self.get_process_stats()
+        )
     
     def collect_system_data(self) -> Dict[str, Any]:
         """Coleta todos os dados do sistema"""
         try:
-            dados = {
-                "timestamp": datetime.now().isoformat(),
-                "sistema_operacional": self.get_operating_system_info(),
-                "cpu": self.get_cpu_info(),
-                "ram": self.get_ram_info(),
-                "disco": self.get_disk_info(),
-                "rede": self.get_network_info(),
-                "temperatura": {
-                    "cpu": self.get_cpu_temperature()
-                },
-                "top_5_processos_cpu": self.get_top_processes(5)
-            }
-            
+            dados = self.collect_snapshot().to_wire()
+            dados["sistema_operacional"] = self.get_operating_system_info()
+            dados["hardware"] = self.get_hardware_info()
             return dados
         except Exception as e:
             logger.error(f"Erro ao coletar dados do sistema: {e}")
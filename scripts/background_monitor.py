@@ -5,19 +5,33 @@ Este script pode ser executado independentemente da interface gráfica
 """
 
 import json
-import time
+import asyncio
+import functools
 import logging
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Adicionar o diretório pai ao path para importar os módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import FILE_CONFIG, LOGGING_CONFIG
+from config import FILE_CONFIG, LOGGING_CONFIG, UPLOAD_CONFIG
 from api.auth_service import AuthService
+from api.async_client import AsyncAPIClient
+from api.client_core import send_failure_level
+from api.machine_identity import MachineIdentity
+from api.offline_spool import OfflineSpool, is_retryable
+from api.upload_queue import StatusUploader, create_upload_queue
+from api.upload_pipeline import create_upload_pipeline
 from monitoramento.system_monitor import SystemMonitor
+from monitoramento.scheduler import DeadlineTicker, create_scheduler
+from monitoramento.history_store import create_history_store
+from monitoramento.anomaly_detector import create_anomaly_detector
+from monitoramento.rule_engine import create_rule_engine
+from monitoramento.desktop_notifier import notify_desktop
 
 # Configurar logging usando as configurações centralizadas
 log_file = FILE_CONFIG["machine_config_file"].replace("configuracao_maquina.json", "background_monitor.log")
@@ -40,32 +54,74 @@ class BackgroundMonitor:
         self.frequency = config.get("update_frequency", 5)
         self.monitored_status = config.get("monitored_status", {})
         self.is_running = False
+        self._stop_event = threading.Event()
         
         # Inicializar serviços
         self.auth_service = AuthService()
         self.system_monitor = SystemMonitor()
+        self.scheduler = create_scheduler(self.system_monitor, config)
+        self.ticker = DeadlineTicker(self.scheduler.tick_interval)
         self.api_client = self.auth_service.api_client
+        self.machine_identity = MachineIdentity(self.auth_service)
+        
+        # Coleta e envio em threads separadas, ligadas por uma fila limitada
+        self.upload_queue = None
+        self.uploader = None
+        
+        # Snapshots que falharam ficam em disco até a API voltar
+        self.spool = OfflineSpool()
+        self.batch_enabled = UPLOAD_CONFIG.get("batch_enabled", False)
+        
+        # Até N envios em andamento em enlaces de alta latência (None = um por vez)
+        self.pipeline = self._create_pipeline()
+        self._replay_lock = threading.Lock()
+        self._replay_wanted = threading.Event()
+        
+        # Histórico local para diagnóstico sem o servidor
+        self.history = create_history_store()
+        
+        # Linha de base por métrica aprendida nesta máquina
+        self.anomaly_detector = create_anomaly_detector(self.auth_service.get_machine_type())
+        
+        # Regras de limite avaliadas a cada ciclo; notificação de desktop só
+        # quando a opção Notificar está ligada
+        self.rule_engine = create_rule_engine(config)
+        self.notifications = config.get("notifications", False)
         
         logger.info(f"Background monitor inicializado - Frequência: {self.frequency}s")
     
+    def _create_pipeline(self):
+        """Pipeline de envio das threads de upload (None = um envio por vez)"""
+        return create_upload_pipeline(self.api_client)
+    
     def start(self):
         """Inicia o monitoramento contínuo"""
         self.is_running = True
+        self._stop_event.clear()
         logger.info("Iniciando monitoramento contínuo em segundo plano")
         
+        self.upload_queue = create_upload_queue()
+        send, send_batch = self.send_system_data, self.send_system_data_batch
+        if self.pipeline:
+            # A thread de envio só agenda; bloqueia apenas com a janela cheia
+            send = functools.partial(self._submit, send)
+            send_batch = functools.partial(self._submit, send_batch)
+        self.uploader = StatusUploader(
+            self.upload_queue,
+            send,
+            send_batch=send_batch if self.batch_enabled else None,
+        )
+        self.uploader.start()
+        
         try:
             while self.is_running:
-                # Aguardar o tempo definido na frequência
-                time.sleep(self.frequency)
+                # Aguardar o próximo prazo do ciclo base (cadência fixa, sem deriva)
+                ticks = self.ticker.wait(self._stop_event.wait)
                 
                 if not self.is_running:
                     break
                 
-                # Coletar dados do sistema
-                system_data = self.collect_system_data()
-                
-                # Enviar dados para a API
-                self.send_system_data(system_data)
+                self.run_cycle(ticks)
                 
         except KeyboardInterrupt:
             logger.info("Monitoramento interrompido pelo usuário")
@@ -73,51 +129,82 @@ class BackgroundMonitor:
             logger.error(f"Erro no monitoramento: {e}")
         finally:
             self.is_running = False
+            self.uploader.stop(timeout=self.frequency)
+            if self.pipeline:
+                self.pipeline.close(timeout=self.frequency)
+            if self.history:
+                self.history.close()
+            self.system_monitor.close()
             logger.info("Monitoramento finalizado")
     
     def stop(self):
         """Para o monitoramento"""
         self.is_running = False
+        self._stop_event.set()
         logger.info("Solicitação para parar monitoramento")
     
-    def collect_system_data(self) -> Dict[str, Any]:
-        """Coleta dados do sistema baseado nos status monitorados"""
+    def _submit(self, send, *args):
+        """Agenda um envio no pipeline e faz o replay do spool pedido pelos workers
+        
+        O replay também usa o pipeline, então roda aqui, na thread que agenda,
+        e não dentro de um worker: assim não ocupa vagas esperando por vagas.
+        """
+        self.pipeline.submit(send, *args)
+        if self._replay_wanted.is_set():
+            self._replay_wanted.clear()
+            token = self.auth_service.get_auth_token()
+            if token:
+                self.replay_spool(token)
+    
+    def _request_replay(self, token: str):
+        """API confirmou um envio: reenviar o spool (no pipeline, pela thread que agenda)"""
+        if self.pipeline:
+            self._replay_wanted.set()
+        else:
+            self.replay_spool(token)
+    
+    def run_cycle(self, ticks: int):
+        """Executa os coletores vencidos, avalia as regras e enfileira o snapshot
+        
+        Só envia quando o envio vence; enfileirar não bloqueia a coleta.
+        """
+        upload_due = self.scheduler.run_pending(ticks)
+        
+        if self.rule_engine:
+            self.process_alerts(self.rule_engine.evaluate(self.scheduler.latest_records()))
+        
+        if not upload_due:
+            return
+        
+        system_data = self.collect_system_data()
+        if self.history:
+            self.history.record(system_data)
+        
+        self.upload_queue.put(system_data)
+    
+    def collect_system_data(self, detect_anomalies: bool = True) -> Dict[str, Any]:
+        """Monta o payload com o último valor de cada coletor monitorado
+        
+        ``detect_anomalies`` é desligado nos payloads extras de alerta para
+        não alimentar a linha de base duas vezes com a mesma amostra.
+        """
         try:
-            data = {}
-            
-            # CPU
-            if self.monitored_status.get("cpu", False):
-                data["cpu"] = self.system_monitor.get_cpu_info()
-            
-            # RAM
-            if self.monitored_status.get("ram", False):
-                data["ram"] = self.system_monitor.get_ram_info()
-            
-            # Disco
-            if self.monitored_status.get("disco", False):
-                data["disco"] = self.system_monitor.get_disk_info()
-            
-            # Rede
-            if self.monitored_status.get("rede", False):
-                data["rede"] = self.system_monitor.get_network_info()
-            
-            # Temperatura
-            if self.monitored_status.get("temperatura", False):
-                data["temperatura"] = {"cpu": self.system_monitor.get_cpu_temperature()}
-            
-            # Processos
-            if self.monitored_status.get("processos", False):
-                data["top_5_processos_cpu"] = self.system_monitor.get_top_processes()
-            
-            # Informações da máquina
-            mac_address = self.auth_service.get_mac_address()
-            data["machine_info"] = {
-                "hostname": self.auth_service.get_hostname(),
-                "mac_address": mac_address,
-                "mac": mac_address,
-                "operating_system": self.auth_service.get_operating_system(),
-                "type": self.auth_service.get_machine_type()
-            }
+            data = self.scheduler.latest()
+            
+            # Identidade da máquina (completa só na primeira vez ou quando muda)
+            data.update(self.machine_identity.payload_fields())
+            
+            # Métricas fora da linha de base desta máquina
+            if self.anomaly_detector and detect_anomalies:
+                data["anomalias"] = self.anomaly_detector.update(data)
+            
+            # Cadência do loop (atraso e ciclos pulados)
+            data["estatisticas_agendamento"] = self.ticker.get_stats()
+            
+            # Bytes dos envios antes e depois da compressão
+            data["estatisticas_envio"] = self.api_client.get_transfer_stats()
+            if self.pipeline:
+                data["estatisticas_envio"]["pipeline"] = self.pipeline.get_stats()
             
             # Timestamp
             data["timestamp"] = datetime.now().isoformat()
@@ -128,6 +215,25 @@ class BackgroundMonitor:
             logger.error(f"Erro ao coletar dados do sistema: {e}")
             return {"error": str(e), "timestamp": datetime.now().isoformat()}
     
+    def process_alerts(self, events: List[Dict[str, Any]]):
+        """Envia alertas à frente da fila e avisa o usuário no desktop"""
+        if not events:
+            return
+        
+        for event in events:
+            logger.warning(
+                f"Alerta {event['estado']}: {event['regra']} (valor {event['valor']})"
+            )
+        
+        system_data = self.collect_system_data(detect_anomalies=False)
+        system_data["alertas"] = events
+        self.upload_queue.put(system_data, priority=True)
+        
+        if self.notifications:
+            for event in events:
+                title = "Alerta" if event["estado"] == "disparado" else "Alerta resolvido"
+                notify_desktop(title, f"{event['regra']} (valor atual: {event['valor']})")
+    
     def send_system_data(self, system_data: Dict[str, Any]):
         """Envia dados do sistema para a API"""
         try:
@@ -149,11 +255,261 @@ class BackgroundMonitor:
             
             if response.success:
                 logger.info("Dados enviados com sucesso para a API")
+                self.machine_identity.confirm_delivery(system_data)
+                # API disponível: reenviar o que ficou pendente no spool
+                self._request_replay(token)
             else:
-                logger.error(f"Erro ao enviar dados: {response.error}")
+                logger.log(send_failure_level(response), f"Erro ao enviar dados: {response.error}")
+                if is_retryable(response):
+                    self.spool.append(system_data)
                 
         except Exception as e:
             logger.error(f"Erro ao enviar dados para a API: {e}")
+            self.spool.append(system_data)
+    
+    def send_system_data_batch(self, snapshots: List[Dict[str, Any]]):
+        """Envia um lote de snapshots para a API"""
+        try:
+            token = self.auth_service.get_auth_token()
+            if not token:
+                logger.error("Monitor não autenticado. Não é possível enviar dados.")
+                return
+            
+            response = self.api_client.send_status_batch(snapshots, auth_token=token)
+            
+            if response.success:
+                logger.info(f"Lote de {len(snapshots)} snapshots enviado com sucesso para a API")
+                for system_data in snapshots:
+                    self.machine_identity.confirm_delivery(system_data)
+                self._request_replay(token)
+            else:
+                logger.log(send_failure_level(response), f"Erro ao enviar lote: {response.error}")
+                sent = (response.data or {}).get("enviados", 0)
+                for system_data in snapshots[:sent]:
+                    self.machine_identity.confirm_delivery(system_data)
+                if is_retryable(response):
+                    # Guarda só o que o servidor não confirmou
+                    for system_data in snapshots[sent:]:
+                        self.spool.append(system_data)
+                
+        except Exception as e:
+            logger.error(f"Erro ao enviar lote para a API: {e}")
+            for system_data in snapshots:
+                self.spool.append(system_data)
+    
+    def replay_spool(self, token: str):
+        """Reenvia os snapshots pendentes no spool, em lote quando habilitado"""
+        if not len(self.spool):
+            return
+        
+        # Um replay por vez, mesmo se chamado de fora da thread de envio
+        if not self._replay_lock.acquire(blocking=False):
+            return
+        try:
+            if self.pipeline:
+                # Lotes simultâneos, cada um confirmado pela própria resposta
+                self.spool.replay_pipelined(
+                    self.pipeline,
+                    lambda snapshots: self.api_client.send_status_batch(snapshots, auth_token=token)
+                )
+            elif self.batch_enabled:
+                self.spool.replay_batch(
+                    lambda snapshots: self.api_client.send_status_batch(snapshots, auth_token=token)
+                )
+            else:
+                self.spool.replay(
+                    lambda data: self.api_client.update_machine_status({"data": data}, auth_token=token)
+                )
+        finally:
+            self._replay_lock.release()
+
+class AsyncBackgroundMonitor(BackgroundMonitor):
+    """Monitoramento contínuo em um único loop asyncio
+    
+    Coleta, envios, replay do spool e verificação de saúde são tarefas do
+    mesmo loop, em vez de threads separadas. Os envios usam o
+    ``AsyncAPIClient``, com no máximo ``UPLOAD_CONFIG["max_in_flight"]``
+    requisições em andamento; a fila limitada continua aplicando a política
+    de overflow quando o servidor não acompanha. O lote, quando habilitado,
+    é usado no replay do spool.
+    
+    O que bloqueia (coletores com psutil e varredura de processos, regras,
+    histórico e spool em SQLite) roda em uma única thread de coleta via
+    ``run_in_executor``, para não atrasar os envios nem a verificação de saúde.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.async_client = AsyncAPIClient(self.api_client)
+        self.health_check_interval = UPLOAD_CONFIG.get("health_check_interval", 60)
+        self._blocking = None
+        self._loop = None
+        self._stop = None
+        self._queue_ready = None
+        self._replay_wanted = None
+    
+    def _create_pipeline(self):
+        # Aqui os envios simultâneos são limitados pelo AsyncAPIClient
+        return None
+    
+    def start(self):
+        """Inicia o monitoramento contínuo (bloqueia até ``stop``)"""
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            logger.info("Monitoramento interrompido pelo usuário")
+    
+    def stop(self):
+        """Para o monitoramento (pode ser chamado de outra thread)"""
+        self.is_running = False
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        logger.info("Solicitação para parar monitoramento")
+    
+    async def run(self):
+        self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._queue_ready = asyncio.Event()
+        self._replay_wanted = asyncio.Event()
+        self._blocking = ThreadPoolExecutor(1, thread_name_prefix="Coleta")
+        self.upload_queue = create_upload_queue()
+        logger.info("Iniciando monitoramento contínuo em segundo plano (asyncio)")
+        
+        tasks = [
+            asyncio.create_task(self._upload_loop(), name="envio"),
+            asyncio.create_task(self._replay_loop(), name="replay"),
+            asyncio.create_task(self._health_loop(), name="saude"),
+        ]
+        try:
+            await self._collect_loop()
+        except Exception as e:
+            logger.error(f"Erro no monitoramento: {e}")
+        finally:
+            self.is_running = False
+            # Envia o que ainda está na fila antes de encerrar
+            self.upload_queue.close()
+            self._queue_ready.set()
+            try:
+                await asyncio.wait_for(tasks[0], self.frequency)
+            except asyncio.TimeoutError:
+                logger.warning("Envios pendentes interrompidos no encerramento")
+            for task in tasks[1:]:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.async_client.aclose()
+            if self.history:
+                await self._run_blocking(self.history.close)
+            await self._run_blocking(self.system_monitor.close)
+            self._blocking.shutdown(wait=True)
+            logger.info("Monitoramento finalizado")
+    
+    async def _run_blocking(self, func, *args):
+        """Roda ``func(*args)`` na thread de coleta sem bloquear o loop"""
+        return await self._loop.run_in_executor(self._blocking, functools.partial(func, *args))
+    
+    async def _sleep(self, seconds: float) -> bool:
+        """Espera interrompível por ``stop``; retorna False se o monitor parou"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self.is_running
+    
+    async def _collect_loop(self):
+        while self.is_running:
+            # Mesmo prazo fixo do loop síncrono, esperado sem bloquear o loop
+            if not await self._sleep(self.ticker.time_until_next()):
+                break
+            ticks = self.ticker.advance()
+            
+            await self._run_blocking(self.run_cycle, ticks)
+            self._queue_ready.set()
+    
+    async def _upload_loop(self):
+        """Retira snapshots da fila e os envia concorrentemente (limitado)"""
+        slots = asyncio.Semaphore(self.async_client.max_in_flight)
+        pending = set()
+        while True:
+            item = self.upload_queue.get(timeout=0)
+            if item is None:
+                if self.upload_queue.closed:
+                    break
+                self._queue_ready.clear()
+                await self._queue_ready.wait()
+                continue
+            
+            # Sem vaga, o item espera aqui e os próximos ficam na fila limitada
+            await slots.acquire()
+            task = asyncio.create_task(self.send_system_data_async(item))
+            pending.add(task)
+            task.add_done_callback(lambda done: (pending.discard(done), slots.release()))
+        
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def send_system_data_async(self, system_data: Dict[str, Any]):
+        """Envia um snapshot; em falha transitória ele vai para o spool"""
+        try:
+            token = self.auth_service.get_auth_token()
+            if not token:
+                logger.error("Monitor não autenticado. Não é possível enviar dados.")
+                return
+            
+            response = await self.async_client.update_machine_status(
+                {"data": system_data},
+                auth_token=token
+            )
+            
+            if response.success:
+                logger.info("Dados enviados com sucesso para a API")
+                self.machine_identity.confirm_delivery(system_data)
+                self._replay_wanted.set()
+            else:
+                logger.log(send_failure_level(response), f"Erro ao enviar dados: {response.error}")
+                if is_retryable(response):
+                    await self._run_blocking(self.spool.append, system_data)
+                
+        except Exception as e:
+            logger.error(f"Erro ao enviar dados para a API: {e}")
+            await self._run_blocking(self.spool.append, system_data)
+    
+    async def _replay_loop(self):
+        """Reenvia o spool quando um envio ou a verificação de saúde confirma a API"""
+        while True:
+            await self._replay_wanted.wait()
+            self._replay_wanted.clear()
+            
+            token = self.auth_service.get_auth_token()
+            if not token or not await self._run_blocking(len, self.spool):
+                continue
+            try:
+                if self.batch_enabled:
+                    await self.spool.replay_batch_async(
+                        lambda snapshots: self.async_client.send_status_batch(snapshots, auth_token=token),
+                        executor=self._blocking,
+                    )
+                else:
+                    await self.spool.replay_async(
+                        lambda data: self.async_client.update_machine_status({"data": data}, auth_token=token),
+                        executor=self._blocking,
+                    )
+            except Exception as e:
+                logger.error(f"Erro no replay do spool: {e}")
+    
+    async def _health_loop(self):
+        """Verifica /api/health periodicamente sem atrasar coleta nem envios"""
+        available = None
+        while await self._sleep(self.health_check_interval):
+            response = await self.async_client.health_check()
+            if response.success != available:
+                if response.success:
+                    logger.info("API disponível")
+                else:
+                    logger.warning(f"API indisponível: {response.error}")
+                available = response.success
+            if response.success:
+                self._replay_wanted.set()
 
 def load_config_from_file() -> Dict[str, Any]:
     """Carrega configuração do arquivo JSON"""
@@ -192,7 +548,10 @@ def main():
             return
         
         # Criar e iniciar monitor
-        monitor = BackgroundMonitor(config)
+        if UPLOAD_CONFIG.get("async_loop", False) or "--async" in sys.argv[1:]:
+            monitor = AsyncBackgroundMonitor(config)
+        else:
+            monitor = BackgroundMonitor(config)
         monitor.start()
         
     except KeyboardInterrupt:
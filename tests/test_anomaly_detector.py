@@ -0,0 +1,42 @@
+from monitoramento.anomaly_detector import AnomalyDetector
+
+
+def _payload(cpu):
+    return {"cpu": {"percentual_total": cpu}}
+
+
+def test_flags_spike_only_after_warmup():
+    detector = AnomalyDetector(["cpu.percentual_total", "ram.percentual"], alpha=0.1, sigma=3, warmup=10)
+
+    # Pico durante o aquecimento não é sinalizado
+    assert detector.update(_payload(95)) == []
+    for i in range(30):
+        assert detector.update(_payload(20 + (i % 3))) == []
+
+    anomalies = detector.update(_payload(90))
+
+    assert [a["metrica"] for a in anomalies] == ["cpu.percentual_total"]
+    assert anomalies[0]["valor"] == 90
+    assert anomalies[0]["z"] > 3
+
+
+def test_sustained_shift_becomes_the_new_baseline():
+    detector = AnomalyDetector(["cpu.percentual_total"], alpha=0.3, sigma=3, warmup=5)
+    for i in range(20):
+        detector.update(_payload(10 + (i % 2)))
+
+    flagged = [bool(detector.update(_payload(60 + (i % 2)))) for i in range(30)]
+
+    assert flagged[0]
+    assert not any(flagged[-10:])
+
+
+def test_small_step_after_flat_stretch_is_not_an_anomaly():
+    detector = AnomalyDetector(["temperatura.cpu"], min_std_by_metric={"temperatura.cpu": 2.0})
+    for _ in range(39):
+        assert detector.update({"temperatura": {"cpu": 50.0}}) == []
+
+    assert detector.update({"temperatura": {"cpu": 51.0}}) == []
+    # Um salto real continua sinalizado, com z finito
+    anomalies = detector.update({"temperatura": {"cpu": 80.0}})
+    assert anomalies and anomalies[0]["z"] > 3
@@ -0,0 +1,140 @@
+from api.api_client import APIClient, APIResponse
+
+
+class RecordingClient(APIClient):
+    def __init__(self, responses):
+        super().__init__(base_url="http://localhost:5000")
+        self.responses = responses
+        self.calls = []
+
+    def _make_request(self, method, endpoint, data=None, timeout=10, compress=False, retry="default"):
+        self.calls.append((method, endpoint))
+        return self.responses[endpoint].pop(0)
+
+
+def test_send_status_batch_uses_batch_endpoint_when_advertised():
+    client = RecordingClient({
+        "/api/health": [APIResponse(True, data={"capabilities": ["status_batch"]}, status_code=200)],
+        "/api/maquina/status/batch": [APIResponse(True, data={"accepted": 2}, status_code=200)],
+    })
+
+    response = client.send_status_batch([{"n": 1}, {"n": 2}])
+
+    assert response.success is True
+    assert response.data["enviados"] == 2
+    assert client.calls == [("GET", "/api/health"), ("PUT", "/api/maquina/status/batch")]
+
+
+def test_send_status_batch_falls_back_to_single_puts():
+    client = RecordingClient({
+        "/api/health": [APIResponse(True, data={"status": "ok"}, status_code=200)],
+        "/api/maquina/status": [
+            APIResponse(True, data={}, status_code=200),
+            APIResponse(False, error="Erro HTTP 503", status_code=503),
+        ],
+    })
+
+    response = client.send_status_batch([{"n": 1}, {"n": 2}, {"n": 3}])
+
+    assert response.success is False
+    assert response.data == {"enviados": 1}
+    assert client.calls.count(("PUT", "/api/maquina/status")) == 2
+
+
+def test_encode_body_compresses_only_above_threshold():
+    import gzip
+    import json
+
+    client = APIClient(base_url="http://localhost:5000")
+    client.core.compression = "gzip"
+    client.core.compression_min_bytes = 100
+
+    small, small_headers = client.core.encode_body({"n": 1})
+    payload = {"processos": [{"nome": "python", "cpu_percent": 1.0}] * 50}
+    large, large_headers = client.core.encode_body(payload)
+
+    assert small_headers == {}
+    assert json.loads(small) == {"n": 1}
+    assert large_headers == {"Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(large)) == payload
+    stats = client.get_transfer_stats()
+    assert stats["bytes_enviados"] < stats["bytes_json"]
+
+
+class FakeHTTPResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.headers = {}
+        self.calls = 0
+
+    def put(self, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    post = put
+
+
+def test_retries_transient_errors_honouring_retry_after():
+    client = APIClient(base_url="http://localhost:5000")
+    client.session = FakeSession([
+        FakeHTTPResponse(503, headers={"Retry-After": "1"}),
+        FakeHTTPResponse(500),
+        FakeHTTPResponse(200, {"ok": True}),
+    ])
+    sleeps = []
+    client._sleep = sleeps.append
+
+    response = client.update_machine_config({"n": 1})
+
+    assert response.success is True
+    assert client.session.calls == 3
+    # Retry-After é o piso da primeira espera
+    assert sleeps[0] >= 1
+    assert all(delay <= client.core.retry_policies["config"].max_delay + 1 for delay in sleeps)
+
+
+def test_status_profile_gives_up_quickly_and_skips_client_errors():
+    client = APIClient(base_url="http://localhost:5000")
+    client._sleep = lambda delay: None
+
+    client.session = FakeSession([FakeHTTPResponse(502)] * 5)
+    assert client.update_machine_status({"data": {}}).status_code == 502
+    assert client.session.calls == client.core.retry_policies["status"].attempts
+
+    client.session = FakeSession([FakeHTTPResponse(400, {"message": "inválido"})])
+    assert client.update_machine_config({}).error == "inválido"
+    assert client.session.calls == 1
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    from api.retry_policy import RetryPolicy, parse_retry_after
+
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("amanhã") is None
+    # Retry-After maior que o teto do perfil: desiste em vez de esperar
+    assert RetryPolicy(attempts=3, max_delay=2).delay(0, retry_after=60) is None
+
+
+def test_set_auth_token_replaces_headers_instead_of_mutating_them():
+    client = APIClient(base_url="http://localhost:5000")
+    previous = client.session.headers
+
+    client.set_auth_token("abc")
+    current = client.session.headers
+    client.set_auth_token("abc")
+
+    # Threads que já leram os headers antigos não os veem mudar
+    assert "Authorization" not in previous
+    assert current["Authorization"] == "Bearer abc"
+    assert client.session.headers is current
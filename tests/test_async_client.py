@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+from api.api_client import APIClient, APIResponse
+from api.async_client import AsyncAPIClient
+from api.offline_spool import OfflineSpool
+from api.retry_policy import RetryPolicy
+
+
+class SlowClient(APIClient):
+    """Cliente síncrono cujas tentativas demoram e contam a concorrência"""
+
+    def __init__(self, responses=None):
+        super().__init__(base_url="http://localhost:5000")
+        self.responses = responses
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _send_request(self, method, endpoint, data=None, timeout=10, compress=False):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        if self.responses:
+            return self.responses.pop(0)
+        return APIResponse(True, data={"endpoint": endpoint}, status_code=200)
+
+
+def test_concurrent_requests_are_bounded_by_max_in_flight():
+    sync = SlowClient()
+    client = AsyncAPIClient(sync, max_in_flight=2)
+
+    async def main():
+        try:
+            return await asyncio.gather(*(client.get_machine_config(f"mac-{n}") for n in range(6)))
+        finally:
+            await client.aclose()
+
+    responses = asyncio.run(main())
+
+    assert all(response.success for response in responses)
+    assert sync.peak == 2
+    assert client.in_flight == 0
+
+
+def test_retries_share_the_sync_client_policies_and_breaker():
+    sync = SlowClient([
+        APIResponse(False, error="Erro HTTP 503", status_code=503),
+        APIResponse(True, data={}, status_code=200),
+    ])
+    sync.core.retry_policies["status"] = RetryPolicy(attempts=2, base_delay=0.01, max_delay=0.01)
+    client = AsyncAPIClient(sync, max_in_flight=1)
+
+    response = asyncio.run(client.update_machine_status({"data": {}}))
+
+    assert response.success is True
+    assert sync.core.status_breaker.get_stats()["falhas_consecutivas"] == 0
+
+
+def test_replay_async_keeps_collection_order(tmp_path):
+    spool = OfflineSpool(path=str(tmp_path / "spool.db"))
+    now = datetime.now()
+    spool.append({"timestamp": now.isoformat(), "n": 2})
+    spool.append({"timestamp": (now - timedelta(seconds=5)).isoformat(), "n": 1})
+    sent = []
+
+    async def send(data):
+        await asyncio.sleep(0)
+        sent.append(data["n"])
+        return APIResponse(True, status_code=200)
+
+    assert asyncio.run(spool.replay_async(send)) == 2
+    assert sent == [1, 2]
+    assert len(spool) == 0
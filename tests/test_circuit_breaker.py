@@ -0,0 +1,117 @@
+import logging
+
+from api.api_client import APIClient, APIResponse
+from api.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from api.client_core import send_failure_level
+from api.offline_spool import is_retryable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_on_consecutive_failures_and_probes_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, open_timeout=10, max_open_timeout=15, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    # Uma única vaga de teste; os demais seguem vendo o disjuntor aberto
+    assert breaker.acquire() == HALF_OPEN
+    assert breaker.acquire() == OPEN
+    # Teste falho reabre com o dobro do tempo, limitado ao teto
+    breaker.record_failure()
+    clock.now = 24
+    assert breaker.acquire() == OPEN
+    clock.now = 25
+    assert breaker.acquire() == HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.get_stats()["aberturas"] == 2
+
+
+def test_opens_on_error_rate_and_recovers_with_a_fresh_window():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=10, error_rate=0.5, window=6, min_calls=6,
+                             open_timeout=10, clock=clock)
+    for _ in range(3):
+        breaker.record_success()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 10
+    assert breaker.acquire() == HALF_OPEN
+    breaker.record_success()
+    # As falhas de antes da abertura não contam mais
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+class ProbeClient(APIClient):
+    def __init__(self, status_responses, probe_responses):
+        super().__init__(base_url="http://localhost:5000")
+        self.core.status_breaker = CircuitBreaker(failure_threshold=2, open_timeout=30, clock=FakeClock())
+        self.status_responses = status_responses
+        self.probe_responses = probe_responses
+        self.calls = []
+
+    def _make_request(self, method, endpoint, data=None, timeout=10, compress=False, retry="default"):
+        self.calls.append((method, endpoint))
+        return self.status_responses.pop(0)
+
+    def _send_request(self, method, endpoint, data=None, timeout=10, compress=False):
+        self.calls.append((method, endpoint))
+        return self.probe_responses.pop(0)
+
+
+def test_open_circuit_skips_network_and_single_probe_closes_it():
+    client = ProbeClient(
+        [APIResponse(False, error="Erro HTTP 503", status_code=503)] * 2
+        + [APIResponse(True, data={}, status_code=200)],
+        [APIResponse(True, data={"status": "ok"}, status_code=200)],
+    )
+
+    client.update_machine_status({"data": {}})
+    client.update_machine_status({"data": {}})
+    client.calls.clear()
+
+    response = client.update_machine_status({"data": {}})
+    assert client.calls == []
+    # Resposta de circuito aberto vai para o spool como falha transitória
+    assert is_retryable(response)
+
+    client.core.status_breaker._clock.now = 30
+    assert client.update_machine_status({"data": {}}).success is True
+    assert client.calls == [("GET", "/api/health"), ("PUT", "/api/maquina/status")]
+    assert client.get_transfer_stats()["circuito"]["estado"] == CLOSED
+
+
+def test_client_errors_do_not_trip_the_breaker():
+    client = ProbeClient([APIResponse(False, error="inválido", status_code=400)] * 3, [])
+    for _ in range(3):
+        client.update_machine_status({"data": {}})
+    assert client.core.status_breaker.state == CLOSED
+
+
+def test_open_circuit_warns_once_and_skipped_sends_log_at_debug(caplog):
+    client = ProbeClient([APIResponse(False, error="Erro HTTP 503", status_code=503)] * 2, [])
+    failed = client.update_machine_status({"data": {}})
+    assert send_failure_level(failed) == logging.ERROR
+
+    with caplog.at_level(logging.DEBUG, logger="api"):
+        client.update_machine_status({"data": {}})
+        skipped = [client.update_machine_status({"data": {}}) for _ in range(5)]
+
+    warnings = [record for record in caplog.records if record.levelno >= logging.WARNING]
+    assert [record.name for record in warnings] == ["api.circuit_breaker"]
+    assert all(send_failure_level(response) == logging.DEBUG for response in skipped)
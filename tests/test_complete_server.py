@@ -4,6 +4,7 @@ Servidor de teste completo para simular todos os endpoints
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import gzip
 import json
 from datetime import datetime
 
@@ -13,6 +14,14 @@ CORS(app)
 # Armazenar dados recebidos
 received_data = []
 
+def get_request_json():
+    """Lê o JSON do corpo, descomprimindo quando enviado com Content-Encoding gzip"""
+    if request.headers.get('Content-Encoding') == 'gzip':
+        raw = gzip.decompress(request.get_data())
+        print(f"🗜️ Corpo gzip: {request.content_length} bytes -> {len(raw)} bytes")
+        return json.loads(raw)
+    return request.get_json()
+
 @app.route('/api/login', methods=['POST'])
 def login():
     """Endpoint de login"""
@@ -94,7 +103,7 @@ def update_machine_config():
 def update_machine_status():
     """Endpoint para receber dados de monitoramento da máquina"""
     try:
-        data = request.get_json()
+        data = get_request_json()
         
         # Adicionar timestamp de recebimento
         data['received_at'] = datetime.now().isoformat()
@@ -105,7 +114,7 @@ def update_machine_status():
         print(f"📊 Dados de monitoramento recebidos:")
         print(f"   Timestamp: {data.get('data', {}).get('timestamp', 'N/A')}")
         print(f"   Máquina: {data.get('data', {}).get('machine_info', {}).get('hostname', 'N/A')}")
-        print(f"   MAC: {data.get('data', {}).get('machine_info', {}).get('mac_address', 'N/A')}")
+        print(f"   MAC: {data.get('data', {}).get('machine_id', 'N/A')}")
         
         # Mostrar dados coletados
         system_data = data.get('data', {})
@@ -139,6 +148,44 @@ def update_machine_status():
             "error": str(e)
         }), 500
 
+@app.route('/api/maquina/status/batch', methods=['PUT'])
+def update_machine_status_batch():
+    """Endpoint para receber vários snapshots de monitoramento em uma requisição"""
+    try:
+        data = get_request_json()
+        snapshots = data.get('data', [])
+        
+        received_at = datetime.now().isoformat()
+        for snapshot in snapshots:
+            received_data.append({"data": snapshot, "received_at": received_at})
+        
+        print(f"📦 Lote de monitoramento recebido: {len(snapshots)} snapshots")
+        print(f"   Total de dados recebidos: {len(received_data)}")
+        print("-" * 50)
+        
+        return jsonify({
+            "success": True,
+            "message": "Lote de monitoramento recebido com sucesso",
+            "accepted": len(snapshots),
+            "received_at": received_at
+        }), 200
+        
+    except Exception as e:
+        print(f"❌ Erro ao processar lote: {e}")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Endpoint de saúde, anunciando as capacidades do servidor"""
+    return jsonify({
+        "status": "ok",
+        "capabilities": ["status_batch"],
+        "content_encodings": ["gzip"]
+    })
+
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Endpoint para verificar status do servidor"""
@@ -148,6 +195,7 @@ def get_status():
             "login": "/api/login (POST)",
             "config": "/api/update_confg_maquina (POST)",
             "monitoring": "/api/maquina/status (PUT)",
+            "monitoring_batch": "/api/maquina/status/batch (PUT)",
             "health": "/api/status (GET)"
         },
         "data_received": len(received_data)
@@ -167,6 +215,7 @@ if __name__ == '__main__':
     print("   🔐 Login: http://localhost:5000/api/login")
     print("   ⚙️ Config: http://localhost:5000/api/update_confg_maquina")
     print("   📊 Monitoramento: http://localhost:5000/api/maquina/status")
+    print("   📦 Monitoramento em lote: http://localhost:5000/api/maquina/status/batch")
     print("   📈 Dados: http://localhost:5000/api/data")
     print("=" * 60)
     app.run(host='0.0.0.0', port=5000, debug=True)
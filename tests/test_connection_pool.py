@@ -0,0 +1,137 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from api.connection_pool import DNSCache, PooledAdapter
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_reuses_connection_across_idle_gaps_by_default(server):
+    clock = FakeClock()
+    adapter = PooledAdapter(pool_size=2, dns_ttl=300, clock=clock)
+    session = requests.Session()
+    session.mount("http://", adapter)
+
+    for _ in range(3):
+        assert session.get(f"{server}/api/health", timeout=5).status_code == 200
+        # Intervalo longo entre envios: o keep-alive segura a conexão
+        clock.now += 600
+    stats = adapter.get_stats()
+    assert stats["conexoes_novas"] == 1
+    assert stats["conexoes_reaproveitadas"] == 2
+    assert stats["descartes_ociosas"] == 0
+
+
+def test_idle_timeout_refreshes_connection_with_cached_dns(server):
+    clock = FakeClock()
+    adapter = PooledAdapter(pool_size=2, idle_timeout=300, dns_ttl=600, clock=clock)
+    session = requests.Session()
+    session.mount("http://", adapter)
+
+    assert session.get(f"{server}/api/health", timeout=5).status_code == 200
+    clock.now += 301
+    assert session.get(f"{server}/api/health", timeout=5).status_code == 200
+    stats = adapter.get_stats()
+    assert stats["conexoes_novas"] == 2
+    assert stats["descartes_ociosas"] == 1
+    assert stats["dns"] == {"acertos": 1, "consultas": 1}
+
+
+def test_connection_falls_back_to_next_cached_address(server, monkeypatch):
+    import socket
+
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host == "localhost":
+            # Primeiro endereço sem ninguém escutando, como um IPv6 sem rota
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ip, port))
+                    for ip in ("127.0.0.2", "127.0.0.1")]
+        return real_getaddrinfo(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    adapter = PooledAdapter(dns_ttl=300)
+    session = requests.Session()
+    session.mount("http://", adapter)
+
+    assert session.get(f"{server}/api/health", timeout=5).status_code == 200
+    assert adapter.dns_cache.resolve("localhost", int(server.rsplit(":", 1)[1])) == ["127.0.0.2", "127.0.0.1"]
+
+
+def test_dns_cache_keeps_last_addresses_when_resolution_fails(monkeypatch):
+    import socket
+
+    clock = FakeClock()
+    cache = DNSCache(ttl=10, clock=clock)
+    monkeypatch.setattr(socket, "getaddrinfo", lambda *args, **kwargs: [
+        (0, 0, 0, "", ("10.0.0.5", 443)),
+        (0, 0, 0, "", ("10.0.0.6", 443)),
+        (0, 0, 0, "", ("10.0.0.5", 443)),
+    ])
+    assert cache.resolve("api.exemplo", 443) == ["10.0.0.5", "10.0.0.6"]
+
+    def fail(*args, **kwargs):
+        raise socket.gaierror("sem DNS")
+
+    monkeypatch.setattr(socket, "getaddrinfo", fail)
+    clock.now += 11
+    assert cache.resolve("api.exemplo", 443) == ["10.0.0.5", "10.0.0.6"]
+    with pytest.raises(socket.gaierror):
+        cache.resolve("outro.exemplo", 443)
+
+
+def test_failed_connections_are_not_counted_as_reused():
+    import socket
+
+    # Porta sem ninguém escutando: servidor fora do ar
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    adapter = PooledAdapter(dns_ttl=300)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get(f"http://127.0.0.1:{port}/api/health", timeout=2)
+
+    stats = adapter.get_stats()
+    assert stats["requisicoes"] == 3
+    assert stats["conexoes_novas"] == 0
+    assert stats["conexoes_reaproveitadas"] == 0
+    assert stats["descartes_falha"] == 3
@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+import pytest
+
+from monitoramento import cpu_sampler
+from monitoramento.cpu_sampler import CPUSampler
+
+CPUTimes = namedtuple("CPUTimes", ["user", "system", "idle", "iowait"])
+
+
+@pytest.fixture
+def fake_cpu_times(monkeypatch):
+    snapshots = []
+
+    def cpu_times(percpu=False):
+        return snapshots.pop(0)
+
+    monkeypatch.setattr(cpu_sampler.psutil, "cpu_times", cpu_times)
+    monkeypatch.setattr(cpu_sampler.time, "sleep", lambda seconds: None)
+    return snapshots
+
+
+def test_first_sample_warms_up_and_reports_delta(fake_cpu_times):
+    fake_cpu_times.extend([
+        [CPUTimes(10, 0, 90, 0), CPUTimes(0, 0, 100, 0)],
+        [CPUTimes(15, 5, 90, 0), CPUTimes(0, 0, 110, 0)],
+    ])
+
+    total, per_core = CPUSampler().sample()
+
+    assert per_core == [100.0, 0.0]
+    assert total == 50.0
+
+
+def test_sample_uses_previous_snapshot_without_blocking(fake_cpu_times):
+    sampler = CPUSampler()
+    fake_cpu_times.extend([
+        [CPUTimes(0, 0, 100, 0)],
+        [CPUTimes(5, 0, 105, 0)],
+        [CPUTimes(5, 0, 105, 10)],
+    ])
+    sampler.sample()
+
+    total, per_core = sampler.sample()
+
+    assert total == 0.0
+    assert per_core == [0.0]
+    assert fake_cpu_times == []
@@ -0,0 +1,34 @@
+import logging
+
+from monitoramento import desktop_notifier
+
+
+def test_windows_uses_powershell_toast_with_text_in_environment(monkeypatch):
+    launched = []
+    monkeypatch.setattr(desktop_notifier, "plyer_notification", None)
+    monkeypatch.setattr(desktop_notifier.sys, "platform", "win32")
+    monkeypatch.setattr(desktop_notifier.shutil, "which", lambda name: "C:\\powershell.exe")
+    monkeypatch.setattr(desktop_notifier.subprocess, "Popen",
+                        lambda command, **kwargs: launched.append((command, kwargs)))
+
+    assert desktop_notifier.notify_desktop("Alerta", 'CPU "alta"') is True
+
+    command, kwargs = launched[0]
+    assert command[0] == "powershell"
+    # Texto só pelo ambiente: nada do alerta entra no script
+    assert "CPU" not in command[-1]
+    assert kwargs["env"]["ROCKS_NOTIFY_MESSAGE"] == 'CPU "alta"'
+
+
+def test_missing_backend_warns_only_once(monkeypatch, caplog):
+    monkeypatch.setattr(desktop_notifier, "plyer_notification", None)
+    monkeypatch.setattr(desktop_notifier, "_unavailable_warned", False)
+    monkeypatch.setattr(desktop_notifier.sys, "platform", "win32")
+    monkeypatch.setattr(desktop_notifier.shutil, "which", lambda name: None)
+
+    with caplog.at_level(logging.DEBUG, logger=desktop_notifier.__name__):
+        assert desktop_notifier.notify_desktop("Alerta", "a") is False
+        assert desktop_notifier.notify_desktop("Alerta", "b") is False
+
+    warnings = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
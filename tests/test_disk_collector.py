@@ -0,0 +1,109 @@
+from collections import namedtuple
+
+from monitoramento import disk_collector
+from monitoramento.disk_collector import DiskCollector, device_rates
+
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+IO = namedtuple("IO", "read_count write_count read_bytes write_bytes read_time write_time")
+
+
+def test_device_rates_compute_throughput_iops_and_latency():
+    previous = IO(100, 50, 1000, 2000, 40, 60)
+    current = IO(140, 60, 5000, 4000, 140, 110)
+
+    rates = device_rates(previous, current, 2.0)
+
+    assert rates["leitura_bytes_s"] == 2000.0
+    assert rates["escrita_bytes_s"] == 1000.0
+    assert rates["iops_leitura"] == 20.0
+    assert rates["iops_escrita"] == 5.0
+    # 150 ms de serviço em 50 operações
+    assert rates["latencia_media_ms"] == 3.0
+
+
+def test_mounts_are_cached_filtered_and_deduplicated(monkeypatch):
+    calls = []
+    partitions = [
+        Partition("/dev/sda1", "/", "ext4", "rw"),
+        Partition("/dev/sda1", "/var/lib/bind", "ext4", "rw"),
+        Partition("tmpfs", "/run", "tmpfs", "rw"),
+        Partition("/dev/sdb1", "/dados", "xfs", "rw"),
+        Partition("nas:/export", "/mnt/nas", "nfs4", "rw"),
+        Partition("//fileserver/publico", "/mnt/publico", "cifs", "rw"),
+        Partition("user@host:/home", "/mnt/remoto", "fuse.sshfs", "rw"),
+    ]
+    monkeypatch.setattr(disk_collector.psutil, "disk_partitions", lambda all: calls.append(1) or partitions)
+    counters = iter([
+        {"sda1": IO(0, 0, 0, 0, 0, 0), "sdb1": IO(0, 0, 0, 0, 0, 0), "loop0": IO(0, 0, 0, 0, 0, 0)},
+        {"sda1": IO(10, 0, 4096, 0, 5, 0), "sdb1": IO(0, 0, 0, 0, 0, 0), "loop0": IO(9, 9, 9, 9, 9, 9)},
+    ])
+    ticks = iter([0.0, 10.0, 11.0])
+    collector = DiskCollector(exclude_fstypes=["tmpfs"], read_io=lambda: next(counters), clock=lambda: next(ticks))
+
+    mounts = collector.get_mounts()
+    assert [m["ponto_montagem"] for m in mounts] == ["/", "/dados"]
+    assert collector.get_device_io() == {}
+    rates = collector.get_device_io()
+
+    assert set(rates) == {"sda1", "sdb1"}
+    assert rates["sda1"]["iops_leitura"] == 10.0
+    assert len(calls) == 1
+    collector.close()
+
+
+def test_network_mounts_are_only_listed_when_enabled(monkeypatch):
+    partitions = [
+        Partition("/dev/sda1", "/", "ext4", "rw"),
+        Partition("nas:/export", "/mnt/nas", "nfs4", "rw"),
+        Partition("//fileserver/publico", "/mnt/publico", "smb3", "rw"),
+    ]
+    monkeypatch.setattr(disk_collector.psutil, "disk_partitions", lambda all: partitions)
+
+    local_only = DiskCollector()
+    with_network = DiskCollector(include_network=True)
+
+    assert [m["ponto_montagem"] for m in local_only.get_mounts()] == ["/"]
+    assert len(with_network.get_mounts()) == 3
+    local_only.close()
+    with_network.close()
+
+
+def test_windows_volumes_map_to_physical_drives(monkeypatch):
+    partitions = [
+        Partition("C:\\", "C:\\", "NTFS", "rw,fixed"),
+        Partition("D:\\", "D:\\", "NTFS", "rw,fixed"),
+    ]
+    monkeypatch.setattr(disk_collector.sys, "platform", "win32")
+    monkeypatch.setattr(disk_collector.psutil, "disk_partitions", lambda all: partitions)
+    monkeypatch.setattr(disk_collector, "_windows_disk_number", {"C:\\": 0, "D:\\": 1}.get)
+    counters = iter([
+        {"PhysicalDrive0": IO(0, 0, 0, 0, 0, 0), "PhysicalDrive1": IO(0, 0, 0, 0, 0, 0)},
+        {"PhysicalDrive0": IO(10, 0, 0, 0, 0, 0), "PhysicalDrive1": IO(0, 5, 0, 0, 0, 0)},
+    ])
+    ticks = iter([0.0, 10.0, 11.0])
+    collector = DiskCollector(read_io=lambda: next(counters), clock=lambda: next(ticks))
+
+    assert [m["nome_io"] for m in collector.get_mounts()] == ["PhysicalDrive0", "PhysicalDrive1"]
+    collector.get_device_io()
+    rates = collector.get_device_io()
+    assert rates["PhysicalDrive0"]["iops_leitura"] == 10.0
+    assert rates["PhysicalDrive1"]["iops_escrita"] == 5.0
+    collector.close()
+
+
+def test_unmatched_volumes_report_every_disk(monkeypatch):
+    # Sem mapeamento (ex.: IOCTL indisponível): C:\ não casa com PhysicalDrive0
+    monkeypatch.setattr(disk_collector.sys, "platform", "win32")
+    monkeypatch.setattr(disk_collector.psutil, "disk_partitions",
+                        lambda all: [Partition("C:\\", "C:\\", "NTFS", "rw,fixed")])
+    monkeypatch.setattr(disk_collector, "_windows_disk_number", lambda mountpoint: None)
+    counters = iter([
+        {"PhysicalDrive0": IO(0, 0, 0, 0, 0, 0)},
+        {"PhysicalDrive0": IO(4, 0, 0, 0, 0, 0)},
+    ])
+    ticks = iter([0.0, 2.0, 3.0])
+    collector = DiskCollector(read_io=lambda: next(counters), clock=lambda: next(ticks))
+
+    collector.get_device_io()
+    assert collector.get_device_io()["PhysicalDrive0"]["iops_leitura"] == 4.0
+    collector.close()
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from monitoramento.history_store import HistoryStore
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _payload(ts, cpu):
+    return {"timestamp": datetime.fromtimestamp(ts).isoformat(), "cpu": {"percentual_total": cpu}}
+
+
+def test_raw_samples_roll_up_into_minutes_and_hours(tmp_path):
+    clock = FakeClock(36000.0)
+    store = HistoryStore(
+        path=str(tmp_path / "historico.db"),
+        metrics=["cpu.percentual_total", "ram.percentual"],
+        retention={"raw": 3600, "1m": 86400, "1h": 30 * 86400},
+        clock=clock,
+    )
+
+    for i, cpu in enumerate([10, 30, 20, 60]):
+        clock.now = 36000.0 + i * 30
+        assert store.record(_payload(clock.now, cpu)) == 1
+
+    # Vira a hora: minutos e hora fechados são agregados
+    clock.now = 39600.0 + 5
+    store.maintain()
+
+    minutes = store.query("cpu.percentual_total", 36000, resolution="1m")
+    assert [(p["timestamp"], p["min"], p["max"], p["media"], p["amostras"]) for p in minutes] == [
+        (36000, 10.0, 30.0, 20.0, 2),
+        (36060, 20.0, 60.0, 40.0, 2),
+    ]
+    hour = store.query("cpu.percentual_total", 36000, resolution="1h")
+    assert [(p["min"], p["max"], p["media"], p["amostras"]) for p in hour] == [(10.0, 60.0, 30.0, 4)]
+    # Início além da retenção bruta: auto usa os buckets de 1 minuto
+    assert store.query("cpu.percentual_total", 36000) == minutes
+    assert store.list_metrics() == ["cpu.percentual_total"]
+    store.close()
+
+
+def test_retention_drops_old_raw_samples(tmp_path):
+    clock = FakeClock(100000.0)
+    store = HistoryStore(
+        path=str(tmp_path / "historico.db"),
+        metrics=["cpu.percentual_total"],
+        retention={"raw": 600, "1m": 86400, "1h": 30 * 86400},
+        clock=clock,
+    )
+    store.record(_payload(clock.now, 50))
+
+    clock.now += 3600
+    store.maintain()
+
+    assert store.query("cpu.percentual_total", 0, resolution="raw") == []
+    assert store.query("cpu.percentual_total", 0, resolution="1m")[0]["media"] == 50.0
+    store.close()
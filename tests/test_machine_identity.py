@@ -0,0 +1,72 @@
+from api import machine_identity
+from api.machine_identity import MachineIdentity
+
+
+class FakeAuthService:
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.refreshes = 0
+        self._machine_info = {"hostname": hostname, "mac_address": "00:11:22:33:44:55"}
+
+    def get_machine_info(self):
+        return self._machine_info
+
+    def refresh_machine_info(self):
+        self.refreshes += 1
+        self._machine_info = {"hostname": self.hostname, "mac_address": "00:11:22:33:44:55"}
+        return self._machine_info
+
+    def get_machine_type(self):
+        return "server"
+
+
+def test_full_identity_is_sent_once_then_only_machine_id(monkeypatch):
+    monkeypatch.setattr(machine_identity.socket, "gethostname", lambda: "host-a")
+    now = [0.0]
+    identity = MachineIdentity(FakeAuthService("host-a"), clock=lambda: now[0])
+
+    first = identity.payload_fields()
+    identity.confirm_delivery(first)
+    now[0] = 10.0
+    second = identity.payload_fields()
+
+    assert first["machine_info"]["type"] == "server"
+    assert second == {"machine_id": "00:11:22:33:44:55"}
+
+
+def test_hostname_change_is_detected_by_periodic_check(monkeypatch):
+    hostname = ["host-a"]
+    monkeypatch.setattr(machine_identity.socket, "gethostname", lambda: hostname[0])
+    now = [0.0]
+    auth_service = FakeAuthService("host-a")
+    identity = MachineIdentity(auth_service, clock=lambda: now[0])
+    identity.confirm_delivery(identity.payload_fields())
+
+    hostname[0] = auth_service.hostname = "host-b"
+    now[0] = 10.0
+    assert "machine_info" not in identity.payload_fields()
+
+    now[0] = identity.check_interval + 10.0
+    fields = identity.payload_fields()
+
+    assert fields["machine_info"]["hostname"] == "host-b"
+    assert auth_service.refreshes == 1
+
+
+def test_identity_is_reattached_until_a_payload_carrying_it_is_confirmed(monkeypatch):
+    monkeypatch.setattr(machine_identity.socket, "gethostname", lambda: "host-a")
+    now = [0.0]
+    identity = MachineIdentity(FakeAuthService("host-a"), clock=lambda: now[0])
+
+    # Primeiro snapshot descartado pela fila (ou guardado no spool)
+    identity.payload_fields()
+    now[0] = 10.0
+    second = identity.payload_fields()
+    assert "machine_info" in second
+
+    # Um payload sem a identidade confirmado não conta
+    identity.confirm_delivery({"machine_id": "00:11:22:33:44:55"})
+    assert "machine_info" in identity.payload_fields()
+
+    identity.confirm_delivery(second)
+    assert "machine_info" not in identity.payload_fields()
@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+from monitoramento.network_rates import compute_rates, counter_delta
+
+NIC = namedtuple("NIC", "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout")
+
+
+def test_counter_delta_treats_any_decrease_as_reset():
+    assert counter_delta(100, 250) == 150
+    # Interface recriada: nada de pico de GB por suposta volta de 32 bits
+    assert counter_delta(3_000_000_000, 1000) == 1000
+    assert counter_delta(2**40, 7) == 7
+
+
+def test_compute_rates_per_interface_and_filters():
+    previous = {
+        "eth0": NIC(1000, 2000, 10, 20, 0, 0, 1, 0),
+        "lo": NIC(0, 0, 0, 0, 0, 0, 0, 0),
+        "veth12": NIC(0, 0, 0, 0, 0, 0, 0, 0),
+    }
+    current = {
+        "eth0": NIC(3000, 6000, 30, 60, 2, 0, 4, 0),
+        "lo": NIC(500, 500, 5, 5, 0, 0, 0, 0),
+        "veth12": NIC(100, 100, 1, 1, 0, 0, 0, 0),
+        "wlan0": NIC(100, 100, 1, 1, 0, 0, 0, 0),
+    }
+
+    rates = compute_rates(previous, current, 2.0, exclude_prefixes=["veth"])
+
+    assert list(rates) == ["eth0"]
+    assert rates["eth0"]["bytes_enviados_s"] == 1000.0
+    assert rates["eth0"]["pacotes_recebidos_s"] == 20.0
+    assert rates["eth0"]["erros_entrada"] == 2
+    assert rates["eth0"]["descartes_entrada"] == 3
+    assert compute_rates(None, current, 2.0) == {}
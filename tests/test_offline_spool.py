@@ -0,0 +1,71 @@
+import time
+from datetime import datetime, timedelta
+
+from api.api_client import APIResponse
+from api.offline_spool import OfflineSpool
+
+
+def test_spool_survives_reopen_and_replays_in_collection_order(tmp_path):
+    path = str(tmp_path / "spool.db")
+    now = datetime.now()
+    spool = OfflineSpool(path=path)
+    spool.append({"timestamp": now.isoformat(), "n": 2})
+    spool.append({"timestamp": (now - timedelta(seconds=5)).isoformat(), "n": 1})
+    spool.close()
+
+    reopened = OfflineSpool(path=path)
+    sent = []
+
+    def send(data):
+        sent.append(data["n"])
+        return APIResponse(True, status_code=200)
+
+    assert reopened.replay(send) == 2
+    assert sent == [1, 2]
+    assert len(reopened) == 0
+
+
+def test_replay_stops_on_transient_failure_and_drops_rejected_items(tmp_path):
+    spool = OfflineSpool(path=str(tmp_path / "spool.db"))
+    for n in range(3):
+        spool.append({"n": n})
+
+    responses = iter([
+        APIResponse(False, error="Payload inválido", status_code=400),
+        APIResponse(False, error="Erro HTTP 503", status_code=503),
+    ])
+
+    assert spool.replay(lambda data: next(responses)) == 0
+    assert [data["n"] for _, data in spool.peek(10)] == [1, 2]
+
+
+def test_prune_enforces_size_and_age_caps(tmp_path):
+    spool = OfflineSpool(path=str(tmp_path / "spool.db"), max_bytes=60)
+    for n in range(5):
+        spool.append({"n": n, "pad": "x" * 10})
+
+    remaining = [data["n"] for _, data in spool.peek(10)]
+    assert remaining == [3, 4]
+
+    spool.max_age = 0
+    time.sleep(0.01)
+    spool.prune()
+    assert len(spool) == 0
+
+
+def test_running_byte_total_tracks_inserts_removals_and_reopen(tmp_path):
+    path = str(tmp_path / "spool.db")
+    spool = OfflineSpool(path=path, max_bytes=60)
+    for n in range(5):
+        spool.append({"n": n, "pad": "x" * 10})
+
+    def table_total(spool):
+        return spool._conn.execute("SELECT COALESCE(SUM(size), 0) FROM spool").fetchone()[0]
+
+    assert spool.total_bytes == table_total(spool) <= 60
+    spool.remove([spool.peek(1)[0][0]])
+    assert spool.total_bytes == table_total(spool)
+    spool.close()
+
+    reopened = OfflineSpool(path=path, max_bytes=60)
+    assert reopened.total_bytes == table_total(reopened) > 0
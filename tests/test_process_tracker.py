@@ -0,0 +1,87 @@
+import pytest
+
+from monitoramento import process_tracker
+from monitoramento.process_tracker import ProcessTracker, select_top
+
+
+class FakeMemoryInfo:
+    def __init__(self, rss):
+        self.rss = rss
+
+
+class FakeProcess:
+    cpu_by_pid = {}
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.reads = 0
+
+    def name(self):
+        return f"proc-{self.pid}"
+
+    def cpu_percent(self, interval=None):
+        self.reads += 1
+        # A primeira leitura do psutil sempre retorna 0
+        return 0.0 if self.reads == 1 else self.cpu_by_pid.get(self.pid, 0.0)
+
+    def memory_info(self):
+        return FakeMemoryInfo(self.pid * 1024)
+
+    def oneshot(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def fake_psutil(monkeypatch):
+    state = {"pids": [1, 2]}
+    monkeypatch.setattr(process_tracker.psutil, "pids", lambda: list(state["pids"]))
+    monkeypatch.setattr(process_tracker.psutil, "Process", FakeProcess)
+    monkeypatch.setattr(process_tracker.time, "sleep", lambda seconds: None)
+    FakeProcess.cpu_by_pid = {1: 12.5, 2: 3.0, 3: 40.0}
+    return state
+
+
+def test_refresh_reuses_process_objects_across_ticks(fake_psutil):
+    tracker = ProcessTracker()
+
+    first = tracker.refresh()
+    second = tracker.refresh()
+
+    assert {sample["pid"]: sample["cpu_percent"] for sample in first} == {1: 12.5, 2: 3.0}
+    assert sorted(sample["nome"] for sample in second) == ["proc-1", "proc-2"]
+    assert tracker.get_stats()["total_processos"] == 2
+
+
+def test_refresh_adds_new_and_drops_exited_pids(fake_psutil):
+    tracker = ProcessTracker()
+    tracker.refresh()
+
+    fake_psutil["pids"] = [2, 3]
+    samples = tracker.refresh()
+
+    # PID novo só entra no ranking depois da leitura de referência
+    assert [sample["pid"] for sample in samples] == [2]
+    assert 1 not in tracker._processes
+
+    samples = tracker.refresh()
+    assert sorted(sample["pid"] for sample in samples) == [2, 3]
+
+
+def test_select_top_keeps_only_the_largest_entries_for_each_key():
+    samples = [
+        {"pid": 1, "cpu_percent": 5.0, "rss": 300, "num_threads": 2},
+        {"pid": 2, "cpu_percent": 0.0, "rss": 900, "num_threads": 8},
+        {"pid": 3, "cpu_percent": 50.0, "rss": 100},
+        {"pid": 4, "cpu_percent": 20.0, "rss": 500, "num_threads": 4},
+    ]
+
+    assert [s["pid"] for s in select_top(samples, 2, "cpu")] == [3, 4]
+    assert [s["pid"] for s in select_top(samples, 3, "memoria")] == [2, 4, 1]
+    assert [s["pid"] for s in select_top(samples, 5, "threads")] == [2, 4, 1]
+    assert select_top(samples, 5, "io") == []
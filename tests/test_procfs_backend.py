@@ -0,0 +1,110 @@
+import os
+import sys
+
+import pytest
+
+from monitoramento import procfs_backend
+from monitoramento.procfs_backend import ProcfsBackend, _ProcFile
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="backend /proc só existe no Linux")
+
+
+def _backend_from(tmp_path, **contents):
+    backend = ProcfsBackend.__new__(ProcfsBackend)
+    backend._wraps = {}
+    for name, text in contents.items():
+        path = tmp_path / name
+        path.write_text(text)
+        # Buffer pequeno para exercitar a releitura com buffer maior
+        setattr(backend, f"_{name}", _ProcFile(str(path), size=16))
+    return backend
+
+
+def test_parses_cpu_and_memory(tmp_path):
+    backend = _backend_from(
+        tmp_path,
+        stat="cpu  10 0 10 70 10 0 0 0 0 0\ncpu0 10 0 10 70 10 0 0 0 0 0\nintr 1 2 3\n",
+        meminfo="MemTotal: 1000 kB\nMemFree: 200 kB\nMemAvailable: 600 kB\nBuffers: 50 kB\n",
+    )
+
+    assert backend.cpu_times_percpu() == [(20.0, 100.0)]
+    memory = backend.virtual_memory()
+    assert memory.total == 1000 * 1024
+    assert memory.used == 400 * 1024
+    assert memory.percent == 40.0
+
+
+def test_net_io_counters_sums_interfaces(tmp_path):
+    header = "Inter-|   Receive\n face |bytes packets errs drop fifo frame compressed multicast|bytes ...\n"
+    backend = _backend_from(
+        tmp_path,
+        net_dev=header
+        + "  lo: 100 1 0 0 0 0 0 0 100 1 0 0 0 0 0 0\n"
+        + "eth0: 300 3 1 0 0 0 0 0 500 5 0 2 0 0 0 0\n",
+    )
+
+    assert backend.net_io_counters(pernic=True)["eth0"].bytes_sent == 500
+    total = backend.net_io_counters()
+    assert (total.bytes_recv, total.bytes_sent, total.dropout) == (400, 600, 2)
+
+
+def test_create_backend_respects_psutil_choice():
+    assert procfs_backend.create_backend("psutil") is None
+
+
+def test_wrapping_counters_keep_growing_and_resets_pass_through(tmp_path):
+    from monitoramento.network_rates import counter_delta
+
+    header = "Inter-|   Receive\n face |bytes packets errs drop fifo frame compressed multicast|bytes ...\n"
+    path = tmp_path / "net_dev"
+
+    def read(rx_bytes):
+        path.write_text(header + f"eth0: {rx_bytes} 3 0 0 0 0 0 0 500 5 0 0 0 0 0 0\n")
+        return backend.net_io_counters(pernic=True)["eth0"].bytes_recv
+
+    backend = _backend_from(tmp_path, net_dev=header)
+    first = read(2**32 - 1000)
+    # Contador de 32 bits estourou: 1000 até o limite + 500 depois
+    wrapped = read(500)
+    assert counter_delta(first, wrapped) == 1500
+    # Queda grande (interface recriada) continua sendo reinício
+    reset = read(100)
+    assert counter_delta(wrapped, reset) == 100
+
+
+def _assert_closed(fds):
+    for fd in fds:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+
+def test_close_releases_proc_descriptors_and_is_idempotent():
+    backend = ProcfsBackend()
+    proc_files = (backend._stat, backend._meminfo, backend._net_dev, backend._diskstats)
+    fds = [proc_file.fd for proc_file in proc_files]
+    for fd in fds:
+        os.fstat(fd)
+
+    backend.close()
+    _assert_closed(fds)
+    assert all(proc_file.fd is None for proc_file in proc_files)
+    # Segunda chamada não fecha descritores reaproveitados por outro open
+    reused = os.open("/proc/stat", os.O_RDONLY)
+    try:
+        backend.close()
+        os.fstat(reused)
+    finally:
+        os.close(reused)
+
+
+def test_system_monitor_close_releases_backend_descriptors(monkeypatch):
+    from monitoramento import system_monitor
+
+    monkeypatch.setitem(system_monitor.MONITORING_CONFIG, "collector_backend", "procfs")
+    monitor = system_monitor.SystemMonitor()
+    backend = monitor._backend
+    fds = [proc_file.fd for proc_file in (backend._stat, backend._meminfo, backend._net_dev, backend._diskstats)]
+
+    monitor.close()
+
+    _assert_closed(fds)
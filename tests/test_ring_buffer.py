@@ -0,0 +1,23 @@
+from monitoramento.ring_buffer import RingBuffer
+
+
+def test_append_wraps_and_windows_are_chronological():
+    buffer = RingBuffer(["cpu"], capacity=4)
+    for ts, value in enumerate([1, 2, 3, 4, 5, 6]):
+        buffer.append(float(ts), {"cpu": value})
+
+    assert len(buffer) == 4
+    # Janela atravessa a volta do buffer: dois trechos, do mais antigo ao mais novo
+    assert [v for segment in buffer.window("cpu") for v in segment] == [3, 4, 5, 6]
+    assert [v for segment in buffer.window("cpu", count=2) for v in segment] == [5, 6]
+    assert buffer.last("cpu") == 6
+
+
+def test_stats_over_time_window_ignore_missing_values():
+    buffer = RingBuffer(["cpu", "temperatura"], capacity=10)
+    for ts, value in enumerate([10, 20, 30, 40]):
+        buffer.append(float(ts), {"cpu": value, "temperatura": None})
+
+    stats = buffer.stats(seconds=2.5)
+
+    assert stats == {"cpu": {"min": 20.0, "max": 40.0, "media": 30.0, "p95": 39.0, "ultimo": 40.0, "amostras": 3}}
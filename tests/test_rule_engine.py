@@ -0,0 +1,47 @@
+import pytest
+
+from monitoramento.rule_engine import RuleEngine, compile_rule
+from monitoramento.snapshot import RAMSample
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _ram(percent):
+    return {"ram": {"percentual": percent}}
+
+
+def test_rule_fires_after_duration_once_and_resolves_with_hysteresis():
+    clock = FakeClock()
+    engine = RuleEngine([{"regra": "ram.percentual > 90 for 60s", "histerese": 5}], clock=clock)
+
+    states = []
+    for now, percent in [(0, 95), (30, 96), (60, 97), (90, 99), (120, 88), (150, 84)]:
+        clock.now = now
+        states.append([event["estado"] for event in engine.evaluate(_ram(percent))])
+
+    # Dispara uma vez aos 60s, não repete, e só resolve abaixo de 85
+    assert states == [[], [], ["disparado"], [], [], ["resolvido"]]
+
+
+def test_condition_interrupted_restarts_the_duration():
+    rule = compile_rule("cpu.percentual_total >= 80 for 10s")
+
+    assert rule({"cpu": {"percentual_total": 90}}, 0) is None
+    assert rule({"cpu": {"percentual_total": 50}}, 5) is None
+    assert rule({"cpu": {"percentual_total": 90}}, 12) is None
+    assert rule({"cpu": {"percentual_total": 90}}, 22)["estado"] == "disparado"
+
+
+def test_rules_read_records_and_reject_invalid_syntax():
+    rule = compile_rule("ram.percentual < 10")
+    assert rule({"ram": RAMSample(percentual=5.0)}, 0)["estado"] == "disparado"
+
+    with pytest.raises(ValueError):
+        compile_rule("ram.percentual acima de 90")
+    assert len(RuleEngine(["ram.percentual ~ 3", "disco.percentual > 90"])) == 1
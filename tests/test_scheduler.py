@@ -0,0 +1,113 @@
+from monitoramento.scheduler import CollectorScheduler, DeadlineTicker
+
+
+def test_collectors_run_on_their_own_period_aligned_to_base_tick():
+    calls = []
+    scheduler = CollectorScheduler(upload_interval=2)
+    scheduler.add("cpu", lambda: calls.append("cpu") or {"cpu": len(calls)}, 1)
+    scheduler.add("processos", lambda: calls.append("processos") or {"top_5_processos_cpu": []}, 3)
+
+    uploads = [scheduler.run_pending() for _ in range(6)]
+
+    assert scheduler.tick_interval == 1
+    assert uploads == [True, False, True, False, True, False]
+    assert calls.count("cpu") == 6
+    # Ciclos 0 e 3: processos roda na mesma passada que o CPU
+    assert calls.count("processos") == 2
+
+
+def test_latest_keeps_last_value_of_collectors_that_did_not_run():
+    scheduler = CollectorScheduler(upload_interval=1)
+    values = iter(range(10))
+    scheduler.add("cpu", lambda: {"cpu": next(values)}, 1)
+    scheduler.add("ram", lambda: {"ram": "lenta"}, 5)
+
+    scheduler.run_pending()
+    scheduler.run_pending()
+
+    assert scheduler.latest() == {"cpu": 1, "ram": "lenta"}
+
+
+def test_failing_collector_keeps_previous_value():
+    scheduler = CollectorScheduler(upload_interval=1)
+    results = [{"disco": 1}]
+
+    def collect():
+        if not results:
+            raise RuntimeError("falha")
+        return results.pop()
+
+    scheduler.add("disco", collect, 1)
+    scheduler.run_pending()
+    scheduler.run_pending()
+
+    assert scheduler.latest() == {"disco": 1}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_ticker_keeps_fixed_cadence_regardless_of_work_time():
+    clock = FakeClock()
+    ticker = DeadlineTicker(1.0, clock=clock)
+
+    deadlines = []
+    for _ in range(3):
+        ticker.wait(clock.sleep)
+        deadlines.append(clock.now)
+        clock.now += 0.4  # tempo de coleta + envio
+
+    assert deadlines == [101.0, 102.0, 103.0]
+    assert ticker.missed_ticks == 0
+
+
+def test_ticker_skips_and_counts_missed_ticks_under_overload():
+    clock = FakeClock()
+    ticker = DeadlineTicker(1.0, clock=clock)
+    ticker.wait(clock.sleep)
+
+    clock.now += 2.5  # envio lento
+    ticks = ticker.wait(clock.sleep)
+
+    assert ticks == 2
+    assert ticker.missed_ticks == 1
+    assert ticker.get_stats()["atraso_ms"] == 1500.0
+
+    ticker.wait(clock.sleep)
+    assert clock.now == 104.0
+
+
+def test_run_pending_covers_collectors_due_in_skipped_ticks():
+    calls = []
+    scheduler = CollectorScheduler(upload_interval=1)
+    scheduler.add("processos", lambda: calls.append("processos") or {}, 3)
+
+    scheduler.run_pending()
+    assert scheduler.run_pending(ticks=3) is True
+
+    assert calls == ["processos", "processos"]
+
+
+def test_window_fields_are_aggregated_over_the_upload_period():
+    scheduler = CollectorScheduler(upload_interval=1)
+    values = iter([10, 90, 20, 30, 40, 50])
+    scheduler.add("cpu", lambda: {"cpu": {"percentual_total": next(values)}}, 0.25,
+                  fields=["percentual_total"], summarize=True)
+
+    for _ in range(6):
+        scheduler.run_pending()
+
+    cpu = scheduler.latest()["cpu"]
+    assert cpu["percentual_total"] == 50
+    # Janela com as 4 últimas amostras (1s / 250ms)
+    assert cpu["janela"]["percentual_total"] == {
+        "min": 20.0, "max": 50.0, "media": 35.0, "p95": 48.5, "ultimo": 50.0, "amostras": 4,
+    }
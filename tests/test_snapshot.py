@@ -0,0 +1,31 @@
+import sys
+from array import array
+
+from monitoramento.snapshot import CPUSample, ProcessSample, RAMSample, to_wire
+
+
+def test_records_round_only_when_serialised():
+    cpu = CPUSample(12.345, array("f", [10.04, 14.66]), 2, 4)
+
+    assert cpu.percentual_total == 12.345
+    assert cpu.to_wire() == {
+        "percentual_total": 12.3,
+        "percentual_por_nucleo": [10.0, 14.7],
+        "nucleos_fisicos": 2,
+        "nucleos_logicos": 4,
+    }
+    # Registros com __slots__ (Python 3.10+) não carregam um __dict__ por instância
+    if sys.version_info >= (3, 10):
+        assert not hasattr(RAMSample(), "__dict__")
+
+
+def test_process_optional_fields_only_on_wire_when_collected():
+    processes = (
+        ProcessSample("python", 5.55, 120.04),
+        ProcessSample("postgres", 1.0, 512.0, io_kb_s=33.333, threads=8),
+    )
+
+    assert to_wire(processes) == [
+        {"nome": "python", "cpu_percent": 5.5, "memoria_mb": 120.0},
+        {"nome": "postgres", "cpu_percent": 1.0, "memoria_mb": 512.0, "io_kb_s": 33.3, "threads": 8},
+    ]
@@ -0,0 +1,32 @@
+from monitoramento import system_inventory
+
+
+def test_read_os_release_parses_quoted_values(tmp_path, monkeypatch):
+    os_release = tmp_path / "os-release"
+    os_release.write_text(
+        '# comentário\nNAME="Ubuntu"\nVERSION_ID="22.04"\nVERSION_CODENAME=jammy\n',
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(system_inventory, "OS_RELEASE_PATHS", (str(tmp_path / "missing"), str(os_release)))
+
+    assert system_inventory.read_os_release() == {
+        "NAME": "Ubuntu",
+        "VERSION_ID": "22.04",
+        "VERSION_CODENAME": "jammy",
+    }
+
+
+def test_inventory_is_computed_once_per_process(monkeypatch):
+    system_inventory._get_inventory.cache_clear()
+    calls = []
+    original = system_inventory._collect_os_info
+    monkeypatch.setattr(system_inventory, "_collect_os_info", lambda: calls.append(1) or original())
+
+    first = system_inventory.get_os_info()
+    first["sistema"] = "alterado"
+    second = system_inventory.get_os_info()
+    system_inventory.get_os_description()
+
+    assert len(calls) == 1
+    assert second["sistema"] != "alterado"
+    system_inventory._get_inventory.cache_clear()
@@ -0,0 +1,50 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from api.api_client import APIResponse
+from api.offline_spool import OfflineSpool
+from api.upload_pipeline import UploadPipeline
+
+
+def test_submit_keeps_at_most_window_requests_in_flight():
+    pipeline = UploadPipeline(window=3)
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def send(n):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return n
+
+    futures = [pipeline.submit(send, n) for n in range(9)]
+    assert [future.result() for future in futures] == list(range(9))
+    pipeline.close(timeout=1)
+
+    assert peak[0] == 3
+    assert pipeline.get_stats()["max_em_andamento"] == 3
+
+
+def test_replay_pipelined_prunes_exactly_what_each_batch_confirmed(tmp_path):
+    spool = OfflineSpool(path=str(tmp_path / "spool.db"))
+    start = datetime.now() - timedelta(minutes=1)
+    for n in range(6):
+        spool.append({"timestamp": (start + timedelta(seconds=n)).isoformat(), "n": n})
+
+    def send_batch(snapshots):
+        numbers = [snapshot["n"] for snapshot in snapshots]
+        if numbers == [2, 3]:
+            # Servidor caiu no meio deste lote: só o primeiro foi aceito
+            return APIResponse(False, data={"enviados": 1}, error="Erro HTTP 503", status_code=503)
+        return APIResponse(True, status_code=200)
+
+    pipeline = UploadPipeline(window=3)
+    assert spool.replay_pipelined(pipeline, send_batch, limit=2) == 5
+    pipeline.close(timeout=1)
+
+    assert [data["n"] for _, data in spool.peek(10)] == [3]
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from api.upload_queue import COALESCE, DROP_NEWEST, DROP_OLDEST, StatusUploader, UploadQueue
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        (DROP_OLDEST, [{"n": 2, "extra": True}, {"n": 3}]),
+        (DROP_NEWEST, [{"n": 1}, {"n": 2, "extra": True}]),
+        (COALESCE, [{"n": 1}, {"n": 3, "extra": True}]),
+    ],
+)
+def test_overflow_policies(policy, expected):
+    queue = UploadQueue(maxsize=2, overflow_policy=policy)
+    queue.put({"n": 1})
+    queue.put({"n": 2, "extra": True})
+    queue.put({"n": 3})
+
+    assert [queue.get(timeout=0) for _ in range(len(queue))] == expected
+
+
+def test_invalid_policy_is_rejected():
+    with pytest.raises(ValueError):
+        UploadQueue(overflow_policy="bloquear")
+
+
+def test_uploader_drains_queue_on_stop():
+    sent = []
+    release = threading.Event()
+
+    def slow_send(item):
+        release.wait(1)
+        sent.append(item["n"])
+
+    queue = UploadQueue(maxsize=10)
+    uploader = StatusUploader(queue, slow_send)
+    uploader.start()
+    for n in range(3):
+        assert queue.put({"n": n})
+
+    release.set()
+    uploader.stop(timeout=2)
+
+    assert sent == [0, 1, 2]
+    assert not uploader.is_alive()
+
+
+def test_uploader_groups_snapshots_into_batches():
+    batches = []
+    queue = UploadQueue(maxsize=10)
+    uploader = StatusUploader(queue, lambda item: None, send_batch=batches.append)
+    uploader.batch_size = 2
+    for n in range(5):
+        queue.put({"n": n})
+
+    uploader.start()
+    uploader.stop(timeout=2)
+
+    assert [[item["n"] for item in batch] for batch in batches] == [[0, 1], [2, 3], [4]]
+
+
+def test_priority_items_are_delivered_first_and_never_dropped():
+    queue = UploadQueue(maxsize=2, overflow_policy=DROP_NEWEST)
+    queue.put({"seq": 1})
+    queue.put({"seq": 2})
+
+    assert queue.put({"alerta": True}, priority=True)
+    assert not queue.put({"seq": 3})
+    assert [queue.get(timeout=0) for _ in range(3)] == [{"alerta": True}, {"seq": 1}, {"seq": 2}]
+
+
+def test_priority_lane_is_not_capped_by_maxsize():
+    queue = UploadQueue(maxsize=2)
+    for n in range(5):
+        assert queue.put({"alerta": n}, priority=True)
+
+    assert [queue.get(timeout=0)["alerta"] for _ in range(5)] == [0, 1, 2, 3, 4]
+    assert queue.dropped == 0
+
+
+def test_coalesce_does_not_mutate_the_queued_snapshot():
+    queue = UploadQueue(maxsize=1, overflow_policy=COALESCE)
+    first = {"n": 1, "cpu": 10}
+    queue.put(first)
+    queue.put({"n": 2})
+
+    assert queue.get(timeout=0) == {"n": 2, "cpu": 10}
+    assert first == {"n": 1, "cpu": 10}